@@ -0,0 +1,83 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Compares parsing whole MAL pages with parsing only their #contentWrapper region, in bytes parsed, DOM nodes and
+wall time.
+
+The pages are synthetic: content regions shaped like anime, character and user pages, inside the kind of head, menus,
+inline scripts, ads and footer that surround every MAL page.
+
+Usage: python benchmarks/content_slice.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from myanimelist import utilities
+
+SCRIPT = u"<script type='text/javascript'>window.MAL = window.MAL || {{}}; MAL.menu{0} = " \
+         u"'<div class=\"menu\">' + {0} + '</div>'; " + u"var x = 1;" * 150 + u"</script>"
+
+MENU = u"<li class='menu-item'><a href='/topanime.php?type={0}'>Top {0}</a><div class='submenu'><ul>" + \
+       u"".join(u"<li><a href='/anime/season/{{0}}/{0}'>Season {0}</a></li>".format(i) for i in range(8)) + \
+       u"</ul></div></li>"
+
+FOOTER_LINK = u"<li><a href='/about.php?go={0}'>About {0}</a></li>"
+
+ROW = u"<tr><td class='borderClass'><a href='/character/{0}/Name'><img src='/images/{0}.jpg'/></a></td>" \
+      u"<td class='borderClass'><a href='/character/{0}/Name'>Character {0}</a><div class='spaceit_pad'>" \
+      u"<small>Main</small></div></td><td class='borderClass'><table><tr><td><a href='/people/{0}/Person'>" \
+      u"Person {0}</a><br/><small>Japanese</small></td></tr></table></td></tr>"
+
+LABEL = u"<div class='spaceit'><span class='dark_text'>Label {0}:</span> Value {0}</div>"
+
+
+def page(content):
+    return (u"<!DOCTYPE html><html><head><title>MyAnimeList.net</title>" +
+            u"".join(u"<link rel='stylesheet' href='/css/{0}.css'/><meta name='m{0}' content='{0}'/>".format(i)
+                     for i in range(20)) +
+            u"".join(SCRIPT.format(i) for i in range(30)) +
+            u"</head><body><div id='myanimelist'><div id='headerSmall'><ul id='nav'>" +
+            u"".join(MENU.format(i).format(i) for i in range(40)) +
+            u"</ul></div><div class='ad-banner'><iframe src='/ads/1'></iframe></div>" +
+            content +
+            u"<div id='footer'><ul>" + u"".join(FOOTER_LINK.format(i) for i in range(200)) +
+            u"</ul></div>" + u"".join(SCRIPT.format(i) for i in range(30, 45)) +
+            u"</div></body></html>")
+
+
+def anime_page():
+    return page(u"<div id='contentWrapper'><div><h1><span>Cowboy Bebop</span></h1></div><div id='content'>"
+                u"<table><tr><td>" + u"".join(LABEL.format(i) for i in range(30)) + u"</td><td><h2>Characters</h2>"
+                u"<table>" + u"".join(ROW.format(i) for i in range(20)) + u"</table></td></tr></table></div></div>")
+
+
+def character_page():
+    return page(u"<div id='contentWrapper'><div><h1>Spike Spiegel</h1></div><div id='content'><table><tr><td>"
+                u"<img src='/images/1.jpg'/><div class='normal_header'>Animeography</div><table>" +
+                u"".join(ROW.format(i) for i in range(10)) + u"</table></td><td><div class='normal_header'>"
+                u"Spike</div>" + u"<p>Biography.</p>" * 40 + u"</td></tr></table></div></div>")
+
+
+def user_page():
+    return page(u"<div id='contentWrapper'><div><h1>Profile</h1></div><div id='content'><div class='container-left'>" +
+                u"".join(LABEL.format(i) for i in range(20)) + u"</div><div class='container-right'>" +
+                u"".join(u"<div class='stats'>" + LABEL.format(i) + u"</div>" for i in range(60)) +
+                u"</div></div></div>")
+
+
+def main():
+    for name, html in ((u'anime', anime_page()), (u'character', character_page()), (u'user', user_page())):
+        print(name)
+        for content_only in (False, True):
+            parsed = len(utilities.slice_content(html)) if content_only else len(html)
+            nodes = sum(1 for _ in utilities.get_clean_dom(html, content_only=content_only).iter())
+            elapsed = min(timeit.repeat(lambda: utilities.get_clean_dom(html, content_only=content_only),
+                                        number=50, repeat=3)) / 50
+            print(u'  %-12s %8d bytes %6d nodes %8.2fms' % (u'content only' if content_only else u'whole page',
+                                                           parsed, nodes, 1000 * elapsed))
+
+
+if __name__ == '__main__':
+    main()
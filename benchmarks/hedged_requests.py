@@ -0,0 +1,75 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Compares the latency percentiles of fetching pages with and without hedged requests, through a local server that
+answers most requests in 20ms but one in ten only after 500ms.
+
+Usage: python benchmarks/hedged_requests.py
+"""
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from myanimelist import hedge
+from myanimelist import session
+
+FETCHES = 200
+
+FAST, SLOW, SPIKE_RATE = 0.02, 0.5, 0.1
+
+BODY = b'<html><body><p>Cowboy Bebop</p></body></html>'
+
+
+class SpikyHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(SLOW if random.random() < SPIKE_RATE else FAST)
+        try:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+        except (IOError, OSError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def percentile(timings, share):
+    return sorted(timings)[int(share * (len(timings) - 1))]
+
+
+def main():
+    random.seed(0)
+    server = ThreadingServer(('127.0.0.1', 0), SpikyHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:%d/anime/1' % server.server_port
+
+    print(u'%d fetches, %.0fms each, %.0f%% of them %.0fms' % (FETCHES, 1000 * FAST, 100 * SPIKE_RATE, 1000 * SLOW))
+    print(u'  %-14s %7s %7s %7s %7s %8s' % (u'', u'p50', u'p95', u'p99', u'max', u'hedges'))
+    for label, policy in ((u'plain', None), (u'hedged at p75', hedge.HedgePolicy(percentile=0.75))):
+        fetching = session.Session(hedge_policy=policy)
+        timings = []
+        for _ in range(FETCHES):
+            start = time.time()
+            fetching.fetch(url)
+            timings.append(1000 * (time.time() - start))
+        print(u'  %-14s %5.0fms %5.0fms %5.0fms %5.0fms %8s' % (
+            label, percentile(timings, 0.5), percentile(timings, 0.95), percentile(timings, 0.99), max(timings),
+            u'-' if policy is None else u'%d (%d won)' % (policy.hedges, policy.wins)))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
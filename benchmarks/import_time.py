@@ -0,0 +1,45 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Measures the startup cost of myanimelist.session with -X importtime.
+
+Each statement runs in a fresh interpreter; the cumulative import time of the myanimelist modules it touched, and of
+everything they pulled in, is reported in milliseconds.
+
+Usage: python benchmarks/import_time.py [runs]
+"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+STATEMENTS = [
+    'import myanimelist.session',
+    'import myanimelist.session; myanimelist.session.Session()',
+    'import myanimelist.session; myanimelist.session.Session().anime(1)',
+    'import myanimelist.session; myanimelist.session.Session().user(u"shaldengeki")',
+]
+
+
+def import_time(statement):
+    # -X importtime writes "import time: self [us] | cumulative | imported package" lines to stderr.
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT, stderr=subprocess.PIPE,
+                            universal_newlines=True, check=True)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, _, package = line[len('import time:'):].split('|')
+        total += int(self_time)
+    return total / 1000.0
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for statement in STATEMENTS:
+        best = min(import_time(statement) for _ in range(runs))
+        print(u'%8.1fms  %s' % (best, statement))
+
+
+if __name__ == '__main__':
+    main()
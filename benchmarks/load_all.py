@@ -0,0 +1,55 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Compares hydrating an anime with its four loaders called one after another and with load_all(), through a session
+whose requests each take a simulated 100ms round trip.
+
+Usage: python benchmarks/load_all.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from myanimelist import session
+
+ROUND_TRIP = 0.1
+
+MAIN_PAGE = u"<html><body><div id='contentWrapper'><h1><span>Cowboy Bebop</span></h1><div id='content'><table><tr>" \
+            u"<td><img src='cover.jpg'/></td><td></td></tr></table></div></div></body></html>"
+
+OTHER_PAGE = u"<html><body><div id='contentWrapper'><h1>Cowboy Bebop</h1><div id='content'></div></div></body></html>"
+
+
+class DistantSession(session.Session):
+    def __init__(self):
+        super(DistantSession, self).__init__()
+        # the pages only have a title.
+        self.suppress_parse_exceptions = True
+
+    def _fetch(self, url):
+        time.sleep(ROUND_TRIP)
+        return MAIN_PAGE if url.endswith('/1') else OTHER_PAGE
+
+
+def serially(bebop):
+    bebop.load()
+    bebop.load_stats()
+    bebop.load_characters()
+    bebop.load_videos()
+
+
+def main():
+    for label, hydrate in ((u'one after another', serially), (u'load_all()', lambda bebop: bebop.load_all())):
+        for title in (None, u'Cowboy Bebop'):
+            bebop = DistantSession().anime(1)
+            if title is not None:
+                bebop.set({'title': title})
+            start = time.time()
+            hydrate(bebop)
+            print(u'  %-18s %-14s %6.0fms' % (label, u'title known' if title else u'title unknown',
+                                             1000 * (time.time() - start)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Compares loading a whole anime page with loading its sidebar alone, which stops the download once the sidebar has
+arrived, in bytes sent by the server and time to result.
+
+A local server stands in for MAL, sending a 300KB page, whose reviews and recommendations follow the sidebar, synopsis
+and related anime, in chunks spaced out like a slow link.
+
+Usage: python benchmarks/load_sections.py
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from requests.adapters import HTTPAdapter
+
+from myanimelist import session
+from content_slice import LABEL, page
+
+SIDEBAR = u"".join(LABEL.format(i) for i in range(20)) + \
+          u"<div><span class='dark_text'>Score:</span><span itemprop='ratingValue'>8.78</span> (scored by " \
+          u"<span itemprop='ratingCount'>704,527</span> users)</div>" + \
+          u"".join(u"<div><span class='dark_text'>%s:</span> %s</div>" % row
+                   for row in ((u'Ranked', u'#26'), (u'Popularity', u'#39'), (u'Members', u'1,236,530'),
+                               (u'Favorites', u'64,658')))
+
+PAGE = page(u"<div id='contentWrapper'><h1><span>Cowboy Bebop</span></h1><div id='content'><table><tr><td>"
+            u"<img src='/images/1.jpg'/>" + SIDEBAR + u"</td><td><h2>Synopsis</h2><span itemprop='description'>"
+            u"In the year 2071.</span><h2>Background</h2>Seiun Award.<h2>Related Anime</h2>"
+            u"<table class='anime_detail_related_anime'><tr><td>Side story:</td><td>"
+            u"<a href='/anime/5/Tengoku_no_Tobira'>Tengoku no Tobira</a></td></tr></table>"
+            u"<h2>Characters &amp; Voice Actors</h2>" +
+            u"".join(u"<div class='borderDark'><p>Review %d.</p>%s</div>" % (i, u"Text. " * 80) for i in range(400)) +
+            u"</td></tr></table></div></div>").encode('utf-8')
+
+CHUNK_SIZE = 16384
+
+# seconds between chunks: about 2MB/s.
+CHUNK_DELAY = 0.008
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    sent = 0
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        SlowHandler.sent = 0
+        try:
+            for start in range(0, len(PAGE), CHUNK_SIZE):
+                time.sleep(CHUNK_DELAY)
+                self.wfile.write(PAGE[start:start + CHUNK_SIZE])
+                self.wfile.flush()
+                SlowHandler.sent += len(PAGE[start:start + CHUNK_SIZE])
+        except (IOError, OSError):
+            # the client hung up.
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalAdapter(HTTPAdapter):
+    """Sends requests for MAL pages to the local server instead.
+    """
+
+    def __init__(self, port):
+        super(LocalAdapter, self).__init__()
+        self.port = port
+
+    def send(self, request, **kwargs):
+        request.url = request.url.replace('https://myanimelist.net', 'http://127.0.0.1:%d' % self.port)
+        return super(LocalAdapter, self).send(request, **kwargs)
+
+
+def main():
+    server = HTTPServer(('127.0.0.1', 0), SlowHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    print(u'%d byte page, %d byte chunks every %.0fms' % (len(PAGE), CHUNK_SIZE, 1000 * CHUNK_DELAY))
+    for label, sections in ((u'whole page', None), (u'sidebar only', ())):
+        timings = []
+        for _ in range(5):
+            loading = session.Session()
+            loading.session.mount('https://myanimelist.net', LocalAdapter(server.server_port))
+            # the synthetic sidebar only has the rows read here.
+            loading.suppress_parse_exceptions = True
+            start = time.time()
+            bebop = loading.anime(1).load(sections=sections)
+            timings.append(time.time() - start)
+            assert bebop.field('members') == 1236530
+            # let the server notice the hang-up.
+            time.sleep(3 * CHUNK_DELAY)
+        print(u'  %-14s %8d bytes sent %8.1fms' % (label, SlowHandler.sent, 1000 * min(timings)))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Times Anime.parse_characters on synthetic characters pages of growing size, to check that it scales linearly.
+
+Usage: python benchmarks/parse_characters.py [sizes...]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from myanimelist import anime
+from myanimelist import session
+from myanimelist import utilities
+
+CHARACTER_TABLE = u"""<table><tr><td></td>
+<td><a href="/character/{0}/X">Name, {0}</a><div><small>Main</small></div></td>
+<td><table><tr><td><a href="/people/{0}/Y">Actor, {0}</a><br/><small>Japanese</small></td></tr></table></td>
+</tr></table>"""
+
+STAFF_TABLE = u"""<table><tr><td></td><td><a href="/people/{0}/Z">Staff, {0}</a><div><small>Director</small></div></td>
+</tr></table>"""
+
+
+def page(size):
+    return utilities.get_clean_dom(u"<html><body><div id='contentWrapper'><h1>Title</h1><h2>Characters</h2>" +
+                                   u"".join(CHARACTER_TABLE.format(i) for i in range(1, size + 1)) +
+                                   u"<h2>Staff</h2>" +
+                                   u"".join(STAFF_TABLE.format(i) for i in range(1, size + 1)) +
+                                   u"</div></body></html>")
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [250, 500, 1000, 2000]
+    mal_session = session.Session()
+    # synthetic pages have no sidebar.
+    mal_session.suppress_parse_exceptions = True
+    media = anime.Anime(mal_session, 1)
+    for size in sizes:
+        dom = page(size)
+        elapsed = min(timeit.repeat(lambda: media.parse_characters(dom), number=1, repeat=3))
+        print(u'%6d characters: %8.1fms (%.1fus per character)' % (size, 1000 * elapsed, 1e6 * elapsed / size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Times utilities.parse_profile_date over the dates of a 20,000-row list.
+
+Usage: python benchmarks/parse_profile_date.py [rows]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from myanimelist import utilities
+
+
+def list_dates(rows):
+    # each list row carries series start/end and my start/finish dates, drawn from a limited range like real lists.
+    generator = random.Random(0)
+    dates = []
+    for _ in range(rows):
+        year = generator.randint(1980, 2016)
+        dates.append(u'%04d-%02d-%02d' % (year, generator.randint(1, 12), generator.randint(1, 28)))
+        dates.append(u'%04d-%02d-00' % (year, generator.randint(1, 12)))
+        dates.append(u'%02d-%02d-%02d' % (generator.randint(1, 12), generator.randint(1, 28), generator.randint(10, 16)))
+        dates.append(generator.choice([u'0000-00-00', u'Unknown', u'?']))
+    return dates
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    dates = list_dates(rows)
+    elapsed = min(timeit.repeat(lambda: [utilities.parse_profile_date(date) for date in dates], number=1, repeat=3))
+    print(u'%d dates from %d rows: %.3fs (%.2fus per date)' % (len(dates), rows, elapsed, 1e6 * elapsed / len(dates)))
+
+
+if __name__ == '__main__':
+    main()
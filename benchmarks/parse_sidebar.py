@@ -0,0 +1,47 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Times the alternative titles and related media sections of Media.parse on synthetic anime pages with growing
+numbers of synonyms and relations, to check that they scale linearly.
+
+Usage: python benchmarks/parse_sidebar.py [sizes...]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from myanimelist import anime
+from myanimelist import session
+from myanimelist import utilities
+
+LANGUAGE = u"<div class='spaceit_pad'><span class='dark_text'>Language {0}:</span> Title {0}, Other {0}</div>"
+
+RELATION = u"<tr><td>Relation {0}:</td><td><a href='/anime/{1}/A'>A {1}</a>, <a href='/manga/{1}/M'>M {1}</a></td></tr>"
+
+
+def page(size):
+    return utilities.get_clean_dom(
+        u"<html><body><div id='contentWrapper'><h1>Title</h1><div id='content'><table><tr><td>"
+        u"<img src='cover.jpg'/><h2>Alternative Titles</h2>" +
+        u"".join(LANGUAGE.format(i) for i in range(size)) +
+        u"<br/><h2>Information</h2></td><td><div><h2>Related Anime</h2>"
+        u"<table class='anime_detail_related_anime'>" +
+        u"".join(RELATION.format(i % 20, i + 1) for i in range(size)) +
+        u"</table></div></td></tr></table></div></div></body></html>")
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [250, 500, 1000, 2000]
+    mal_session = session.Session()
+    # synthetic pages only have the sections being measured.
+    mal_session.suppress_parse_exceptions = True
+    media = anime.Anime(mal_session, 1)
+    for size in sizes:
+        dom = page(size)
+        elapsed = min(timeit.repeat(lambda: media.parse(dom), number=1, repeat=3))
+        print(u'%6d synonyms and relations: %8.1fms (%.1fus each)' % (size, 1000 * elapsed, 1e6 * elapsed / size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Compares building DOMs with lxml's default parsers and with the cached, tuned parsers of myanimelist.utilities, in
+wall time and in the resident memory held by the parsed trees.
+
+The HTML pages are the synthetic ones of benchmarks/content_slice.py, parsed whole; the XML is an anime list of 2000
+entries, shaped like the ones MAL serves.
+
+Usage: python benchmarks/parser_reuse.py
+"""
+import gc
+import os
+import subprocess
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from lxml import etree
+from lxml import html as ht
+
+from myanimelist import utilities
+from content_slice import anime_page, character_page
+
+ENTRY = u"<anime><!-- entry {0} --><series_animedb_id>{0}</series_animedb_id><series_title>Title {0}</series_title>" \
+        u"<series_type>1</series_type><series_episodes>26</series_episodes><series_status>2</series_status>" \
+        u"<series_start>1998-04-03</series_start><series_end>1999-04-24</series_end>" \
+        u"<series_image>https://myanimelist.cdn-dena.com/images/anime/4/{0}.jpg</series_image>" \
+        u"<my_id>0</my_id><my_watched_episodes>26</my_watched_episodes><my_start_date>0000-00-00</my_start_date>" \
+        u"<my_finish_date>0000-00-00</my_finish_date><my_score>9</my_score><my_status>2</my_status>" \
+        u"<my_rewatching>0</my_rewatching><my_rewatching_ep>0</my_rewatching_ep>" \
+        u"<my_last_updated>1420000000</my_last_updated><my_tags>space, bounty</my_tags></anime>"
+
+# trees held at once when measuring memory.
+HELD = 40
+
+
+def anime_list():
+    return (u"<?xml version='1.0' encoding='UTF-8'?><myanimelist><myinfo><user_id>1</user_id>"
+            u"<user_name>user</user_name></myinfo>" + u"".join(ENTRY.format(i) for i in range(2000)) +
+            u"</myanimelist>")
+
+
+def resident_kilobytes():
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+def cases():
+    result = []
+    for name, html in ((u'anime page', utilities.fix_bad_html(anime_page())),
+                       (u'character page', utilities.fix_bad_html(character_page()))):
+        result.append((name, lambda html=html: ht.fromstring(html),
+                       lambda html=html: ht.fromstring(html, parser=utilities.html_parser())))
+    xml = anime_list().encode()
+    result.append((u'anime list', lambda: etree.fromstring(xml),
+                   lambda: etree.fromstring(xml, parser=utilities.xml_parser())))
+    return result
+
+
+def held_memory(build):
+    # run in a fresh process, since memory freed by earlier trees would otherwise be reused.
+    build()
+    gc.collect()
+    before = resident_kilobytes()
+    trees = [build() for _ in range(HELD)]
+    return (resident_kilobytes() - before) / float(HELD), sum(1 for _ in trees[0].iter())
+
+
+def main():
+    if len(sys.argv) == 3:
+        case, variant = cases()[int(sys.argv[1])], int(sys.argv[2])
+        print(u'%f %d' % held_memory(case[1 + variant]))
+        return
+    for position, (name, default, tuned) in enumerate(cases()):
+        print(name)
+        for variant, (label, build) in enumerate(((u'default', default), (u'tuned', tuned))):
+            elapsed = min(timeit.repeat(build, number=20, repeat=3)) / 20
+            held, nodes = subprocess.check_output([sys.executable, os.path.abspath(__file__), str(position),
+                                                   str(variant)]).split()
+            print(u'  %-8s %6d nodes %8.2fms %8.0fKB per tree' % (label, int(nodes), 1000 * elapsed, float(held)))
+
+
+if __name__ == '__main__':
+    main()
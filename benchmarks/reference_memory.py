@@ -0,0 +1,43 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Compares the memory held by a large relation graph of references against the same graph of full resources.
+
+Usage: python benchmarks/reference_memory.py [resources]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from myanimelist import anime
+from myanimelist import character
+from myanimelist import session
+
+
+def build(mal_session, count, make_anime, make_character):
+    # what parsers leave behind: anime and characters known only by id and name.
+    return [(make_anime(mal_session, i).set({'title': u'Anime %d' % i}),
+             make_character(mal_session, i).set({'name': u'Character %d' % i})) for i in range(1, count + 1)]
+
+
+def measure(count, make_anime, make_character):
+    mal_session = session.Session()
+    tracemalloc.start()
+    graph = build(mal_session, count, make_anime, make_character)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    return size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    full = measure(count, anime.Anime, character.Character)
+    references = measure(count, lambda s, i: s.anime(i), lambda s, i: s.character(i))
+    print(u'full resources: %8.1f KiB' % (full / 1024.0))
+    print(u'references:     %8.1f KiB (%.1fx smaller)' % (references / 1024.0, float(full) / references))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Times TitleIndex.search over a synthetic catalogue of romanized titles.
+
+Each of the real words below ends up in hundreds of titles, far more than on MAL, so multi-word queries here are a
+pessimistic bound; single-word queries should stay under a millisecond.
+
+Usage: python benchmarks/search_local.py [titles]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from myanimelist import search
+
+WORDS = [u'cowboy', u'bebop', u'no', u'the', u'movie', u'shingeki', u'kyojin', u'naruto', u'shippuden', u'one',
+         u'piece', u'tengoku', u'tobira', u'kimi', u'na', u'wa', u'monogatari', u'season', u'special', u'gakuen',
+         u'mahou', u'shoujo', u'senki', u'hunter', u'x', u'kaze', u'tachinu', u'sen', u'to', u'chihiro', u'kamikakushi',
+         u'fullmetal', u'alchemist', u'brotherhood', u'steins', u'gate', u'code', u'geass', u'hangyaku', u'lelouch']
+
+SYLLABLES = [u'ka', u'ki', u'ku', u'ke', u'ko', u'sa', u'shi', u'su', u'se', u'so', u'ta', u'chi', u'tsu', u'te', u'to',
+             u'na', u'ni', u'nu', u'ne', u'no', u'ha', u'hi', u'fu', u'he', u'ho', u'ma', u'mi', u'mu', u'me', u'mo',
+             u'ya', u'yu', u'yo', u'ra', u'ri', u'ru', u're', u'ro', u'wa', u'n', u'ga', u'gi', u'za', u'ji', u'da', u'ba']
+
+QUERIES = [u'bebop', u'cowboy bebob', u'shingeki no kyojin', u'the movie', u'fullmetal', u'lelouch', u'zzz',
+           u'monogatari season', u'x']
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    rng = random.Random(0)
+    # a few thousand made-up words, with the real ones recurring the way franchise names and "no", "the", ... do.
+    vocabulary = list(set(u''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(4000)))
+    index = search.TitleIndex()
+    started = timeit.default_timer()
+    for media_id in range(1, size + 1):
+        title = u' '.join(rng.choice(WORDS if rng.random() < 0.2 else vocabulary) for _ in range(rng.randint(1, 5))).title() + u' ' + str(media_id)
+        index.add_titles(('anime', media_id), title, {u'English': [title.upper()]})
+    print(u'indexed %d titles in %.2fs' % (size, timeit.default_timer() - started))
+    for query in QUERIES:
+        number = 200
+        elapsed = min(timeit.repeat(lambda: index.search(query), number=number, repeat=3)) / number
+        print(u'%-20s %8.3fms' % (query, 1000 * elapsed))
+
+
+if __name__ == '__main__':
+    main()
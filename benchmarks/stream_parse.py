@@ -0,0 +1,65 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Compares the latency of fetching a page and then parsing it with that of parsing it as it downloads, through a local
+server that sends a 300KB page in chunks spaced out like a slow link.
+
+Usage: python benchmarks/stream_parse.py
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from myanimelist import session
+from content_slice import ROW, page
+
+PAGE = page(u"<div id='contentWrapper'><div><h1>Staff</h1></div><div id='content'><table>" +
+            u"".join(ROW.format(i) for i in range(600)) + u"</table></div></div>").encode('utf-8')
+
+CHUNK_SIZE = 16384
+
+# seconds between chunks: about 2MB/s.
+CHUNK_DELAY = 0.008
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        for start in range(0, len(PAGE), CHUNK_SIZE):
+            time.sleep(CHUNK_DELAY)
+            self.wfile.write(PAGE[start:start + CHUNK_SIZE])
+            self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    server = HTTPServer(('127.0.0.1', 0), SlowHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:%d/character/1' % server.server_port
+
+    print(u'%d byte page, %d byte chunks every %.0fms' % (len(PAGE), CHUNK_SIZE, 1000 * CHUNK_DELAY))
+    for label, stream_pages in ((u'fetch, then parse', False), (u'parse as it arrives', True)):
+        fetching = session.Session(stream_pages=stream_pages)
+        fetching.fetch_dom(url)
+        timings = []
+        for _ in range(5):
+            start = time.time()
+            fetching.fetch_dom(url)
+            timings.append(time.time() - start)
+        print(u'  %-20s %8.1fms' % (label, 1000 * min(timings)))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,8 @@ import re
 
 from . import utilities
 from . import media
-from .base import loadable
+from .base import loadable, loader
+from .reference import AnimeReference
 
 
 class MalformedAnimePageError(media.MalformedMediaPageError):
@@ -30,6 +31,10 @@ class Anime(media.Media):
         'Not yet aired'
     ]
     _consuming_verb = "watch"
+    _sidebar_handlers = dict(media.Media._sidebar_handlers, Episodes='_parse_episodes', Aired='_parse_aired',
+                             Producers='_parse_producers', Duration='_parse_duration', Rating='_parse_rating',
+                             Broadcast='_parse_broadcast')
+    _parts = dict(media.Media._parts, videos='load_videos')
 
     def __init__(self, session, anime_id):
         """Creates a new instance of Anime.
@@ -94,140 +99,225 @@ class Anime(media.Media):
         if len(title_tag) == 0:
             raise MalformedAnimePageError(self.id, anime_page.text, message="Could not find title div")
 
-        anime_info = super(Anime, self).parse_sidebar(anime_page)
-        info_panel_first = None
+        return super(Anime, self).parse_sidebar(anime_page)
+
+    def _parse_episodes(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find episode tag.")
+        episode_tag = label_tag.getparent().xpath(".//text()")[-1]
+        media_info['episodes'] = int(episode_tag.strip()) if episode_tag.strip() != 'Unknown' else 0
+
+    def _parse_aired(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find aired tag.")
+        aired_tag = label_tag.getparent().xpath(".//text()")[2]
+        aired_parts = aired_tag.strip().split(' to ')
+        if len(aired_parts) == 1:
+            # this aired once.
+            try:
+                aired_date = utilities.parse_profile_date(aired_parts[0],
+                                                          suppress=self.session.suppress_parse_exceptions)
+            except ValueError:
+                raise MalformedAnimePageError(self.id, aired_parts[0], message="Could not parse single air date")
+            media_info['aired'] = (aired_date,)
+        else:
+            # two airing dates.
+            try:
+                air_start = utilities.parse_profile_date(aired_parts[0],
+                                                         suppress=self.session.suppress_parse_exceptions)
+            except ValueError:
+                raise MalformedAnimePageError(self.id, aired_parts[0],
+                                              message="Could not parse first of two air dates")
+            try:
+                air_end = utilities.parse_profile_date(aired_parts[1],
+                                                       suppress=self.session.suppress_parse_exceptions)
+            except ValueError:
+                raise MalformedAnimePageError(self.id, aired_parts[1],
+                                              message="Could not parse second of two air dates")
+            media_info['aired'] = (air_start, air_end)
+
+    def _parse_producers(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find producers tag.")
+        producers_tags = label_tag.getparent().xpath(".//a")
+        media_info['producers'] = []
+        for producer_link in producers_tags:
+            if producer_link.text == 'add some':
+                # MAL is saying "None found, add some".
+                break
+            link_parts = producer_link.get('href').split('p=')
+            # of the form: /anime.php?p=14
+            if len(link_parts) > 1:
+                media_info['producers'].append(
+                    self.session.producer(int(link_parts[1])).set({'name': producer_link.text}))
+            else:
+                # of the form: /anime/producer/65
+                link_parts = producer_link.get('href').split('/')
+                media_info['producers'].append(
+                    self.session.producer(int(link_parts[-2])).set({"name": producer_link.text}))
+
+    def _parse_duration(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find duration tag.")
+        duration_tag = label_tag.xpath("../text()")[-1]
+        media_info['duration'] = duration_tag.strip()
+        duration_parts = [part.strip() for part in media_info['duration'].split('.')]
+        duration_mins = 0
+        for part in duration_parts:
+            part_match = re.match('(?P<num>[0-9]+)', part)
+            if not part_match:
+                continue
+            part_volume = int(part_match.group('num'))
+            if part.endswith('hr'):
+                duration_mins += part_volume * 60
+            elif part.endswith('min'):
+                duration_mins += part_volume
+        media_info['duration'] = datetime.timedelta(minutes=duration_mins)
+
+    def _parse_rating(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find rating tag.")
+        rating_tag = label_tag.xpath("../text()")[-1]
+        media_info['rating'] = rating_tag.strip()
+
+    def _parse_broadcast(self, label_tag, media_info):
+        # parse broadcasting times - note: the tests doesnt cover this bit, because its a dynamic data
+        # todo: figure out a way to cover this bit in the unit tests
+        media_info['broadcast'] = None
+        if label_tag is not None:
+            broadcast_tag = label_tag.xpath("../text()")[-1].strip()
+            rex = re.compile("[a-zA-Z]+.[a-z]+.[0-9]{1,2}:[0-9]{1,2}.\([A-Z]+\)")
+            if broadcast_tag != "Unknown" and rex.match(broadcast_tag) is not None:
+                media_info['broadcast'] = {}
+
+                parts = broadcast_tag.split(" at ")
+                time_parts = parts[-1].split(" ")
+                subtime_parts = time_parts[0].split(':')
+
+                media_info['broadcast']['weekday'] = parts[0].rstrip('s')
+                media_info['broadcast']['hour'] = int(subtime_parts[0])
+                media_info['broadcast']['minute'] = int(subtime_parts[1])
+                media_info['broadcast']['timezone'] = time_parts[-1].replace('(', '').replace(')', '')
+
+    @staticmethod
+    def _person_id(link):
+        link_parts = link.get('href').split('/')
+        # of the form /people/70/Ami_Koshimizu
+        if "myanimelist.net" not in link_parts:
+            return int(link_parts[2])
+        # or of the form https://myanimelist.net/people/70/Ami_Koshimizu
+        return int(link_parts[4])
+
+    def iter_characters(self, character_page=None):
+        """Walks the characters on the MAL anime characters page once, in document order.
 
-        try:
-            container = utilities.css_select("#content", anime_page)
-            if container is None:
-                raise MalformedAnimePageError(self.id, anime_page.text, message="Could not find the info table")
-
-            info_panel_first = container[0].find(".//table/tr/td")
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Episodes:')]]")
-            if len(temp) == 0:
-                raise Exception("Couldn't find episode tag.")
-            episode_tag = temp[0].getparent().xpath(".//text()")[-1]
-            anime_info['episodes'] = int(episode_tag.strip()) if episode_tag.strip() != 'Unknown' else 0
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+        :type character_page: :class:`lxml.html.HtmlElement`
+        :param character_page: MAL anime character page's DOM. Fetched if omitted.
 
-        try:
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Aired:')]]")
-            if len(temp) == 0:
-                raise Exception("Couldn't find aired tag.")
-            aired_tag = temp[0].getparent().xpath(".//text()")[2]
-            aired_parts = aired_tag.strip().split(' to ')
-            if len(aired_parts) == 1:
-                # this aired once.
-                try:
-                    aired_date = utilities.parse_profile_date(aired_parts[0],
-                                                              suppress=self.session.suppress_parse_exceptions)
-                except ValueError:
-                    raise MalformedAnimePageError(self.id, aired_parts[0], message="Could not parse single air date")
-                anime_info['aired'] = (aired_date,)
-            else:
-                # two airing dates.
-                try:
-                    air_start = utilities.parse_profile_date(aired_parts[0],
-                                                             suppress=self.session.suppress_parse_exceptions)
-                except ValueError:
-                    raise MalformedAnimePageError(self.id, aired_parts[0],
-                                                  message="Could not parse first of two air dates")
-                try:
-                    air_end = utilities.parse_profile_date(aired_parts[1],
-                                                           suppress=self.session.suppress_parse_exceptions)
-                except ValueError:
-                    raise MalformedAnimePageError(self.id, aired_parts[1],
-                                                  message="Could not parse second of two air dates")
-                anime_info['aired'] = (air_start, air_end)
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+        :rtype: generator
+        :return: dicts with the :class:`myanimelist.character.Character` as 'character', its 'role', and a
+            'voice_actors' dict with :class:`myanimelist.person.Person` objects as keys and languages as values.
 
+        :raises: :class:`.MalformedAnimePageError`
+
+        """
+        if character_page is None:
+            character_page = self._characters_page()
         try:
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Producers:')]]")
-            if len(temp) == 0:
-                raise Exception("Couldn't find producers tag.")
-            producers_tags = temp[0].getparent().xpath(".//a")
-            anime_info['producers'] = []
-            for producer_link in producers_tags:
-                if producer_link.text == 'add some':
-                    # MAL is saying "None found, add some".
+            header = character_page.xpath(".//h2[text()[contains(.,'Characters')]]")
+            # character tables follow the header, until the staff tables start.
+            tables = header[0].itersiblings('table') if len(header) != 0 else ()
+            for table in tables:
+                cols = table.find('.//tr').findall("./td")
+                if len(cols) != 3:
                     break
-                link_parts = producer_link.get('href').split('p=')
-                # of the form: /anime.php?p=14
-                if len(link_parts) > 1:
-                    anime_info['producers'].append(
-                        self.session.producer(int(link_parts[1])).set({'name': producer_link.text}))
+                (_, character_col, va_col) = cols
+
+                character_link = character_col.find('.//a')
+                character_name = ' '.join(reversed(character_link.text.split(', ')))
+                link_parts = character_link.get('href').split('/')
+                # of the form /character/7373/Holo
+                if "myanimelist.net" not in link_parts:
+                    character_id = int(link_parts[2])
+                # or of the form https://myanimelist.net/character/7373/Holo
                 else:
-                    # of the form: /anime/producer/65
-                    link_parts = producer_link.get('href').split('/')
-                    anime_info['producers'].append(
-                        self.session.producer(int(link_parts[-2])).set({"name": producer_link.text}))
+                    character_id = int(link_parts[4])
+                character = self.session.character(character_id).set({'name': character_name})
+                character_entry = {'character': character, 'role': character_col.find('.//small').text,
+                                   'voice_actors': {}}
+
+                va_table = va_col.find('.//table')
+                if va_table is not None:
+                    for row in va_table.iterchildren('tr'):
+                        va_info_col = row.find('td')
+                        if va_info_col is None:
+                            # don't ask me why MAL has an extra blank table row i don't know!!!
+                            continue
+                        va_link = va_info_col.find('.//a')
+                        if va_link is not None:
+                            va_name = ' '.join(reversed(va_link.text.split(', ')))
+                            person = self.session.person(self._person_id(va_link)).set({'name': va_name})
+                            character_entry['voice_actors'][person] = va_info_col.find('.//small').text
+                yield character_entry
         except:
             if not self.session.suppress_parse_exceptions:
                 raise
 
-        try:
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Duration:')]]")
-            if len(temp) == 0:
-                raise Exception("Couldn't find duration tag.")
-            duration_tag = temp[0].xpath("../text()")[-1]
-            anime_info['duration'] = duration_tag.strip()
-            duration_parts = [part.strip() for part in anime_info['duration'].split('.')]
-            duration_mins = 0
-            for part in duration_parts:
-                part_match = re.match('(?P<num>[0-9]+)', part)
-                if not part_match:
-                    continue
-                part_volume = int(part_match.group('num'))
-                if part.endswith('hr'):
-                    duration_mins += part_volume * 60
-                elif part.endswith('min'):
-                    duration_mins += part_volume
-            anime_info['duration'] = datetime.timedelta(minutes=duration_mins)
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+    def iter_voice_actors(self, character_page=None):
+        """Walks the voice actor roles on the MAL anime characters page once, in document order.
 
-        try:
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Rating:')]]")
-            if len(temp) == 0:
-                raise Exception("Couldn't find duration tag.")
-            rating_tag = temp[0].xpath("../text()")[-1]
-            anime_info['rating'] = rating_tag.strip()
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+        :type character_page: :class:`lxml.html.HtmlElement`
+        :param character_page: MAL anime character page's DOM. Fetched if omitted.
 
-        # parse broadcasting times - note: the tests doesnt cover this bit, because its a dynamic data
-        # todo: figure out a way to cover this bit in the unit tests
+        :rtype: generator
+        :return: dicts with the :class:`myanimelist.person.Person` as 'person', and the 'character', 'role' and
+            'language' of the part they voiced.
+
+        :raises: :class:`.MalformedAnimePageError`
+
+        """
+        for character_entry in self.iter_characters(character_page):
+            for person, language in character_entry['voice_actors'].items():
+                yield {'person': person, 'character': character_entry['character'], 'role': character_entry['role'],
+                       'language': language}
+
+    def iter_staff(self, character_page=None):
+        """Walks the staff on the MAL anime characters page once, in document order.
+
+        :type character_page: :class:`lxml.html.HtmlElement`
+        :param character_page: MAL anime character page's DOM. Fetched if omitted.
+
+        :rtype: generator
+        :return: (:class:`myanimelist.person.Person`, set of duties) tuples.
+
+        :raises: :class:`.MalformedAnimePageError`
+
+        """
+        if character_page is None:
+            character_page = self._characters_page()
         try:
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Broadcast:')]]")
-            anime_info['broadcast'] = None
-            if len(temp) > 0:
-                broadcast_tag = temp[0].xpath("../text()")[-1].strip()
-                rex = re.compile("[a-zA-Z]+.[a-z]+.[0-9]{1,2}:[0-9]{1,2}.\([A-Z]+\)")
-                if broadcast_tag != "Unknown" and rex.match(broadcast_tag) is not None:
-                    anime_info['broadcast'] = {}
-
-                    parts = broadcast_tag.split(" at ")
-                    time_parts = parts[-1].split(" ")
-                    subtime_parts = time_parts[0].split(':')
-
-                    anime_info['broadcast']['weekday'] = parts[0].rstrip('s')
-                    anime_info['broadcast']['hour'] = int(subtime_parts[0])
-                    anime_info['broadcast']['minute'] = int(subtime_parts[1])
-                    anime_info['broadcast']['timezone'] = time_parts[-1].replace('(', '').replace(')', '')
+            header = character_page.xpath(".//h2[text()[contains(.,'Staff')]]")
+            tables = header[0].itersiblings('table') if len(header) != 0 else ()
+            for staff_table in tables:
+                for row in staff_table.iterfind('.//tr'):
+                    # staff info in second col.
+                    info = row.find('./td[2]')
+                    staff_link = info.find('.//a')
+                    if staff_link is not None:
+                        staff_name = ' '.join(reversed(staff_link.text.split(', ')))
+                        link_parts = staff_link.get('href').split('/')
+                        # of the form /people/1870/Miyazaki_Hayao
+                        person = self.session.person(int(link_parts[-2])).set({'name': staff_name})
+                        # staff role(s).
+                        smallTag = info.find('.//small')
+                        if smallTag is not None:
+                            yield person, set(smallTag.text.split(', '))
         except:
             if not self.session.suppress_parse_exceptions:
                 raise
 
-        return anime_info
-
-    def parse_characters(self, character_page):
-        """Parses the DOM and returns anime character attributes in the sidebar.
+    def parse_characters_section(self, character_page):
+        """Parses the character and staff tables of an anime characters page. The sidebar is not parsed.
 
         :type character_page: :class:`lxml.html.HtmlElement`
         :param character_page: MAL anime character page's DOM
@@ -238,101 +328,23 @@ class Anime(media.Media):
         :raises: :class:`.InvalidAnimeError`, :class:`.MalformedAnimePageError`
 
         """
-        anime_info = self.parse_sidebar(character_page)
-
-        try:
-            temp = character_page.xpath(".//h2[text()[contains(.,'Characters')]]/following-sibling::table[1]")
-
-            anime_info['characters'] = {}
-            anime_info['voice_actors'] = {}
-
-            if len(temp) != 0:
-                curr_elt = temp[0]
-                while curr_elt is not None:
-                    if curr_elt.tag != 'table':
-                        break
-                    curr_row = curr_elt.find('.//tr')
-                    temp = curr_row.findall("./td")
-                    # we got to the staff part, todo: fix the sibling part. this is ugly
-                    if len(temp) != 3:
-                        break
-                    (_, character_col, va_col) = temp
-
-                    character_link = character_col.find('.//a')
-                    character_name = ' '.join(reversed(character_link.text.split(', ')))
-                    link_parts = character_link.get('href').split('/')
-                    # of the form /character/7373/Holo
-                    if "myanimelist.net" not in link_parts:
-                        character_id = int(link_parts[2])
-                    # or of the form https://myanimelist.net/character/7373/Holo
-                    else:
-                        character_id = int(link_parts[4])
-                    character = self.session.character(character_id).set({'name': character_name})
-                    role = character_col.find('.//small').text
-                    character_entry = {'role': role, 'voice_actors': {}}
-
-                    va_table = va_col.find('.//table')
-                    if va_table is not None:
-                        for row in va_table.findall("tr"):
-                            va_info_cols = row.findall('td')
-                            if not va_info_cols or len(va_info_cols) == 0:
-                                # don't ask me why MAL has an extra blank table row i don't know!!!
-                                continue
-
-                            va_info_col = va_info_cols[0]
-                            va_link = va_info_col.find('.//a')
-                            if va_link is not None:
-                                va_name = ' '.join(reversed(va_link.text.split(', ')))
-                                link_parts = va_link.get('href').split('/')
-                                # of the form /people/70/Ami_Koshimizu
-                                if "myanimelist.net" not in link_parts:
-                                    person_id = int(link_parts[2])
-                                # or of the form https://myanimelist.net/people/70/Ami_Koshimizu
-                                else:
-                                    person_id = int(link_parts[4])
-                                person = self.session.person(person_id).set({'name': va_name})
-                                language = va_info_col.find('.//small').text
-                                # one person can be voice actor for many characters
-                                if person not in anime_info['voice_actors'].keys():
-                                    anime_info['voice_actors'][person] = []
-                                anime_info['voice_actors'][person].append({'role': role, 'character': character,
-                                                                           'language': language})
-                                character_entry['voice_actors'][person] = language
-
-                    anime_info['characters'][character] = character_entry
-                    temp = curr_elt.xpath("./following-sibling::table[1]")
-                    if len(temp) != 0:
-                        curr_elt = temp[0]
-                    else:
-                        curr_elt = None
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            item_tables = character_page.xpath(".//h2[text()[contains(.,'Staff')]]/following-sibling::table")
-            anime_info['staff'] = {}
-            if len(item_tables) != 0:
-                for staff_table in item_tables:
-                    for row in staff_table.findall('.//tr'):
-                        # staff info in second col.
-                        info = row.find('./td[2]')
-                        staff_link = info.find('.//a')
-                        if staff_link is not None:
-                            staff_name = ' '.join(reversed(staff_link.text.split(', ')))
-                            link_parts = staff_link.get('href').split('/')
-                            # of the form /people/1870/Miyazaki_Hayao
-                            person = self.session.person(int(link_parts[-2])).set({'name': staff_name})
-                            # staff role(s).
-                            smallTag = info.find('.//small')
-                            if smallTag is not None:
-                                anime_info['staff'][person] = set(smallTag.text.split(', '))
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
+        if not self._validate_page(character_page):
+            raise InvalidAnimeError(self.id)
+        anime_info = {}
+        anime_info['characters'] = {}
+        anime_info['voice_actors'] = {}
+        for character_entry in self.iter_characters(character_page):
+            character = character_entry.pop('character')
+            for person, language in character_entry['voice_actors'].items():
+                # one person can be voice actor for many characters
+                anime_info['voice_actors'].setdefault(person, []).append(
+                    {'role': character_entry['role'], 'character': character, 'language': language})
+            anime_info['characters'][character] = character_entry
+
+        anime_info['staff'] = dict(self.iter_staff(character_page))
         return anime_info
 
+    @loader
     def load_videos(self):
         """Fetches the MAL media videos page and sets the current media's promotion videos attribute.
 
@@ -340,10 +352,10 @@ class Anime(media.Media):
         :return: current media object.
 
         """
-        videos_page = self.session.session.get(
+        videos_page = self.session.fetch_dom(
             'https://myanimelist.net/' + self.__class__.__name__.lower() + '/' + str(
-                self.id) + '/' + utilities.urlencode(self.title) + '/video').text
-        self.set({'promotion_videos': self.parse_promotion_videos(utilities.get_clean_dom(videos_page))})
+                self.id) + '/' + utilities.urlencode(self.title) + '/video', content_only=True)
+        self.set({'promotion_videos': self.parse_promotion_videos(videos_page)})
         return self
 
     @property
@@ -415,3 +427,6 @@ class Anime(media.Media):
         """A staff dict with :class:`myanimelist.person.Person` objects of the staff members as keys, and lists containing the various duties performed by staff members as values.
         """
         return self._staff
+
+
+Anime.register(AnimeReference)
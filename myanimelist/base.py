@@ -1,11 +1,11 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 import abc
+import array
+import datetime
+import decimal
 import functools
 
-from . import utilities
-from lxml import html as ht
-
 
 class Error(Exception):
     """Base exception class that takes a message to display upon raising.
@@ -38,6 +38,7 @@ class MalformedPageError(Error):
         if isinstance(html, str):
             self.html = html
         else:
+            from lxml import html as ht
             if isinstance(html, ht.HtmlElement):
                 self.html = html.text
             else:
@@ -67,6 +68,92 @@ class InvalidBaseError(Error):
         ])
 
 
+def encode_value(value):
+    """Encodes an attribute value into a structure of lists, strings and numbers that any serializer can handle.
+
+    Containers and rich values are written as [tag, payload] pairs. References to other MAL resources are reduced to
+    their (type, id) pair, so encoding never recurses into another resource's attributes.
+
+    :type value: object
+    :param value: An attribute value, as set by a parser.
+
+    :rtype: object
+    :return: The encoded value.
+
+    :raises: TypeError
+
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Base):
+        return ['r', [value._resource_type, getattr(value, value._id_attribute)]]
+    if isinstance(value, dict):
+        return ['d', [[encode_value(key), encode_value(item)] for key, item in value.items()]]
+    if isinstance(value, list):
+        return ['l', [encode_value(item) for item in value]]
+    if isinstance(value, tuple):
+        return ['t', [encode_value(item) for item in value]]
+    if isinstance(value, (set, frozenset)):
+        return ['s', [encode_value(item) for item in value]]
+    if isinstance(value, array.array):
+        return ['y', [value.typecode, value.tolist()]]
+    if isinstance(value, decimal.Decimal):
+        return ['n', str(value)]
+    if isinstance(value, datetime.datetime):
+        return ['w', [value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond]]
+    if isinstance(value, datetime.date):
+        return ['a', value.toordinal()]
+    if isinstance(value, datetime.timedelta):
+        return ['e', [value.days, value.seconds, value.microseconds]]
+    raise TypeError("Cannot encode value of type " + type(value).__name__)
+
+
+def decode_value(session, value, references=None):
+    """Decodes a value produced by :func:`.encode_value`.
+
+    :type session: :class:`myanimelist.session.Session`
+    :param session: A valid MAL session, used to create referenced resources.
+
+    :type value: object
+    :param value: An encoded value.
+
+    :type references: dict
+    :param references: Optional dict of already-built resources keyed by (type, id), consulted before creating new ones.
+
+    :rtype: object
+    :return: The decoded value.
+
+    """
+    if not isinstance(value, list):
+        return value
+    tag, payload = value
+    if tag == 'r':
+        key = tuple(payload)
+        if references is not None and key in references:
+            return references[key]
+        return getattr(session, payload[0])(payload[1])
+    if tag == 'd':
+        return {decode_value(session, key, references): decode_value(session, item, references)
+                for key, item in payload}
+    if tag == 'l':
+        return [decode_value(session, item, references) for item in payload]
+    if tag == 't':
+        return tuple(decode_value(session, item, references) for item in payload)
+    if tag == 's':
+        return set(decode_value(session, item, references) for item in payload)
+    if tag == 'y':
+        return array.array(payload[0], payload[1])
+    if tag == 'n':
+        return decimal.Decimal(payload)
+    if tag == 'w':
+        return datetime.datetime(*payload)
+    if tag == 'a':
+        return datetime.date.fromordinal(payload)
+    if tag == 'e':
+        return datetime.timedelta(*payload)
+    raise ValueError("Unknown encoded value tag: " + str(tag))
+
+
 def loadable(func_name):
     """Decorator for getters that require a load() upon first access.
 
@@ -84,7 +171,8 @@ def loadable(func_name):
         @functools.wraps(func)
         def _decorator(self, *args, **kwargs):
             if getattr(self, cached_name) is None:
-                getattr(self, func_name)()
+                # threads that find the attribute missing at the same time share a single load.
+                self.session._flights.do((id(self), func_name), _load_missing, self, func_name, cached_name)
             return func(self, *args, **kwargs)
 
         return _decorator
@@ -92,6 +180,72 @@ def loadable(func_name):
     return inner
 
 
+def _load_missing(self, func_name, cached_name):
+    # another thread may have loaded the attribute since it was found missing.
+    if getattr(self, cached_name) is not None:
+        return
+    # a session store may already hold this attribute, sparing the request.
+    store = self.session.store
+    if store is None or not store.hydrate(self) or getattr(self, cached_name) is None:
+        getattr(self, func_name)()
+
+
+def _hashable(value):
+    # loader arguments as a flight key; lists and sets key the same flight as the equivalent tuples and frozensets.
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset((key, _hashable(item)) for key, item in value.items())
+    return value
+
+
+def loader(func):
+    """Decorator for methods that fetch a MAL page and set the current object's attributes from it.
+
+    Concurrent calls of the same loader on the same object, with the same arguments, share a single load.
+    Resources in the session's negative cache fail straight away, and invalid-resource errors are recorded in it. Once
+    the page has been loaded, the object is written through to the session's store, if it has one, and handed to the
+    session's load listeners.
+
+    :type func: function
+    :param func: class method that loads a page into the current object
+
+    :rtype: function
+    :return: the decorated class method.
+
+    """
+
+    def _load(self, *args, **kwargs):
+        negative_cache = self.session.negative_cache
+        if negative_cache is None:
+            result = func(self, *args, **kwargs)
+        else:
+            # resources already known not to exist fail before any request is made.
+            negative_cache.check(self)
+            try:
+                result = func(self, *args, **kwargs)
+            except InvalidBaseError as e:
+                negative_cache.record(self, e)
+                raise
+        if self.session.store is not None:
+            self.session.store.upsert(self)
+        for listener in self.session._load_listeners:
+            listener(self, func.__name__)
+        return result
+
+    @functools.wraps(func)
+    def _decorator(self, *args, **kwargs):
+        key = (id(self), func.__name__)
+        if args or kwargs:
+            # a load limited by its arguments can't stand in for another.
+            key += (_hashable(args), _hashable(kwargs))
+        return self.session._flights.do(key, _load, self, *args, **kwargs)
+
+    return _decorator
+
+
 class Base(object, metaclass=abc.ABCMeta):
     """Abstract base class for MAL resources. Provides autoloading, auto-setting functionality for other MAL objects.
     """
@@ -131,6 +285,66 @@ class Base(object, metaclass=abc.ABCMeta):
         """
         self.session = session
 
+    @property
+    def _resource_type(self):
+        """Name of the session factory that creates this kind of resource, e.g. 'anime'.
+        """
+        return self.__class__.__name__.lower()
+
+    def field(self, name):
+        """Looks up an attribute that has already been set, without loading anything.
+
+        :type name: str
+        :param name: The attribute's name, e.g. 'title'.
+
+        :return: The attribute's value, or None if it hasn't been set.
+
+        """
+        return self.__dict__.get('_' + name)
+
+    def references(self):
+        """Iterates over the MAL resources referenced by this object's loaded attributes.
+
+        Nothing is loaded; only attributes that have already been set are walked.
+
+        :rtype: generator
+        :return: :class:`.Base` objects, in attribute order. A resource referenced several times is yielded each time.
+
+        """
+        stack = [value for key, value in reversed(list(self.__dict__.items()))
+                 if key.startswith('_') and value is not None]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, Base):
+                yield value
+            elif isinstance(value, dict):
+                for key, item in reversed(list(value.items())):
+                    stack.append(item)
+                    stack.append(key)
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                stack.extend(reversed(list(value)))
+
+    def to_record(self):
+        """Reduces this object to a plain record of its loaded attributes.
+
+        The record holds only lists, dicts, strings and numbers; references to other resources are stored as
+        (type, id) pairs. Use :meth:`myanimelist.session.Session.from_record` to rebuild the object.
+
+        :rtype: dict
+        :return: A dict with 'type', 'id' and 'attrs' keys.
+
+        """
+        attrs = {}
+        for key, value in self.__dict__.items():
+            if not key.startswith('_') or value is None:
+                continue
+            attrs[key[1:]] = encode_value(value)
+        return {
+            'type': self._resource_type,
+            'id': getattr(self, self._id_attribute),
+            'attrs': attrs
+        }
+
     @staticmethod
     def _validate_page(media_page):
         error_tag = media_page.xpath(".//p[@class='error_code'] | .//div[@class='badresult'] | .//div["
@@ -0,0 +1,288 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Circuit breakers, which stop a session from sending requests to MAL while it is failing to answer them.
+
+Requests are grouped into endpoint families, e.g. media pages, profiles and malappinfo, each with its own
+:class:`.CircuitBreaker`. A breaker is closed while most of its recent requests succeed quickly. Once too many of them
+fail or are slow, it opens, and further requests fail straight away with a :class:`.CircuitOpenError` instead of
+waiting on MAL. After a while it lets a probe request through, half-open: if the probe succeeds the breaker closes
+again, otherwise it stays open for another while.
+"""
+import collections
+import re
+import threading
+import time
+
+from .base import Error
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(Error):
+    """Indicates that a request wasn't sent, because MAL has been failing to answer requests like it.
+    """
+
+    def __init__(self, url, family, retry_after, message=None):
+        """Creates a new instance of CircuitOpenError.
+
+        :type url: str
+        :param url: The URL that would have been requested.
+
+        :type family: str
+        :param family: The endpoint family of the URL.
+
+        :type retry_after: float
+        :param retry_after: Number of seconds until the breaker lets a request through again.
+
+        :type message: str
+        :param message: A message to display when raising the exception.
+
+        :rtype: :class:`.CircuitOpenError`
+        :return: The desired error.
+
+        """
+        super(CircuitOpenError, self).__init__(message=message)
+        self.url = url
+        self.family = family
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return "\n".join([
+            super(CircuitOpenError, self).__str__(),
+            "URL: " + self.url,
+            "Family: " + self.family,
+            "Retry after: %.1fs" % self.retry_after
+        ])
+
+
+class CircuitBreaker(object):
+    """Tracks the failures and latencies of recent requests to one endpoint family, and decides whether to send more.
+    """
+
+    def __init__(self, family, failure_rate=0.5, slow_rate=0.5, slow_call=10.0, window=20, min_requests=10,
+                 reset_timeout=30.0):
+        """Creates a new instance of CircuitBreaker.
+
+        :type family: str
+        :param family: The endpoint family this breaker guards.
+
+        :type failure_rate: float
+        :param failure_rate: Share, between 0 and 1, of recent requests that must fail for the breaker to open.
+
+        :type slow_rate: float
+        :param slow_rate: Share, between 0 and 1, of recent requests that must be slow for the breaker to open.
+
+        :type slow_call: float
+        :param slow_call: Number of seconds after which a request counts as slow.
+
+        :type window: int
+        :param window: Number of recent requests the rates are taken over.
+
+        :type min_requests: int
+        :param min_requests: Number of requests to observe before the breaker may open.
+
+        :type reset_timeout: float
+        :param reset_timeout: Number of seconds the breaker stays open before letting a probe request through.
+
+        :rtype: :class:`.CircuitBreaker`
+        :return: The desired breaker.
+
+        """
+        self.family = family
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.slow_call = slow_call
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        # (failed, slow) for each recent request, while closed.
+        self._outcomes = collections.deque(maxlen=window)
+        self._state = CLOSED
+        # when the breaker last opened, or last let a probe through.
+        self._since = None
+
+        """Number of times the breaker has opened, and of requests it has turned away.
+        """
+        self.trips = 0
+        self.rejected = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """The breaker's state: CLOSED, OPEN or HALF_OPEN. An open breaker whose reset timeout has passed is HALF_OPEN.
+        """
+        with self._lock:
+            if self._state == OPEN and time.monotonic() >= self._since + self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def retry_after(self):
+        """Computes how long until the breaker lets a request through.
+
+        :rtype: float
+        :return: Number of seconds, or 0 if a request may be sent now.
+
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return 0.0
+            return max(self._since + self.reset_timeout - time.monotonic(), 0.0)
+
+    def allow(self, url):
+        """Asks to send a request.
+
+        :type url: str
+        :param url: The URL about to be requested.
+
+        :rtype: bool
+        :return: Whether the request is a probe, to be passed on to :meth:`.record` or :meth:`.release`.
+
+        :raises: :class:`.CircuitOpenError` if the request may not be sent.
+
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            now = time.monotonic()
+            # while half-open, a probe that hasn't come back within the reset timeout is presumed lost.
+            if now >= self._since + self.reset_timeout:
+                self._state = HALF_OPEN
+                self._since = now
+                return True
+            self.rejected += 1
+            retry_after = self._since + self.reset_timeout - now
+        raise CircuitOpenError(url, self.family, retry_after, message="Circuit open")
+
+    def record(self, probe, failed, latency=0.0):
+        """Observes the outcome of a request that was allowed through.
+
+        :type probe: bool
+        :param probe: What :meth:`.allow` returned for the request.
+
+        :type failed: bool
+        :param failed: Whether MAL failed to answer the request.
+
+        :type latency: float
+        :param latency: Number of seconds the request took.
+
+        """
+        slow = latency >= self.slow_call
+        with self._lock:
+            if probe:
+                if self._state != HALF_OPEN:
+                    return
+                if failed or slow:
+                    self._open()
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                return
+            # requests sent before the breaker opened don't count towards its next state.
+            if self._state != CLOSED:
+                return
+            self._outcomes.append((failed, slow))
+            if len(self._outcomes) < self.min_requests:
+                return
+            failures = sum(1 for outcome in self._outcomes if outcome[0])
+            slows = sum(1 for outcome in self._outcomes if outcome[1])
+            if failures >= self.failure_rate * len(self._outcomes) or slows >= self.slow_rate * len(self._outcomes):
+                self._open()
+
+    def release(self, probe):
+        """Forgets a request that was allowed through but whose outcome says nothing about MAL, e.g. one cancelled
+        before it finished.
+
+        :type probe: bool
+        :param probe: What :meth:`.allow` returned for the request.
+
+        """
+        if not probe:
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                # let the next request probe straight away.
+                self._since -= self.reset_timeout
+
+    def _open(self):
+        self._state = OPEN
+        self._since = time.monotonic()
+        self._outcomes.clear()
+        self.trips += 1
+
+
+class CircuitBreakers(object):
+    """One :class:`.CircuitBreaker` for each endpoint family a session requests.
+    """
+
+    """(family, pattern) pairs, tried in order on each URL. URLs that match none of the patterns are in the 'pages'
+    family.
+    """
+    FAMILIES = [
+        ('malappinfo', re.compile(r'/malappinfo\.php')),
+        ('profiles', re.compile(r'/(?:profile/|comments\.php)')),
+    ]
+
+    def __init__(self, families=None, **settings):
+        """Creates a new instance of CircuitBreakers.
+
+        :type families: list
+        :param families: (family, compiled regex) pairs, tried in order on each URL. Defaults to FAMILIES.
+
+        :param settings: Keyword arguments of each family's :class:`.CircuitBreaker`.
+
+        :rtype: :class:`.CircuitBreakers`
+        :return: The desired breakers.
+
+        """
+        self.families = families if families is not None else self.FAMILIES
+        self._breakers = collections.OrderedDict(
+            (family, CircuitBreaker(family, **settings)) for family in [name for (name, _) in self.families] + ['pages'])
+
+    def family(self, url):
+        """Finds the endpoint family of a URL.
+
+        :type url: str
+        :param url: The URL.
+
+        :rtype: str
+        :return: The family's name.
+
+        """
+        for (name, pattern) in self.families:
+            if pattern.search(url):
+                return name
+        return 'pages'
+
+    def breaker(self, url):
+        """Finds the breaker guarding a URL.
+
+        :type url: str
+        :param url: The URL.
+
+        :rtype: :class:`.CircuitBreaker`
+        :return: The breaker of the URL's family.
+
+        """
+        return self._breakers[self.family(url)]
+
+    def __getitem__(self, family):
+        return self._breakers[family]
+
+    def states(self):
+        """Lists the state of every family's breaker, for schedulers to hold back work that would be turned away.
+
+        :rtype: dict
+        :return: Family names mapped to CLOSED, OPEN or HALF_OPEN.
+
+        """
+        return dict((family, breaker.state) for (family, breaker) in self._breakers.items())
@@ -0,0 +1,322 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""An index of who voices which character in which media.
+
+Anime characters pages list (character, voice actor, language) triples, and character pages list the media a character
+appears in and the people voicing them. A :class:`.CastIndex` accumulates both, so that questions such as "every role of
+this person" or "voice actors shared by two shows" are answered with hash lookups instead of new requests.
+
+Resources are identified by (type, id) keys, e.g. ('person', 70).
+"""
+import collections
+import json
+import threading
+
+
+def resource_key(resource):
+    """Builds the key of a resource.
+
+    :type resource: :class:`myanimelist.base.Base` or tuple
+    :param resource: A resource, or an existing (type, id) key.
+
+    :rtype: tuple
+    :return: The resource's (type, id) key.
+
+    """
+    if isinstance(resource, tuple):
+        return resource
+    return resource._resource_type, resource.id
+
+
+class CastIndex(object):
+    """A bipartite index between people and the characters they voice, and between characters and their media.
+    """
+
+    def __init__(self):
+        """Creates a new instance of CastIndex.
+
+        :rtype: :class:`.CastIndex`
+        :return: The desired index.
+
+        """
+        self._lock = threading.RLock()
+        # (person, character, media) -> language. media is None for roles only known from a character's page.
+        self._roles = {}
+        # character -> {media: role}
+        self._appearances = collections.defaultdict(dict)
+        self._names = {}
+
+        self._person_roles = collections.defaultdict(set)
+        self._media_people = collections.defaultdict(set)
+        self._language_characters = collections.defaultdict(set)
+        self._media_cast = collections.defaultdict(dict)
+
+    def __len__(self):
+        return len(self._roles)
+
+    def add_role(self, person, character, media, language):
+        """Records that a person voices a character.
+
+        :type person: :class:`myanimelist.person.Person` or tuple
+        :param person: The voice actor, or their key.
+
+        :type character: :class:`myanimelist.character.Character` or tuple
+        :param character: The character, or its key.
+
+        :type media: :class:`myanimelist.media.Media` or tuple
+        :param media: The media the role is in, or its key. None if it isn't known.
+
+        :type language: str
+        :param language: The language of the role, e.g. 'Japanese'.
+
+        """
+        person, character = resource_key(person), resource_key(character)
+        media = resource_key(media) if media is not None else None
+        with self._lock:
+            self._roles[(person, character, media)] = language
+            self._person_roles[person].add((character, media))
+            self._language_characters[(person, language)].add(character)
+            if media is not None:
+                self._media_people[media].add(person)
+
+    def add_appearance(self, character, media, role):
+        """Records that a character appears in a media.
+
+        :type character: :class:`myanimelist.character.Character` or tuple
+        :param character: The character, or its key.
+
+        :type media: :class:`myanimelist.media.Media` or tuple
+        :param media: The media, or its key.
+
+        :type role: str
+        :param role: The character's role, e.g. 'Main'.
+
+        """
+        character, media = resource_key(character), resource_key(media)
+        with self._lock:
+            self._appearances[character][media] = role
+            self._media_cast[media][character] = role
+
+    def _add_name(self, resource, attribute):
+        name = resource.field(attribute)
+        if name is not None:
+            self._names[resource_key(resource)] = name
+
+    def add_media(self, media):
+        """Indexes the characters of a media whose characters page has been loaded.
+
+        :type media: :class:`myanimelist.media.Media`
+        :param media: The media.
+
+        """
+        self._add_name(media, 'title')
+        for character, entry in (media.field('characters') or {}).items():
+            self._add_name(character, 'name')
+            self.add_appearance(character, media, entry.get('role'))
+            for person, language in entry.get('voice_actors', {}).items():
+                self._add_name(person, 'name')
+                self.add_role(person, character, media, language)
+
+    def add_character(self, character):
+        """Indexes the appearances and voice actors of a character whose page has been loaded.
+
+        :type character: :class:`myanimelist.character.Character`
+        :param character: The character.
+
+        """
+        self._add_name(character, 'name')
+        for attribute in ('animeography', 'mangaography'):
+            for media, role in (character.field(attribute) or {}).items():
+                self._add_name(media, 'title')
+                self.add_appearance(character, media, role)
+        for person, language in (character.field('voice_actors') or {}).items():
+            self._add_name(person, 'name')
+            self.add_role(person, character, None, language)
+
+    def listen(self, session):
+        """Indexes every characters page and character page loaded through a session from now on.
+
+        :type session: :class:`myanimelist.session.Session`
+        :param session: The session to listen to.
+
+        :rtype: :class:`.CastIndex`
+        :return: The current index.
+
+        """
+        session.add_load_listener(self._on_load)
+        return self
+
+    def _on_load(self, resource, loader_name):
+        if loader_name == 'load_characters' and resource._resource_type in ('anime', 'manga'):
+            self.add_media(resource)
+        elif loader_name == 'load' and resource._resource_type == 'character':
+            self.add_character(resource)
+
+    def name(self, resource):
+        """Looks up the name or title a resource was indexed with.
+
+        :type resource: :class:`myanimelist.base.Base` or tuple
+        :param resource: A resource or its key.
+
+        :rtype: str
+        :return: The name, or None if it isn't known.
+
+        """
+        return self._names.get(resource_key(resource))
+
+    def roles(self, person):
+        """Lists every role of a person.
+
+        :type person: :class:`myanimelist.person.Person` or tuple
+        :param person: The person, or their key.
+
+        :rtype: list
+        :return: dicts with 'character', 'media', 'language' and 'role' keys, sorted by media then character. Roles only
+            known from a character's page have None as their media and role.
+
+        """
+        person = resource_key(person)
+        with self._lock:
+            entries = self._person_roles.get(person, set())
+            # a role known from a media's page supersedes the same role known only from the character's page.
+            placed = set(character for character, media in entries if media is not None)
+            roles = [{'character': character, 'media': media, 'language': self._roles[(person, character, media)],
+                      'role': self._appearances.get(character, {}).get(media) if media is not None else None}
+                     for character, media in entries if media is not None or character not in placed]
+        return sorted(roles, key=lambda role: (role['media'] or ('', 0), role['character']))
+
+    def voice_actors(self, media):
+        """Lists the people voicing characters in a media.
+
+        :type media: :class:`myanimelist.media.Media` or tuple
+        :param media: The media, or its key.
+
+        :rtype: set
+        :return: Person keys.
+
+        """
+        with self._lock:
+            return set(self._media_people.get(resource_key(media), ()))
+
+    def shared_voice_actors(self, media, other_media):
+        """Lists the people voicing characters in both of two media.
+
+        :type media: :class:`myanimelist.media.Media` or tuple
+        :param media: A media, or its key.
+
+        :type other_media: :class:`myanimelist.media.Media` or tuple
+        :param other_media: Another media, or its key.
+
+        :rtype: set
+        :return: Person keys.
+
+        """
+        with self._lock:
+            return self._media_people.get(resource_key(media), set()) & \
+                self._media_people.get(resource_key(other_media), set())
+
+    def characters_voiced(self, person, language=None):
+        """Lists the characters a person voices.
+
+        :type person: :class:`myanimelist.person.Person` or tuple
+        :param person: The person, or their key.
+
+        :type language: str
+        :param language: Only list roles in this language, e.g. 'English'. Defaults to every language.
+
+        :rtype: set
+        :return: Character keys.
+
+        """
+        person = resource_key(person)
+        with self._lock:
+            if language is not None:
+                return set(self._language_characters.get((person, language), ()))
+            return set(character for character, _ in self._person_roles.get(person, ()))
+
+    def appearances(self, character):
+        """Lists the media a character appears in.
+
+        :type character: :class:`myanimelist.character.Character` or tuple
+        :param character: The character, or its key.
+
+        :rtype: dict
+        :return: Media keys as keys and roles as values.
+
+        """
+        with self._lock:
+            return dict(self._appearances.get(resource_key(character), {}))
+
+    def cast(self, media):
+        """Lists the characters appearing in a media.
+
+        :type media: :class:`myanimelist.media.Media` or tuple
+        :param media: The media, or its key.
+
+        :rtype: dict
+        :return: Character keys as keys and roles as values.
+
+        """
+        with self._lock:
+            return dict(self._media_cast.get(resource_key(media), {}))
+
+    def to_dict(self):
+        """Reduces the index to plain lists and strings.
+
+        :rtype: dict
+        :return: A dict with 'roles', 'appearances' and 'names' keys.
+
+        """
+        with self._lock:
+            return {
+                'roles': [[list(person), list(character), list(media) if media is not None else None, language]
+                          for (person, character, media), language in self._roles.items()],
+                'appearances': [[list(character), list(media), role]
+                                for character, media_roles in self._appearances.items()
+                                for media, role in media_roles.items()],
+                'names': [[list(key), name] for key, name in self._names.items()],
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds an index from :meth:`.to_dict` output.
+
+        :type data: dict
+        :param data: A dict produced by :meth:`.to_dict`.
+
+        :rtype: :class:`.CastIndex`
+        :return: The rebuilt index.
+
+        """
+        index = cls()
+        for person, character, media, language in data['roles']:
+            index.add_role(tuple(person), tuple(character), tuple(media) if media is not None else None, language)
+        for character, media, role in data['appearances']:
+            index.add_appearance(tuple(character), tuple(media), role)
+        for key, name in data['names']:
+            index._names[tuple(key)] = name
+        return index
+
+    def save(self, path):
+        """Writes the index to a JSON file.
+
+        :type path: str
+        :param path: The file's path.
+
+        """
+        with open(path, 'w') as index_file:
+            json.dump(self.to_dict(), index_file, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        """Reads an index written by :meth:`.save`.
+
+        :type path: str
+        :param path: The file's path.
+
+        :rtype: :class:`.CastIndex`
+        :return: The index.
+
+        """
+        with open(path) as index_file:
+            return cls.from_dict(json.load(index_file))
@@ -4,7 +4,8 @@
 import re
 
 from . import utilities
-from .base import Base, MalformedPageError, InvalidBaseError, loadable
+from .base import Base, MalformedPageError, InvalidBaseError, loadable, loader
+from .reference import CharacterReference
 
 
 class MalformedCharacterPageError(MalformedPageError):
@@ -302,6 +303,7 @@ class Character(Base):
 
         return character_info
 
+    @loader
     def load(self):
         """Fetches the MAL character page and sets the current character's attributes.
 
@@ -309,10 +311,11 @@ class Character(Base):
         :return: Current character object.
 
         """
-        character = self.session.session.get('https://myanimelist.net/character/' + str(self.id)).text
-        self.set(self.parse(utilities.get_clean_dom(character)))
+        character = self.session.fetch_dom('https://myanimelist.net/character/' + str(self.id), content_only=True)
+        self.set(self.parse(character))
         return self
 
+    @loader
     def load_favorites(self):
         """Fetches the MAL character favorites page and sets the current character's favorites attributes.
 
@@ -320,12 +323,13 @@ class Character(Base):
         :return: Current character object.
 
         """
-        character = self.session.session.get(
+        character = self.session.fetch_dom(
                 'https://myanimelist.net/character/' + str(self.id) + '/' + utilities.urlencode(
-                        self.name) + '/favorites').text
-        self.set(self.parse_favorites(utilities.get_clean_dom(character)))
+                        self.name) + '/favorites', content_only=True)
+        self.set(self.parse_favorites(character))
         return self
 
+    @loader
     def load_pictures(self):
         """Fetches the MAL character pictures page and sets the current character's pictures attributes.
 
@@ -333,12 +337,13 @@ class Character(Base):
         :return: Current character object.
 
         """
-        character = self.session.session.get(
+        character = self.session.fetch_dom(
                 'https://myanimelist.net/character/' + str(self.id) + '/' + utilities.urlencode(
-                        self.name) + '/pictures').text
-        self.set(self.parse_pictures(utilities.get_clean_dom(character)))
+                        self.name) + '/pictures', content_only=True)
+        self.set(self.parse_pictures(character))
         return self
 
+    @loader
     def load_clubs(self):
         """Fetches the MAL character clubs page and sets the current character's clubs attributes.
 
@@ -346,10 +351,10 @@ class Character(Base):
         :return: Current character object.
 
         """
-        character = self.session.session.get(
+        character = self.session.fetch_dom(
                 'https://myanimelist.net/character/' + str(self.id) + '/' + utilities.urlencode(
-                        self.name) + '/clubs').text
-        self.set(self.parse_clubs(utilities.get_clean_dom(character)))
+                        self.name) + '/clubs', content_only=True)
+        self.set(self.parse_clubs(character))
         return self
 
     @property
@@ -435,3 +440,6 @@ class Character(Base):
         """List of clubs relevant to this character.
         """
         return self._clubs
+
+
+Character.register(CharacterReference)
@@ -0,0 +1,680 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""A resumable crawler that walks the references between MAL resources.
+
+Crawl tasks are (type, id, loader) triples, e.g. ('anime', 1, 'load_characters'). They are kept in a
+:class:`.Frontier`, a SQLite table that deduplicates them, orders them by priority and records which ones are done, so
+that a crawl interrupted at any point picks up where it left off.
+
+A crawl can be spread over several processes or machines sharing one frontier file. Every task belongs to a shard, picked
+by a consistent hash of its (type, id), and each :class:`.Worker` claims tasks from its own shard only. Claimed tasks are
+leased to the worker, which renews its leases with heartbeats; the tasks of a worker that stops heartbeating are
+reclaimed once their leases expire.
+"""
+import concurrent.futures
+import contextlib
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from .base import InvalidBaseError
+from .breaker import CircuitOpenError
+from .throttle import RateLimiter
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    type TEXT NOT NULL,
+    id NOT NULL,
+    loader TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at REAL,
+    shard INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    PRIMARY KEY (type, id, loader)
+);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    shard INTEGER NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+_INDICES = """
+CREATE INDEX IF NOT EXISTS tasks_queue ON tasks (state, priority);
+CREATE INDEX IF NOT EXISTS tasks_shard_queue ON tasks (shard, state, priority);
+"""
+
+# columns added to the tasks table after its first release, with their definitions.
+_TASK_COLUMNS = (
+    ('shard', 'INTEGER NOT NULL DEFAULT 0'),
+    ('lease_owner', 'TEXT'),
+    ('lease_expires', 'REAL'),
+)
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+"""Loaders that the default expansion queues for each type of discovered resource.
+"""
+DEFAULT_LOADERS = {
+    'anime': ('load', 'load_characters'),
+    'manga': ('load', 'load_characters'),
+    'character': ('load',),
+    'user': ('load',),
+}
+
+
+def default_expand(resource, task):
+    """Queues the default loaders for every resource referenced by a freshly-loaded resource.
+
+    :type resource: :class:`myanimelist.base.Base`
+    :param resource: The resource that was just loaded.
+
+    :type task: tuple
+    :param task: The (type, id, loader, priority) task that loaded it.
+
+    :rtype: generator
+    :return: (type, id, loader, priority) tasks, one level deeper than the given task.
+
+    """
+    for reference in resource.references():
+        for loader in DEFAULT_LOADERS.get(reference._resource_type, ()):
+            yield (reference._resource_type, getattr(reference, reference._id_attribute), loader, task[3] + 1)
+
+
+def shard_of(resource_type, resource_id, num_shards):
+    """Picks the shard a resource belongs to, with jump consistent hashing.
+
+    Growing the number of shards from n to n + 1 only moves about 1 / (n + 1) of the resources, all into the new shard.
+
+    :type resource_type: str
+    :param resource_type: The resource's type, e.g. 'anime'.
+
+    :param resource_id: The resource's id.
+
+    :type num_shards: int
+    :param num_shards: The number of shards.
+
+    :rtype: int
+    :return: A shard number, from 0 to num_shards - 1.
+
+    """
+    digest = hashlib.md5((u'%s:%s' % (resource_type, resource_id)).encode('utf-8')).hexdigest()
+    key = int(digest[:16], 16)
+    bucket, jump = -1, 0
+    while jump < num_shards:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+
+class Frontier(object):
+    """A persistent, deduplicating, priority-ordered queue of crawl tasks. Lower priorities are crawled first.
+
+    A frontier file can be shared by several processes; every change is made in a single immediate transaction.
+    """
+
+    def __init__(self, path=':memory:', num_shards=None):
+        """Creates a new instance of Frontier.
+
+        :type path: str
+        :param path: Path to the SQLite database file. Defaults to an in-memory database.
+
+        :type num_shards: int
+        :param num_shards: Number of shards to split tasks into. Defaults to the number the frontier was created with, or
+            1 for a new frontier. Passing a different number reshards the existing tasks.
+
+        :rtype: :class:`.Frontier`
+        :return: The desired frontier.
+
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info(tasks)")]
+            for column, definition in _TASK_COLUMNS:
+                if column not in columns:
+                    self._connection.execute("ALTER TABLE tasks ADD COLUMN " + column + " " + definition)
+            self._connection.executescript(_INDICES)
+            row = self._connection.execute("SELECT value FROM meta WHERE key = 'num_shards'").fetchone()
+            self.num_shards = row[0] if row is not None else 1
+            if row is None or (num_shards is not None and num_shards != self.num_shards):
+                self.reshard(num_shards or 1)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two processes can't claim the same tasks.
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+
+    def close(self):
+        """Closes the underlying database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def add(self, resource_type, resource_id, loader='load', priority=0):
+        """Adds a task, unless it is already known.
+
+        A pending task that is added again with a lower priority is moved up the queue.
+
+        :type resource_type: str
+        :param resource_type: The resource's type, e.g. 'anime'.
+
+        :param resource_id: The resource's id.
+
+        :type loader: str
+        :param loader: Name of the resource's loader method, e.g. 'load_stats'.
+
+        :type priority: int
+        :param priority: The task's priority.
+
+        """
+        self.add_many([(resource_type, resource_id, loader, priority)])
+
+    def add_many(self, tasks):
+        """Adds tasks in a single transaction.
+
+        :type tasks: iterable
+        :param tasks: (type, id, loader, priority) tuples.
+
+        """
+        with self._transaction() as cursor:
+            self._add(cursor, tasks)
+
+    def _add(self, cursor, tasks):
+        now = time.time()
+        for resource_type, resource_id, loader, priority in tasks:
+            cursor.execute("INSERT OR IGNORE INTO tasks (type, id, loader, priority, updated_at, shard) "
+                           "VALUES (?, ?, ?, ?, ?, ?)",
+                           (resource_type, resource_id, loader, priority, now,
+                            shard_of(resource_type, resource_id, self.num_shards)))
+            if cursor.rowcount == 0:
+                cursor.execute("UPDATE tasks SET priority = ? "
+                               "WHERE type = ? AND id = ? AND loader = ? AND state = ? AND priority > ?",
+                               (priority, resource_type, resource_id, loader, PENDING, priority))
+
+    def reshard(self, num_shards):
+        """Changes the number of shards, moving every task to its new shard.
+
+        :type num_shards: int
+        :param num_shards: The new number of shards.
+
+        """
+        with self._transaction() as cursor:
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('num_shards', ?)", (num_shards,))
+            self.num_shards = num_shards
+            cursor.executemany("UPDATE tasks SET shard = ? WHERE rowid = ?",
+                               [(shard_of(resource_type, resource_id, num_shards), rowid) for rowid, resource_type, resource_id
+                                in cursor.execute("SELECT rowid, type, id FROM tasks").fetchall()])
+
+    def claim(self, limit=1, shard=None, owner=None, lease=None):
+        """Takes the highest-priority pending tasks off the queue, marking them as running.
+
+        Running tasks whose lease has expired are claimable too, as their worker is presumed dead.
+
+        :type limit: int
+        :param limit: Maximum number of tasks to claim.
+
+        :type shard: int
+        :param shard: Only claim tasks from this shard. None claims from every shard.
+
+        :type owner: str
+        :param owner: Identifier of the worker claiming the tasks.
+
+        :type lease: float
+        :param lease: Number of seconds the tasks are leased for. None leases them indefinitely.
+
+        :rtype: list
+        :return: (type, id, loader, priority) tuples.
+
+        """
+        now = time.time()
+        query = ("SELECT rowid, type, id, loader, priority FROM tasks "
+                 "WHERE (state = ? OR (state = ? AND lease_expires < ?))")
+        parameters = [PENDING, RUNNING, now]
+        if shard is not None:
+            query += " AND shard = ?"
+            parameters.append(shard)
+        query += " ORDER BY priority, rowid LIMIT ?"
+        parameters.append(limit)
+        with self._transaction() as cursor:
+            rows = cursor.execute(query, parameters).fetchall()
+            cursor.executemany(
+                "UPDATE tasks SET state = ?, attempts = attempts + 1, updated_at = ?, lease_owner = ?, lease_expires = ? "
+                "WHERE rowid = ?",
+                [(RUNNING, now, owner, now + lease if lease is not None else None, row[0]) for row in rows])
+        return [tuple(row[1:]) for row in rows]
+
+    def complete(self, task, discovered=()):
+        """Marks a task as done and adds the tasks discovered while running it, in a single transaction.
+
+        :type task: tuple
+        :param task: The (type, id, loader, priority) task that was run.
+
+        :type discovered: iterable
+        :param discovered: (type, id, loader, priority) tuples to add.
+
+        """
+        with self._transaction() as cursor:
+            cursor.execute("UPDATE tasks SET state = ?, error = NULL, updated_at = ?, lease_owner = NULL, "
+                           "lease_expires = NULL "
+                           "WHERE type = ? AND id = ? AND loader = ?", (DONE, time.time()) + tuple(task[:3]))
+            self._add(cursor, discovered)
+
+    def fail(self, task, error, retry=True):
+        """Records that a task failed, putting it back on the queue if it should be retried.
+
+        :type task: tuple
+        :param task: The (type, id, loader, priority) task that was run.
+
+        :type error: str
+        :param error: A description of the failure.
+
+        :type retry: bool
+        :param retry: Whether the task should be run again.
+
+        """
+        with self._transaction() as cursor:
+            cursor.execute("UPDATE tasks SET state = ?, error = ?, updated_at = ?, lease_owner = NULL, "
+                           "lease_expires = NULL WHERE type = ? AND id = ? AND loader = ?",
+                           (PENDING if retry else FAILED, error, time.time()) + tuple(task[:3]))
+
+    def recover(self):
+        """Puts tasks left running by an interrupted crawl back on the queue.
+
+        Tasks leased to a worker are left alone until their lease expires.
+
+        :rtype: int
+        :return: The number of recovered tasks.
+
+        """
+        with self._transaction() as cursor:
+            return cursor.execute("UPDATE tasks SET state = ?, lease_owner = NULL, lease_expires = NULL "
+                                  "WHERE state = ? AND (lease_expires IS NULL OR lease_expires < ?)",
+                                  (PENDING, RUNNING, time.time())).rowcount
+
+    def reclaim(self):
+        """Puts tasks whose lease has expired back on the queue.
+
+        :rtype: int
+        :return: The number of reclaimed tasks.
+
+        """
+        with self._transaction() as cursor:
+            return cursor.execute("UPDATE tasks SET state = ?, lease_owner = NULL, lease_expires = NULL "
+                                  "WHERE state = ? AND lease_expires < ?", (PENDING, RUNNING, time.time())).rowcount
+
+    def heartbeat(self, owner, shard, lease):
+        """Records that a worker is alive, and renews the leases on its running tasks.
+
+        :type owner: str
+        :param owner: The worker's identifier.
+
+        :type shard: int
+        :param shard: The shard the worker is crawling.
+
+        :type lease: float
+        :param lease: Number of seconds to renew the leases for.
+
+        """
+        now = time.time()
+        with self._transaction() as cursor:
+            cursor.execute("INSERT OR REPLACE INTO workers (worker_id, shard, last_seen) VALUES (?, ?, ?)",
+                           (owner, shard, now))
+            cursor.execute("UPDATE tasks SET lease_expires = ? WHERE state = ? AND lease_owner = ?",
+                           (now + lease, RUNNING, owner))
+
+    def unregister(self, owner):
+        """Removes a worker that stopped cleanly.
+
+        :type owner: str
+        :param owner: The worker's identifier.
+
+        """
+        with self._transaction() as cursor:
+            cursor.execute("DELETE FROM workers WHERE worker_id = ?", (owner,))
+
+    def orphaned_shards(self, timeout):
+        """Lists the shards that no worker has heartbeated for recently.
+
+        :type timeout: float
+        :param timeout: Number of seconds after its last heartbeat that a worker is presumed dead.
+
+        :rtype: list
+        :return: The orphaned shard numbers.
+
+        """
+        with self._lock:
+            alive = set(row[0] for row in self._connection.execute("SELECT DISTINCT shard FROM workers WHERE last_seen >= ?",
+                                                                   (time.time() - timeout,)))
+        return [shard for shard in range(self.num_shards) if shard not in alive]
+
+    def pending(self, shards=None):
+        """Counts pending tasks.
+
+        :type shards: list
+        :param shards: Only count tasks in these shards. None counts every shard.
+
+        :rtype: int
+        :return: The number of pending tasks.
+
+        """
+        query = "SELECT COUNT(*) FROM tasks WHERE state = ?"
+        parameters = [PENDING]
+        if shards is not None:
+            query += " AND shard IN (" + ", ".join("?" * len(shards)) + ")"
+            parameters.extend(shards)
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchone()[0]
+
+    def active(self):
+        """Counts running tasks that are still held by a live lease, or by a crawl without leases.
+
+        :rtype: int
+        :return: The number of active tasks.
+
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM tasks WHERE state = ? "
+                                            "AND (lease_expires IS NULL OR lease_expires >= ?)",
+                                            (RUNNING, time.time())).fetchone()[0]
+
+    def attempts(self, task):
+        """Looks up how many times a task has been claimed.
+
+        :type task: tuple
+        :param task: A (type, id, loader, ...) task.
+
+        :rtype: int
+        :return: The number of attempts.
+
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT attempts FROM tasks WHERE type = ? AND id = ? AND loader = ?",
+                                           tuple(task[:3])).fetchone()
+        return row[0] if row is not None else 0
+
+    def counts(self):
+        """Counts tasks by state.
+
+        :rtype: dict
+        :return: A dict with states, e.g. 'pending' or 'done', as keys and numbers of tasks as values.
+
+        """
+        counts = dict.fromkeys((PENDING, RUNNING, DONE, FAILED), 0)
+        with self._lock:
+            counts.update(self._connection.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+        return counts
+
+
+class Crawler(object):
+    """Runs the tasks of a :class:`.Frontier` through a session, queueing the references each loaded resource reveals.
+    """
+
+    def __init__(self, session, frontier=None, concurrency=4, expand=default_expand, max_attempts=3):
+        """Creates a new instance of Crawler.
+
+        :type session: :class:`myanimelist.session.Session`
+        :param session: A valid MAL session, used for every request.
+
+        :type frontier: :class:`.Frontier`
+        :param frontier: The frontier to crawl. Defaults to an in-memory one.
+
+        :type concurrency: int
+        :param concurrency: Number of tasks run at once.
+
+        :type expand: function
+        :param expand: Given a loaded resource and the task that loaded it, returns the tasks to queue next.
+
+        :type max_attempts: int
+        :param max_attempts: Number of times a failing task is tried before it is given up on.
+
+        :rtype: :class:`.Crawler`
+        :return: The desired crawler.
+
+        """
+        self.session = session
+        self.frontier = frontier if frontier is not None else Frontier()
+        self.concurrency = concurrency
+        self.expand = expand
+        self.max_attempts = max_attempts
+
+    def seed(self, resource_type, resource_id, loader='load', priority=0):
+        """Adds a starting point to the crawl.
+
+        :type resource_type: str
+        :param resource_type: The resource's type, e.g. 'anime'.
+
+        :param resource_id: The resource's id.
+
+        :type loader: str
+        :param loader: Name of the resource's loader method.
+
+        :type priority: int
+        :param priority: The task's priority.
+
+        :rtype: :class:`.Crawler`
+        :return: The current crawler.
+
+        """
+        self.frontier.add(resource_type, resource_id, loader, priority)
+        return self
+
+    def fetch(self, task):
+        """Runs a single task.
+
+        :type task: tuple
+        :param task: A (type, id, loader, priority) task.
+
+        :rtype: :class:`myanimelist.base.Base`
+        :return: The loaded resource.
+
+        """
+        resource = getattr(self.session, task[0])(task[1])
+        getattr(resource, task[2])()
+        return resource
+
+    def _recover(self):
+        self.frontier.recover()
+
+    def _claim(self, limit):
+        return self.frontier.claim(limit)
+
+    def _wait(self):
+        # called when there is nothing left to claim; returns whether to look again.
+        return False
+
+    def run(self, limit=None):
+        """Crawls until the frontier is exhausted, or until a number of tasks have been run.
+
+        Progress is checkpointed after every task, so an interrupted run can be resumed by calling run() again.
+
+        :type limit: int
+        :param limit: Maximum number of tasks to run. None runs until the frontier is empty.
+
+        :rtype: dict
+        :return: Numbers of tasks 'completed', 'failed' and 'deferred' during this run. Tasks are deferred when the
+            session's circuit breakers turn them away; they are put back on the queue, and no more tasks are started
+            until the breaker lets requests through again.
+
+        """
+        self._recover()
+        stats = {'completed': 0, 'failed': 0, 'deferred': 0}
+        started = 0
+        in_flight = {}
+        paused_until = 0.0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while True:
+                pause = paused_until - time.monotonic()
+                if pause > 0 and not in_flight:
+                    time.sleep(pause)
+                    pause = 0
+                room = self.concurrency - len(in_flight) if pause <= 0 else 0
+                if limit is not None:
+                    room = min(room, limit - started)
+                if room > 0:
+                    for task in self._claim(room):
+                        in_flight[pool.submit(self.fetch, task)] = task
+                        started += 1
+                if not in_flight:
+                    if room > 0 and self._wait():
+                        continue
+                    break
+                done, _ = concurrent.futures.wait(list(in_flight), return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    task = in_flight.pop(future)
+                    try:
+                        resource = future.result()
+                    except CircuitOpenError as e:
+                        # MAL is down rather than the task failing, so it is retried however many attempts it has had.
+                        self.frontier.fail(task, repr(e), retry=True)
+                        stats['deferred'] += 1
+                        started -= 1
+                        paused_until = max(paused_until, time.monotonic() + e.retry_after)
+                        continue
+                    except InvalidBaseError as e:
+                        # the resource does not exist, so retrying can't help.
+                        self.frontier.fail(task, repr(e), retry=False)
+                        stats['failed'] += 1
+                        continue
+                    except Exception as e:
+                        self.frontier.fail(task, repr(e), retry=self.frontier.attempts(task) < self.max_attempts)
+                        stats['failed'] += 1
+                        continue
+                    self.frontier.complete(task, self.expand(resource, task))
+                    stats['completed'] += 1
+        return stats
+
+
+class Worker(Crawler):
+    """Crawls one shard of a frontier shared with other workers, possibly in other processes or on other machines.
+
+    Each worker leases the tasks it claims and renews its leases from a heartbeat thread, so that the tasks of a dead
+    worker go back to the queue once their leases expire.
+    """
+
+    def __init__(self, session, frontier, shard, worker_id=None, lease=60.0, heartbeat=None, rate=None, burst=1,
+                 adopt_orphans=True, poll=1.0, **kwargs):
+        """Creates a new instance of Worker.
+
+        :type session: :class:`myanimelist.session.Session`
+        :param session: A valid MAL session, used for every request. Each worker should have its own.
+
+        :type frontier: :class:`.Frontier`
+        :param frontier: The shared frontier to crawl.
+
+        :type shard: int
+        :param shard: The shard this worker crawls, from 0 to frontier.num_shards - 1.
+
+        :type worker_id: str
+        :param worker_id: A unique identifier for this worker. Defaults to one built from the host name and process id.
+
+        :type lease: float
+        :param lease: Number of seconds claimed tasks are leased for.
+
+        :type heartbeat: float
+        :param heartbeat: Number of seconds between heartbeats. Defaults to a third of the lease.
+
+        :type rate: float
+        :param rate: This worker's request budget, in requests per second. None leaves the session's rate limiter alone.
+
+        :type burst: int
+        :param burst: Number of requests that may be made back-to-back within the rate budget.
+
+        :type adopt_orphans: bool
+        :param adopt_orphans: Whether to crawl shards without a live worker once this worker's shard is exhausted.
+
+        :type poll: float
+        :param poll: Number of seconds to wait before looking for tasks again, while other workers may still add some.
+
+        :rtype: :class:`.Worker`
+        :return: The desired worker.
+
+        """
+        super(Worker, self).__init__(session, frontier, **kwargs)
+        if not 0 <= shard < frontier.num_shards:
+            raise ValueError("Shard " + str(shard) + " is out of range for " + str(frontier.num_shards) + " shards")
+        self.shard = shard
+        self.worker_id = worker_id if worker_id is not None else u'%s-%d-%d' % (socket.gethostname(), os.getpid(),
+                                                                                  id(self))
+        self.lease = lease
+        self.heartbeat_interval = heartbeat if heartbeat is not None else lease / 3.0
+        self.adopt_orphans = adopt_orphans
+        self.poll = poll
+        if rate is not None:
+            self.session.rate_limiter = RateLimiter(rate, burst)
+        # announce this worker straight away, so its shard isn't adopted by the others while it starts up.
+        self.frontier.heartbeat(self.worker_id, self.shard, self.lease)
+
+    def _recover(self):
+        self.frontier.reclaim()
+
+    def _claim(self, limit):
+        tasks = self.frontier.claim(limit, shard=self.shard, owner=self.worker_id, lease=self.lease)
+        if not tasks and self.adopt_orphans:
+            for shard in self.frontier.orphaned_shards(self.lease):
+                tasks = self.frontier.claim(limit, shard=shard, owner=self.worker_id, lease=self.lease)
+                if tasks:
+                    break
+        return tasks
+
+    def _wait(self):
+        # other workers may still discover tasks in this shard, as long as any live worker has work left.
+        orphaned = self.frontier.orphaned_shards(self.lease)
+        live = [shard for shard in range(self.frontier.num_shards) if shard not in orphaned]
+        if self.frontier.active() == 0 and self.frontier.pending(live) == 0:
+            return False
+        time.sleep(self.poll)
+        return True
+
+    def _beat(self, stopped):
+        while not stopped.wait(self.heartbeat_interval):
+            self.frontier.heartbeat(self.worker_id, self.shard, self.lease)
+
+    def run(self, limit=None):
+        """Crawls this worker's shard until it and every other live worker's tasks are exhausted, or until a number of
+        tasks have been run.
+
+        :type limit: int
+        :param limit: Maximum number of tasks to run. None runs until the frontier is empty.
+
+        :rtype: dict
+        :return: Numbers of tasks 'completed', 'failed' and 'deferred' during this run.
+
+        """
+        self.frontier.heartbeat(self.worker_id, self.shard, self.lease)
+        stopped = threading.Event()
+        beat = threading.Thread(target=self._beat, args=(stopped,))
+        beat.daemon = True
+        beat.start()
+        try:
+            return super(Worker, self).run(limit)
+        finally:
+            stopped.set()
+            beat.join()
+            self.frontier.unregister(self.worker_id)
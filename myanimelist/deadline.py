@@ -0,0 +1,195 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Deadlines and cancellation for the requests a session makes.
+
+A :class:`.Deadline` is entered with :meth:`myanimelist.session.Session.within`, and bounds every request the current
+thread makes until it is exited, however many pages the loaders it calls go through: each wait on MAL is shortened to
+the time left, and requests past the deadline fail with :class:`.DeadlineExceededError`. A deadline may also be
+cancelled from another thread, in which case the requests it bounds fail with :class:`.RequestCancelledError`, at the
+latest once the chunk of response being read has arrived.
+"""
+import threading
+import time
+
+from .base import Error
+
+
+class RequestTimeoutError(Error):
+    """Indicates that MAL didn't respond to a request in time.
+    """
+
+    def __init__(self, url, message=None):
+        """Creates a new instance of RequestTimeoutError.
+
+        :type url: str
+        :param url: The requested URL.
+
+        :type message: str
+        :param message: A message to display when raising the exception.
+
+        :rtype: :class:`.RequestTimeoutError`
+        :return: The desired error.
+
+        """
+        super(RequestTimeoutError, self).__init__(message=message)
+        self.url = url
+
+    def __str__(self):
+        return "\n".join([
+            super(RequestTimeoutError, self).__str__(),
+            "URL: " + self.url
+        ])
+
+
+class DeadlineExceededError(RequestTimeoutError):
+    """Indicates that a request couldn't finish before the deadline bounding it.
+    """
+    pass
+
+
+class RequestCancelledError(Error):
+    """Indicates that the deadline bounding a request was cancelled.
+    """
+
+    def __init__(self, url, message=None):
+        """Creates a new instance of RequestCancelledError.
+
+        :type url: str
+        :param url: The requested URL.
+
+        :type message: str
+        :param message: A message to display when raising the exception.
+
+        :rtype: :class:`.RequestCancelledError`
+        :return: The desired error.
+
+        """
+        super(RequestCancelledError, self).__init__(message=message)
+        self.url = url
+
+    def __str__(self):
+        return "\n".join([
+            super(RequestCancelledError, self).__str__(),
+            "URL: " + self.url
+        ])
+
+
+class Deadline(object):
+    """A point in time by which requests must have finished, which may also be cancelled.
+    """
+
+    def __init__(self, seconds=None):
+        """Creates a new instance of Deadline.
+
+        :type seconds: float
+        :param seconds: Number of seconds from now until the deadline. None for a deadline that only ends when cancelled.
+
+        :rtype: :class:`.Deadline`
+        :return: The desired deadline.
+
+        """
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Cancels the requests bounded by this deadline. Safe to call from any thread.
+
+        :rtype: :class:`.Deadline`
+        :return: The current deadline.
+
+        """
+        self._cancelled.set()
+        return self
+
+    @property
+    def cancelled(self):
+        """Whether or not this deadline has been cancelled.
+        """
+        return self._cancelled.is_set()
+
+    def remaining(self):
+        """Computes the time left until this deadline.
+
+        :rtype: float
+        :return: Number of seconds left, or 0 once it has passed. None if this deadline has no time limit.
+
+        """
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def check(self, url):
+        """Fails if a request may no longer be made within this deadline.
+
+        :type url: str
+        :param url: The URL about to be requested, or being read.
+
+        :raises: :class:`.RequestCancelledError` if this deadline was cancelled, :class:`.DeadlineExceededError` if it
+            has passed.
+
+        """
+        if self.cancelled:
+            raise RequestCancelledError(url, message="Request cancelled")
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            raise DeadlineExceededError(url, message="Deadline exceeded")
+
+
+# each thread's stack of entered deadlines, innermost last.
+_scopes = threading.local()
+
+
+def entered():
+    """Lists the deadlines the current thread has entered.
+
+    :rtype: list
+    :return: Deadlines, innermost last.
+
+    """
+    return list(getattr(_scopes, 'deadlines', ()))
+
+
+def push(deadline):
+    """Enters a deadline on the current thread.
+
+    :type deadline: :class:`.Deadline`
+    :param deadline: The deadline to enter.
+
+    """
+    if not hasattr(_scopes, 'deadlines'):
+        _scopes.deadlines = []
+    _scopes.deadlines.append(deadline)
+
+
+def pop(deadline):
+    """Exits a deadline entered on the current thread.
+
+    :type deadline: :class:`.Deadline`
+    :param deadline: The deadline to exit.
+
+    """
+    _scopes.deadlines.remove(deadline)
+
+
+def check(url):
+    """Fails if a request may no longer be made within the deadlines the current thread has entered.
+
+    :type url: str
+    :param url: The URL about to be requested, or being read.
+
+    :raises: :class:`.RequestCancelledError` or :class:`.DeadlineExceededError`.
+
+    """
+    for deadline in getattr(_scopes, 'deadlines', ()):
+        deadline.check(url)
+
+
+def remaining():
+    """Computes the time left until the earliest deadline the current thread has entered.
+
+    :rtype: float
+    :return: Number of seconds left. None if no entered deadline has a time limit.
+
+    """
+    times = [left for left in (deadline.remaining() for deadline in getattr(_scopes, 'deadlines', ()))
+             if left is not None]
+    return min(times) if times else None
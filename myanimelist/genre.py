@@ -3,8 +3,8 @@
 
 import re
 
-from . import utilities
-from .base import Base, MalformedPageError, InvalidBaseError, loadable
+from .base import Base, MalformedPageError, InvalidBaseError, loadable, loader
+from .reference import GenreReference
 
 
 class MalformedGenrePageError(MalformedPageError):
@@ -45,12 +45,16 @@ class Genre(Base):
 
         return genre_info
 
+    @loader
     def load(self):
-        genre = self.session.session.get('https://myanimelist.net/anime/genre/' + str(self.id)).text
-        self.set(self.parse(utilities.get_clean_dom(genre)))
+        genre = self.session.fetch_dom('https://myanimelist.net/anime/genre/' + str(self.id), content_only=True)
+        self.set(self.parse(genre))
         pass
 
     @property
     @loadable('load')
     def name(self):
         return self._name
+
+
+Genre.register(GenreReference)
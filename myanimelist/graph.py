@@ -0,0 +1,385 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""An index of the relations between anime and manga, for franchise-wide queries.
+
+Every loaded :attr:`myanimelist.media.Media.related` adds one hop of labelled edges ('Sequel', 'Prequel', 'Side story',
+...) to a :class:`.RelationGraph`. Once enough of a franchise is indexed, membership, watch order and relation paths are
+answered in memory; queries given a session only fetch the media whose relations are still missing.
+
+Media are identified by (type, id) keys, e.g. ('anime', 1).
+"""
+import collections
+import heapq
+import json
+import threading
+
+from .base import InvalidBaseError
+
+"""Relations that order a franchise's entries, mapped to whether the related media comes after the current one.
+"""
+ORDER_RELATIONS = {
+    'Sequel': True,
+    'Prequel': False,
+}
+
+
+def media_key(media):
+    """Builds the key of a media.
+
+    :type media: :class:`myanimelist.media.Media` or tuple
+    :param media: A media, or an existing (type, id) key.
+
+    :rtype: tuple
+    :return: The media's (type, id) key.
+
+    """
+    if isinstance(media, tuple):
+        return media
+    return media._resource_type, media.id
+
+
+class RelationGraph(object):
+    """An adjacency index of the relations between media.
+    """
+
+    def __init__(self):
+        """Creates a new instance of RelationGraph.
+
+        :rtype: :class:`.RelationGraph`
+        :return: The desired graph.
+
+        """
+        self._lock = threading.RLock()
+        # key -> {relation: [key, ...]}, as listed on the key's own page.
+        self._edges = {}
+        # key -> set of keys related in either direction.
+        self._neighbours = collections.defaultdict(set)
+        self._titles = {}
+
+    def __len__(self):
+        return len(self._neighbours)
+
+    def __contains__(self, media):
+        return media_key(media) in self._neighbours
+
+    def expanded(self, media):
+        """Checks whether a media's own relations have been indexed.
+
+        :type media: :class:`myanimelist.media.Media` or tuple
+        :param media: A media or its key.
+
+        :rtype: bool
+        :return: Whether the media's page has been indexed.
+
+        """
+        return media_key(media) in self._edges
+
+    def title(self, media):
+        """Looks up the title a media was indexed with.
+
+        :type media: :class:`myanimelist.media.Media` or tuple
+        :param media: A media or its key.
+
+        :rtype: str
+        :return: The media's title, or None if it isn't known.
+
+        """
+        return self._titles.get(media_key(media))
+
+    def relations(self, media):
+        """Looks up the relations listed on a media's own page.
+
+        :type media: :class:`myanimelist.media.Media` or tuple
+        :param media: A media or its key.
+
+        :rtype: dict
+        :return: Relation names as keys and lists of keys as values, or None if the media hasn't been indexed.
+
+        """
+        edges = self._edges.get(media_key(media))
+        return {relation: list(keys) for relation, keys in edges.items()} if edges is not None else None
+
+    def add(self, media):
+        """Indexes the relations of a loaded media.
+
+        :type media: :class:`myanimelist.media.Media`
+        :param media: A media whose page has been loaded. A media without a related attribute has no relations.
+
+        """
+        related = media.field('related') or {}
+        self.add_edges(media_key(media), {relation: [media_key(item) for item in items]
+                                          for relation, items in related.items()}, media.field('title'))
+        with self._lock:
+            for items in related.values():
+                for item in items:
+                    if item.field('title') is not None:
+                        self._titles.setdefault(media_key(item), item.field('title'))
+
+    def add_edges(self, key, relations, title=None):
+        """Indexes the relations listed on a media's page, replacing any previously indexed for it.
+
+        :type key: tuple
+        :param key: The media's (type, id) key.
+
+        :type relations: dict
+        :param relations: Relation names as keys and lists of related (type, id) keys as values.
+
+        :type title: str
+        :param title: The media's title.
+
+        """
+        key = tuple(key)
+        with self._lock:
+            self._neighbours[key]
+            for items in self._edges.get(key, {}).values():
+                for item in items:
+                    # keep links that the other media's own page still lists.
+                    if not any(key in other_items for other_items in self._edges.get(item, {}).values()):
+                        self._neighbours[key].discard(item)
+                        self._neighbours[item].discard(key)
+            self._edges[key] = {relation: [tuple(item) for item in items] for relation, items in relations.items()}
+            for items in self._edges[key].values():
+                for item in items:
+                    self._neighbours[key].add(item)
+                    self._neighbours[item].add(key)
+            if title is not None:
+                self._titles[key] = title
+
+    def listen(self, session):
+        """Indexes every media loaded through a session from now on.
+
+        :type session: :class:`myanimelist.session.Session`
+        :param session: The session to listen to.
+
+        :rtype: :class:`.RelationGraph`
+        :return: The current graph.
+
+        """
+        session.add_load_listener(self._on_load)
+        return self
+
+    def _on_load(self, resource, loader_name):
+        # only the main page lists relations, and only if its related section was loaded: a media loaded without it
+        # would be indexed as having no relations, and never expanded.
+        if loader_name != 'load' or resource._resource_type not in ('anime', 'manga'):
+            return
+        if 'related' not in getattr(resource, 'loaded_sections', ('related',)):
+            return
+        self.add(resource)
+
+    def _expand(self, key, session):
+        # fetch a media whose relations are missing; media that don't exist are indexed without relations.
+        media = getattr(session, key[0])(key[1])
+        try:
+            media.load()
+        except InvalidBaseError:
+            self.add_edges(key, {})
+            return
+        self.add(media)
+
+    def franchise(self, media, session=None, relations=None, max_fetches=None):
+        """Finds every media connected to a media through relations in either direction.
+
+        :type media: :class:`myanimelist.media.Media` or tuple
+        :param media: A media or its key.
+
+        :type session: :class:`myanimelist.session.Session`
+        :param session: If given, media whose relations haven't been indexed yet are loaded through it. Otherwise only
+            what is already indexed is walked.
+
+        :type relations: iterable
+        :param relations: Only follow these relations, e.g. ('Sequel', 'Prequel'). Defaults to every relation.
+
+        :type max_fetches: int
+        :param max_fetches: Maximum number of media to load. None loads as many as needed.
+
+        :rtype: set
+        :return: The keys of the franchise's media, including the given one.
+
+        """
+        start = media_key(media)
+        relations = set(relations) if relations is not None else None
+        seen = {start}
+        queue = collections.deque([start])
+        fetches = 0
+        while queue:
+            key = queue.popleft()
+            if session is not None and not self.expanded(key) and (max_fetches is None or fetches < max_fetches):
+                self._expand(key, session)
+                fetches += 1
+            for neighbour in self._neighbours_of(key, relations):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return seen
+
+    def _neighbours_of(self, key, relations=None):
+        with self._lock:
+            if relations is None:
+                return sorted(self._neighbours.get(key, ()))
+            neighbours = set()
+            for relation, items in self._edges.get(key, {}).items():
+                if relation in relations:
+                    neighbours.update(items)
+            # edges listed on the other media's page count in both directions.
+            for other in self._neighbours.get(key, ()):
+                for relation, items in self._edges.get(other, {}).items():
+                    if relation in relations and key in items:
+                        neighbours.add(other)
+            return sorted(neighbours)
+
+    def watch_order(self, media, session=None, max_fetches=None):
+        """Orders the entries of a franchise that are linked by sequels and prequels.
+
+        Only media of the same type as the given one are ordered. Entries caught in a cycle of relations are appended
+        by id.
+
+        :type media: :class:`myanimelist.media.Media` or tuple
+        :param media: A media or its key.
+
+        :type session: :class:`myanimelist.session.Session`
+        :param session: If given, media whose relations haven't been indexed yet are loaded through it.
+
+        :type max_fetches: int
+        :param max_fetches: Maximum number of media to load.
+
+        :rtype: list
+        :return: Keys, from the first entry to the last.
+
+        """
+        start = media_key(media)
+        members = set(key for key in self.franchise(start, session, ORDER_RELATIONS, max_fetches) if key[0] == start[0])
+        successors = {key: set() for key in members}
+        with self._lock:
+            for key in members:
+                for relation, items in self._edges.get(key, {}).items():
+                    if relation not in ORDER_RELATIONS:
+                        continue
+                    for item in items:
+                        if item not in members:
+                            continue
+                        if ORDER_RELATIONS[relation]:
+                            successors[key].add(item)
+                        else:
+                            successors[item].add(key)
+        predecessors = collections.Counter(item for items in successors.values() for item in items)
+        ready = [key for key in members if predecessors[key] == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            key = heapq.heappop(ready)
+            order.append(key)
+            for item in successors[key]:
+                predecessors[item] -= 1
+                if predecessors[item] == 0:
+                    heapq.heappush(ready, item)
+        ordered = set(order)
+        return order + sorted(key for key in members if key not in ordered)
+
+    def shortest_path(self, source, target, session=None, max_fetches=None):
+        """Finds the shortest chain of relations between two media.
+
+        :type source: :class:`myanimelist.media.Media` or tuple
+        :param source: The media to start from, or its key.
+
+        :type target: :class:`myanimelist.media.Media` or tuple
+        :param target: The media to reach, or its key.
+
+        :type session: :class:`myanimelist.session.Session`
+        :param session: If given, media whose relations haven't been indexed yet are loaded through it.
+
+        :type max_fetches: int
+        :param max_fetches: Maximum number of media to load.
+
+        :rtype: list
+        :return: (key, relation, key) steps from source to target, where each relation is read from the first key's
+            page, or from the second key's page as 'relation (reverse)'. None if the media aren't connected.
+
+        """
+        source, target = media_key(source), media_key(target)
+        parents = {source: None}
+        queue = collections.deque([source])
+        fetches = 0
+        while queue and target not in parents:
+            key = queue.popleft()
+            if session is not None and not self.expanded(key) and (max_fetches is None or fetches < max_fetches):
+                self._expand(key, session)
+                fetches += 1
+            for neighbour in self._neighbours_of(key):
+                if neighbour not in parents:
+                    parents[neighbour] = key
+                    queue.append(neighbour)
+        if target not in parents:
+            return None
+        path = []
+        key = target
+        while parents[key] is not None:
+            path.append((parents[key], self._relation(parents[key], key), key))
+            key = parents[key]
+        return list(reversed(path))
+
+    def _relation(self, source, target):
+        with self._lock:
+            for relation, items in self._edges.get(source, {}).items():
+                if target in items:
+                    return relation
+            for relation, items in self._edges.get(target, {}).items():
+                if source in items:
+                    return relation + ' (reverse)'
+        return None
+
+    def to_dict(self):
+        """Reduces the graph to plain lists and strings.
+
+        :rtype: dict
+        :return: A dict with 'edges' and 'titles' keys.
+
+        """
+        with self._lock:
+            return {
+                'edges': [[list(key), {relation: [list(item) for item in items] for relation, items in relations.items()}]
+                          for key, relations in self._edges.items()],
+                'titles': [[list(key), title] for key, title in self._titles.items()],
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds a graph from :meth:`.to_dict` output.
+
+        :type data: dict
+        :param data: A dict produced by :meth:`.to_dict`.
+
+        :rtype: :class:`.RelationGraph`
+        :return: The rebuilt graph.
+
+        """
+        graph = cls()
+        for key, relations in data['edges']:
+            graph.add_edges(key, relations)
+        for key, title in data['titles']:
+            graph._titles[tuple(key)] = title
+        return graph
+
+    def save(self, path):
+        """Writes the graph to a JSON file.
+
+        :type path: str
+        :param path: The file's path.
+
+        """
+        with open(path, 'w') as graph_file:
+            json.dump(self.to_dict(), graph_file, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        """Reads a graph written by :meth:`.save`.
+
+        :type path: str
+        :param path: The file's path.
+
+        :rtype: :class:`.RelationGraph`
+        :return: The graph.
+
+        """
+        with open(path) as graph_file:
+            return cls.from_dict(json.load(graph_file))
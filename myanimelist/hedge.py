@@ -0,0 +1,91 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Hedged requests, which trade a few duplicate requests for a shorter tail of slow responses.
+
+A session with a :class:`.HedgePolicy` times how long MAL takes to answer each page request with its headers. When a
+request has gone unanswered for longer than a given percentile of the recent answers, a duplicate is sent, and
+whichever of the two answers first is used; the other is closed. Duplicates are taken from the session's rate budget
+like any other request.
+"""
+import collections
+import threading
+
+
+class HedgePolicy(object):
+    """Decides when a slow request is worth duplicating, from the latencies of recent requests.
+    """
+
+    def __init__(self, percentile=0.95, window=200, min_samples=20, min_delay=0.0):
+        """Creates a new instance of HedgePolicy.
+
+        :type percentile: float
+        :param percentile: The share, between 0 and 1, of recent requests that a request must be slower than to be
+            duplicated.
+
+        :type window: int
+        :param window: Number of recent latencies the percentile is taken over.
+
+        :type min_samples: int
+        :param min_samples: Number of latencies to observe before duplicating any request.
+
+        :type min_delay: float
+        :param min_delay: Minimum number of seconds to wait before duplicating a request.
+
+        :rtype: :class:`.HedgePolicy`
+        :return: The desired policy.
+
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._latencies = collections.deque(maxlen=window)
+
+        """Numbers of duplicate requests sent, and of those that answered first.
+        """
+        self.hedges = 0
+        self.wins = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record(self, latency):
+        """Observes how long a request took to be answered.
+
+        :type latency: float
+        :param latency: Number of seconds until the response's headers arrived.
+
+        """
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self):
+        """Computes how long to wait for a request to be answered before duplicating it.
+
+        :rtype: float
+        :return: Number of seconds, or None if too few latencies have been observed to tell.
+
+        """
+        with self._lock:
+            if len(self._latencies) < max(self.min_samples, 1):
+                return None
+            latencies = sorted(self._latencies)
+        return max(latencies[int(self.percentile * (len(latencies) - 1))], self.min_delay)
+
+    def count(self, won):
+        """Counts a duplicate request.
+
+        :type won: bool
+        :param won: Whether the duplicate answered before the original request.
+
+        """
+        with self._lock:
+            self.hedges += 1
+            if won:
+                self.wins += 1
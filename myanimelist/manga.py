@@ -3,6 +3,7 @@
 from . import utilities
 from .base import Base, Error, loadable
 from . import media
+from .reference import MangaReference
 
 
 class MalformedMangaPageError(media.MalformedMediaPageError):
@@ -27,6 +28,9 @@ class Manga(media.Media):
         'Not yet published'
     ]
     _consuming_verb = "read"
+    _sidebar_handlers = dict(media.Media._sidebar_handlers, Volumes='_parse_volumes', Chapters='_parse_chapters',
+                             Published='_parse_published', Authors='_parse_authors',
+                             Serialization='_parse_serialization')
 
     def __init__(self, session, manga_id):
         """Creates a new instance of Manga.
@@ -68,110 +72,82 @@ class Manga(media.Media):
             raise MalformedMangaPageError(self.id, manga_page, message="Could not find title div")
 
         # otherwise, begin parsing.
-        manga_info = super(Manga, self).parse_sidebar(manga_page)
-        info_panel_first = None
-
-        try:
-            container = utilities.css_select("#content", manga_page)
-            if container is None:
-                raise MalformedMangaPageError(self.id, manga_page, message="Could not find the info table")
-
-            info_panel_first = container[0].find(".//table/tr/td")
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Volumes:')]]")
-            if len(temp) == 0:
-                raise Exception("Couldn't find volumes tag.")
-            volumes_tag = temp[0].getparent().xpath(".//text()")[-1]
-            manga_info['volumes'] = int(volumes_tag.strip()) if volumes_tag.strip() != 'Unknown' else None
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Chapters:')]]")
-            if len(temp) == 0:
-                raise Exception("Couldn't find chapters tag.")
-            chapters_tag = temp[0].getparent().xpath(".//text()")[-1]
-            manga_info['chapters'] = int(chapters_tag.strip()) if chapters_tag.strip() != 'Unknown' else None
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Published:')]]")
-            if len(temp) == 0:
-                raise Exception("Couldn't find published tag.")
-            published_tag = temp[0].getparent().xpath(".//text()")[-1]
-            published_parts = published_tag.strip().split(' to ')
-            if len(published_parts) == 1:
-                # this published once.
-                try:
-                    published_date = utilities.parse_profile_date(published_parts[0])
-                except ValueError:
-                    raise MalformedMangaPageError(self.id, published_parts[0],
-                                                  message="Could not parse single publish date")
-                manga_info['published'] = (published_date,)
+        return super(Manga, self).parse_sidebar(manga_page)
+
+    def _parse_volumes(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find volumes tag.")
+        volumes_tag = label_tag.getparent().xpath(".//text()")[-1]
+        media_info['volumes'] = int(volumes_tag.strip()) if volumes_tag.strip() != 'Unknown' else None
+
+    def _parse_chapters(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find chapters tag.")
+        chapters_tag = label_tag.getparent().xpath(".//text()")[-1]
+        media_info['chapters'] = int(chapters_tag.strip()) if chapters_tag.strip() != 'Unknown' else None
+
+    def _parse_published(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find published tag.")
+        published_tag = label_tag.getparent().xpath(".//text()")[-1]
+        published_parts = published_tag.strip().split(' to ')
+        if len(published_parts) == 1:
+            # this published once.
+            try:
+                published_date = utilities.parse_profile_date(published_parts[0])
+            except ValueError:
+                raise MalformedMangaPageError(self.id, published_parts[0],
+                                              message="Could not parse single publish date")
+            media_info['published'] = (published_date,)
+        else:
+            # two publishing dates.
+            try:
+                publish_start = utilities.parse_profile_date(published_parts[0])
+            except ValueError:
+                raise MalformedMangaPageError(self.id, published_parts[0],
+                                              message="Could not parse first of two publish dates")
+            if published_parts == '?':
+                # this is still publishing.
+                publish_end = None
             else:
-                # two publishing dates.
                 try:
-                    publish_start = utilities.parse_profile_date(published_parts[0])
+                    publish_end = utilities.parse_profile_date(published_parts[1])
                 except ValueError:
-                    raise MalformedMangaPageError(self.id, published_parts[0],
-                                                  message="Could not parse first of two publish dates")
-                if published_parts == '?':
-                    # this is still publishing.
-                    publish_end = None
-                else:
-                    try:
-                        publish_end = utilities.parse_profile_date(published_parts[1])
-                    except ValueError:
-                        raise MalformedMangaPageError(self.id, published_parts[1],
-                                                      message="Could not parse second of two publish dates")
-                manga_info['published'] = (publish_start, publish_end)
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Authors:')]]")
-            if len(temp) == 0:
-                raise Exception("Couldn't find authors tag.")
-            authors_tags = temp[0].getparent().xpath(".//a")
-            manga_info['authors'] = {}
-            for author_link in authors_tags:
-                link_parts = author_link.get('href').split('/')
-                # of the form /people/1867/Naoki_Urasawa
-                person = self.session.person(int(link_parts[2])).set({'name': author_link.text})
-                role = author_link.xpath("./following-sibling::text()")[0].replace(' (', '').replace(')', '')
-                manga_info['authors'][person] = role
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            temp = info_panel_first.xpath(".//div/span[text()[contains(.,'Serialization:')]]")
-            if len(temp) == 0:
-                raise Exception("Couldn't find authors tag.")
-            serialization_tags = temp[0].getparent().xpath(".//a")
-
-            manga_info['serialization'] = None
-            if len(serialization_tags) != 0:
-                publication_link = serialization_tags[0]
-                link_parts = publication_link.get('href').split('mid=')
-                if len(link_parts) != 1:
-                    # backwards compatibility
-                    # of the form /manga.php?mid=1
-                    manga_info['serialization'] = self.session.publication(int(link_parts[1])).set(
-                        {'name': publication_link.text})
-                else:
-                    # of the form /manga/magazine/83/<the_name>
-                    link_parts = publication_link.get('href').split('/')
-                    manga_info['serialization'] = self.session.publication(int(link_parts[-2])).set(
-                        {'name': publication_link.text})
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        return manga_info
+                    raise MalformedMangaPageError(self.id, published_parts[1],
+                                                  message="Could not parse second of two publish dates")
+            media_info['published'] = (publish_start, publish_end)
+
+    def _parse_authors(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find authors tag.")
+        authors_tags = label_tag.getparent().xpath(".//a")
+        media_info['authors'] = {}
+        for author_link in authors_tags:
+            link_parts = author_link.get('href').split('/')
+            # of the form /people/1867/Naoki_Urasawa
+            person = self.session.person(int(link_parts[2])).set({'name': author_link.text})
+            role = author_link.xpath("./following-sibling::text()")[0].replace(' (', '').replace(')', '')
+            media_info['authors'][person] = role
+
+    def _parse_serialization(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find authors tag.")
+        serialization_tags = label_tag.getparent().xpath(".//a")
+
+        media_info['serialization'] = None
+        if len(serialization_tags) != 0:
+            publication_link = serialization_tags[0]
+            link_parts = publication_link.get('href').split('mid=')
+            if len(link_parts) != 1:
+                # backwards compatibility
+                # of the form /manga.php?mid=1
+                media_info['serialization'] = self.session.publication(int(link_parts[1])).set(
+                    {'name': publication_link.text})
+            else:
+                # of the form /manga/magazine/83/<the_name>
+                link_parts = publication_link.get('href').split('/')
+                media_info['serialization'] = self.session.publication(int(link_parts[-2])).set(
+                    {'name': publication_link.text})
 
     @property
     @loadable('load')
@@ -215,3 +191,6 @@ class Manga(media.Media):
         """The :class:`myanimelist.publication.Publication` involved in the first serialization of this manga.
         """
         return self._serialization
+
+
+Manga.register(MangaReference)
@@ -1,13 +1,17 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 import abc
+import array
+import concurrent.futures
 import decimal
+import itertools
 import re
 
 from . import utilities
-from .base import Base, MalformedPageError, InvalidBaseError, loadable
-from lxml.etree import XPath
-from urllib3 import PoolManager as HttpSocketPool
+from .base import Base, MalformedPageError, InvalidBaseError, loadable, loader
+
+# a related link's media type and id, e.g. /anime/1/Cowboy_Bebop, optionally prefixed by the old http host.
+_RELATED_HREF = re.compile(r'(?:http://myanimelist\.net)?/((?:anime|manga)[^/]*)(?:/([^/]*))?')
 
 
 class MalformedMediaPageError(MalformedPageError):
@@ -29,6 +33,45 @@ class Media(Base, metaclass=abc.ABCMeta):
     To subclass, create a class that inherits from Media, implementing status_terms and consuming_verb at the bare minimum.
     """
 
+    """Methods that parse the info panel's labelled rows, keyed by label. Each is called once per parse with the row's
+    dark_text span, or None if the page has no such row, and the dict of attributes to fill in.
+    Subclasses extend this with their own labels.
+    """
+    _sidebar_handlers = {
+        'Type': '_parse_type',
+        'Status': '_parse_status',
+        'Genres': '_parse_genres',
+        'Score': '_parse_score',
+        'Ranked': '_parse_rank',
+        'Popularity': '_parse_popularity',
+        'Members': '_parse_members',
+        'Favorites': '_parse_favorites',
+    }
+
+    """Sections of the media page below its sidebar, in page order: the name load() may be limited to, the method parsing
+    the section, and a pattern found on the page just after the section, which ends a download limited to it.
+    """
+    _page_sections = [
+        ('synopsis', 'parse_synopsis', re.compile(r'Background\s*</h2>')),
+        ('related', 'parse_related', re.compile(r'Characters(?: &amp; Voice Actors)?\s*</h2>')),
+    ]
+
+    """A pattern found on the media page just after its sidebar.
+    """
+    _sidebar_end = re.compile(r'Synopsis\s*</h2>')
+
+    """Loaders of the media's pages, keyed by the part name load_all() takes. Subclasses extend this with their own pages.
+    """
+    _parts = {
+        'main': 'load',
+        'stats': 'load_stats',
+        'characters': 'load_characters',
+    }
+
+    """Loaders of pages that repeat the main page's sidebar, which take a sidebar argument.
+    """
+    _sidebar_loaders = ('load_stats', 'load_characters')
+
     @abc.abstractproperty
     def _status_terms(self):
         """
@@ -62,7 +105,7 @@ class Media(Base, metaclass=abc.ABCMeta):
 
         """
         media_type = cls.__name__.lower()
-        p = session.session.get('https://myanimelist.net/' + media_type + '.php?o=9&c[]=a&c[]=d&cv=2&w=1').text
+        p = session.fetch('https://myanimelist.net/' + media_type + '.php?o=9&c[]=a&c[]=d&cv=2&w=1')
         soup = utilities.get_clean_dom(p)
         latest_entry = utilities.css_select_first("div.hoverinfo", soup)
         if latest_entry is None:
@@ -87,6 +130,11 @@ class Media(Base, metaclass=abc.ABCMeta):
         self.id = id
         if not isinstance(self.id, int) or int(self.id) < 1:
             raise InvalidMediaError(self.id)
+
+        """Names of the sections below the sidebar that :meth:`.load` has parsed, e.g. {'synopsis', 'related'}.
+        """
+        self.loaded_sections = set()
+
         self._title = None
         self._picture = None
         self._alternative_titles = None
@@ -104,7 +152,7 @@ class Media(Base, metaclass=abc.ABCMeta):
         self._characters = None
         self._score_stats = None
         self._status_stats = None
-        self._http = HttpSocketPool(retries=3)
+        self._score_histogram = None
 
     def parse_sidebar(self, media_page):
         """Parses the DOM and returns media attributes in the sidebar.
@@ -185,163 +233,29 @@ class Media(Base, metaclass=abc.ABCMeta):
 
             alt_titles_header = alt_titles_results[0]
             if alt_titles_header is not None:
-                next_tag = utilities.css_select("h2 + div.spaceit_pad", alt_titles_header)[0]
-                while True:
-                    if next_tag is None or len(utilities.css_select("span.dark_text", next_tag)) == 0:
+                first_tag = utilities.css_select("h2 + div.spaceit_pad", alt_titles_header)[0]
+                # a single forward pass over the language nodes that follow the header.
+                next_tags = itertools.chain([first_tag], (div for div in first_tag.itersiblings('div')
+                                                          if div.get('class') == 'spaceit_pad'))
+                for next_tag in next_tags:
+                    if len(utilities.css_select("span.dark_text", next_tag)) == 0:
                         # not a language node, break.
                         break
-                    # get language and remove the node.
                     language = next_tag.find(".//span").text[:-1]
                     names = next_tag.xpath(".//text()")[-1].strip().split(', ')
                     media_info['alternative_titles'][language] = names
-                    temp = next_tag.xpath("./following-sibling::div[@class='spaceit_pad']")
-                    if len(temp) == 0:
-                        break
-                    else:
-                        next_tag = temp[0]
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            type_tag_results = info_panel_first.xpath(".//span[text()[contains(.,'Type:')]]")
-            if len(type_tag_results) == 0:
-                raise Exception("Couldnt find type tag.")
-            type_tag = "".join(type_tag_results[0].getparent().xpath(".//text()")).strip().replace('\n', '') \
-                .split(": ")[-1].rstrip()
-            media_info['type'] = type_tag.strip()
         except:
             if not self.session.suppress_parse_exceptions:
                 raise
 
-        try:
-            status_tag_results = info_panel_first.xpath(".//div/span[text()[contains(.,'Status:')]]")
-            if len(status_tag_results) == 0:
-                raise Exception("Couldn't find status tag.")
-            status_tag = status_tag_results[0].getparent().xpath(".//text()")[-1]
-            media_info['status'] = status_tag.strip()
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            genres_tag_results = info_panel_first.xpath(".//div/span[text()[contains(.,'Genres:')]]")
-            if len(genres_tag_results) == 0:
-                raise Exception("Couldn't find genres tag.")
-            genres_tag = genres_tag_results[0].getparent().findall("a")
-            media_info['genres'] = []
-            for genre_link in genres_tag:
-                link_parts = genre_link.get('href').split('[]=')
-                if len(link_parts) == 0:
-                    link_parts = genre_link.get('href').split('/')
-                    genre = self.session.genre(int(link_parts[-2])).set({'name': genre_link.text})
-                else:
-                    link_parts = genre_link.get('href').split("/")
-                    if "myanimelist.net" in genre_link.get('href'):
-                        genre = self.session.genre(int(link_parts[-2])).set({'name': genre_link.text})
-                    else:
-                        genre = self.session.genre(int(link_parts[-2])).set({'name': genre_link.text})
-
-                media_info['genres'].append(genre)
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            # grab statistics for this media.
-            score_tag_results = info_panel_first.xpath(
-                ".//div[contains(@class,'js-statistics-info')]//span[text()[contains(.,'Score:')]]")
-            if len(score_tag_results) == 0:
-                raise Exception("Couldn't find score tag.")
-
-            # there are two types of layout for scores: the ones with span elements with open graph / html5 attributes
-            # and the ones without these special attributes
-            if utilities.is_open_graph_style_stat_element(score_tag_results[0]):
-                score_text = utilities.css_select('span.dark_text + span', score_tag_results[0])[0].text
-                score_tag = utilities.css_select('span.dark_text + span', score_tag_results[0])[0]
-
-                rating_count_els = score_tag.getparent().xpath(".//span[3]|.//small/span[1]")
-                if len(rating_count_els) > 0:
-                    num_users = int(rating_count_els[0].text.replace(',', ''))
-                else:
-                    small_tags = score_tag.getparent().xpath("./small[1]")
-                    if len(small_tags) > 0:
-                        small_tag = small_tags[0]
-                        m = re.match("\(scored by ([0-9]+)", small_tag.text)
-                        num_users = int(m.group(1))
-                    else:
-                        num_users = 0
-            else:
-                score_text = score_tag_results[0].tail.strip()
-                small_tags = score_tag_results[0].xpath("./following-sibling::small")
-                if len(small_tags) > 0:
-                    small_tag = small_tags[0]
-                    m = re.match("\(scored by ([0-9]+)", small_tag.text)
-                    num_users = int(m.group(1))
-                else:
-                    num_users = 0
-
-            if score_text == "N/A":
-                score = None
-            else:
-                score = float(score_text)
-
-            stripped_score = score
-            if stripped_score is not None:
-                media_info['score'] = (decimal.Decimal(stripped_score), num_users)
-            else:
-                media_info['score'] = (0, 0)
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            rank_tag_results = info_panel_first.xpath(".//div/span[text()[contains(.,'Ranked:')]]")
-            if len(rank_tag_results) == 0:
-                raise Exception("Couldn't find rank tag.")
-            # rank_tag is a lxml.etree._ElementUnicodeResult here:
-
-            contains = rank_tag_results[0].getparent().xpath(".//text()[contains(.,'#')]")
-            if contains:
-                rank_tag = contains[0]
-                media_info['rank'] = int(rank_tag.strip()[1:].replace(',', ''))
-            else:
-                media_info['rank'] = "N/A"
-
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            popularity_tag_results = info_panel_first.xpath(".//div/span[text()[contains(.,'Popularity:')]]")
-            if len(popularity_tag_results) == 0:
-                raise Exception("Couldn't find popularity tag.")
-            # popularity_tag is a lxml.etree._ElementUnicodeResult here:
-            popularity_tag = popularity_tag_results[0].getparent().xpath(".//text()[contains(.,'#')]")[0]
-            media_info['popularity'] = int(popularity_tag.strip()[1:].replace(',', ''))
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            members_tag_results = info_panel_first.xpath(".//div/span[text()[contains(.,'Members:')]]")
-            if len(members_tag_results) == 0:
-                raise Exception("Couldn't find members tag.")
-            members_tag = members_tag_results[0].getparent().xpath(".//text()")[-1]
-            media_info['members'] = int(members_tag.strip().replace(',', ''))
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
-
-        try:
-            favorites_tag_results = info_panel_first.xpath(".//div/span[text()[contains(.,'Favorites:')]]")
-            if len(favorites_tag_results) == 0:
-                raise Exception("Couldn't find favorites tag.")
-            favorites_tag = favorites_tag_results[0].getparent().xpath(".//text()")[-1]
-            media_info['favorites'] = int(favorites_tag.strip().replace(',', ''))
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+        # walk the info panel once, dispatching each labelled row to its handler.
+        rows = self._sidebar_rows(info_panel_first)
+        for label, handler in self._sidebar_handlers.items():
+            try:
+                getattr(self, handler)(rows.get(label), media_info)
+            except:
+                if not self.session.suppress_parse_exceptions:
+                    raise
 
         # not available anymore
         # try:
@@ -360,17 +274,160 @@ class Media(Base, metaclass=abc.ABCMeta):
 
         return media_info
 
-    def parse(self, media_page):
+    @staticmethod
+    def _sidebar_rows(info_panel):
+        """Collects the labelled rows of the info panel in a single walk.
+
+        :type info_panel: :class:`lxml.html.HtmlElement`
+        :param info_panel: The info panel's DOM.
+
+        :rtype: dict
+        :return: The first dark_text span of each label, keyed by the label without its colon, e.g. 'Status'.
+
+        """
+        rows = {}
+        if info_panel is None:
+            return rows
+        for span in info_panel.iter('span'):
+            if span.get('class') == 'dark_text' and span.text:
+                rows.setdefault(span.text.strip().rstrip(':'), span)
+        return rows
+
+    def _parse_type(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldnt find type tag.")
+        type_tag = "".join(label_tag.getparent().xpath(".//text()")).strip().replace('\n', '') \
+            .split(": ")[-1].rstrip()
+        media_info['type'] = type_tag.strip()
+
+    def _parse_status(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find status tag.")
+        status_tag = label_tag.getparent().xpath(".//text()")[-1]
+        media_info['status'] = status_tag.strip()
+
+    def _parse_genres(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find genres tag.")
+        genres_tag = label_tag.getparent().findall("a")
+        media_info['genres'] = []
+        for genre_link in genres_tag:
+            link_parts = genre_link.get('href').split('[]=')
+            if len(link_parts) == 0:
+                link_parts = genre_link.get('href').split('/')
+                genre = self.session.genre(int(link_parts[-2])).set({'name': genre_link.text})
+            else:
+                link_parts = genre_link.get('href').split("/")
+                if "myanimelist.net" in genre_link.get('href'):
+                    genre = self.session.genre(int(link_parts[-2])).set({'name': genre_link.text})
+                else:
+                    genre = self.session.genre(int(link_parts[-2])).set({'name': genre_link.text})
+
+            media_info['genres'].append(genre)
+
+    def _parse_score(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find score tag.")
+
+        # there are two types of layout for scores: the ones with span elements with open graph / html5 attributes
+        # and the ones without these special attributes
+        if utilities.is_open_graph_style_stat_element(label_tag):
+            score_text = utilities.css_select('span.dark_text + span', label_tag)[0].text
+            score_tag = utilities.css_select('span.dark_text + span', label_tag)[0]
+
+            rating_count_els = score_tag.getparent().xpath(".//span[3]|.//small/span[1]")
+            if len(rating_count_els) > 0:
+                num_users = int(rating_count_els[0].text.replace(',', ''))
+            else:
+                small_tags = score_tag.getparent().xpath("./small[1]")
+                if len(small_tags) > 0:
+                    small_tag = small_tags[0]
+                    m = re.match("\(scored by ([0-9]+)", small_tag.text)
+                    num_users = int(m.group(1))
+                else:
+                    num_users = 0
+        else:
+            score_text = label_tag.tail.strip()
+            small_tags = label_tag.xpath("./following-sibling::small")
+            if len(small_tags) > 0:
+                small_tag = small_tags[0]
+                m = re.match("\(scored by ([0-9]+)", small_tag.text)
+                num_users = int(m.group(1))
+            else:
+                num_users = 0
+
+        if score_text == "N/A":
+            score = None
+        else:
+            score = float(score_text)
+
+        stripped_score = score
+        if stripped_score is not None:
+            media_info['score'] = (decimal.Decimal(stripped_score), num_users)
+        else:
+            media_info['score'] = (0, 0)
+
+    def _parse_rank(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find rank tag.")
+        # rank_tag is a lxml.etree._ElementUnicodeResult here:
+
+        contains = label_tag.getparent().xpath(".//text()[contains(.,'#')]")
+        if contains:
+            rank_tag = contains[0]
+            media_info['rank'] = int(rank_tag.strip()[1:].replace(',', ''))
+        else:
+            media_info['rank'] = "N/A"
+
+    def _parse_popularity(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find popularity tag.")
+        # popularity_tag is a lxml.etree._ElementUnicodeResult here:
+        popularity_tag = label_tag.getparent().xpath(".//text()[contains(.,'#')]")[0]
+        media_info['popularity'] = int(popularity_tag.strip()[1:].replace(',', ''))
+
+    def _parse_members(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find members tag.")
+        members_tag = label_tag.getparent().xpath(".//text()")[-1]
+        media_info['members'] = int(members_tag.strip().replace(',', ''))
+
+    def _parse_favorites(self, label_tag, media_info):
+        if label_tag is None:
+            raise Exception("Couldn't find favorites tag.")
+        favorites_tag = label_tag.getparent().xpath(".//text()")[-1]
+        media_info['favorites'] = int(favorites_tag.strip().replace(',', ''))
+
+    def parse(self, media_page, sections=None):
         """Parses the DOM and returns media attributes in the main-content area.
 
         :type media_page: :class:`lxml.html.HtmlElement`
         :param media_page: MAL media page's DOM
 
+        :type sections: tuple
+        :param sections: Names of the sections below the sidebar to parse, e.g. ('synopsis',). Defaults to every section.
+
         :rtype: dict
         :return: media attributes.
 
         """
         media_info = self.parse_sidebar(media_page)
+        for name, method_name, _ in self._page_sections:
+            if sections is None or name in sections:
+                media_info.update(getattr(self, method_name)(media_page))
+        return media_info
+
+    def parse_synopsis(self, media_page):
+        """Parses the DOM and returns the media's synopsis.
+
+        :type media_page: :class:`lxml.html.HtmlElement`
+        :param media_page: MAL media page's DOM
+
+        :rtype: dict
+        :return: media attributes.
+
+        """
+        media_info = {}
 
         try:
             temp = media_page.xpath(".//h2[text()[contains(.,'Synopsis')]]")
@@ -387,6 +444,20 @@ class Media(Base, metaclass=abc.ABCMeta):
             if not self.session.suppress_parse_exceptions:
                 raise
 
+        return media_info
+
+    def parse_related(self, media_page):
+        """Parses the DOM and returns the media related to this one.
+
+        :type media_page: :class:`lxml.html.HtmlElement`
+        :param media_page: MAL media page's DOM
+
+        :rtype: dict
+        :return: media attributes.
+
+        """
+        media_info = {}
+
         try:
             related_tile_results = media_page.xpath(".//h2[text()[contains(.,'Related %s')]]" % self.__class__.__name__)
             if len(related_tile_results) == 0:
@@ -409,17 +480,19 @@ class Media(Base, metaclass=abc.ABCMeta):
                     relation_type = relation_type_el.text.strip().replace(":", "")
                     relations_el = cols[1].findall("a")
                     for link in relations_el:
-                        href = link.get("href").replace("http://myanimelist.net", "")
-                        if not re.match(r'/(anime|manga)', href):
+                        href_match = _RELATED_HREF.match(link.get("href"))
+                        if href_match is None:
                             break
                         title = link.text
-                        href_parts = href.split("/")
+                        (media_type, obj_id) = href_match.groups()
+                        if obj_id is None:
+                            raise MalformedMediaPageError(self.id, related_table,
+                                                          message="Could not find the id in a related link.")
                         # sometimes links on MAL are broken, of the form /anime//
-                        if href_parts[2] == '':
+                        if obj_id == '':
                             continue
                         # of the form: /(anime|manga)/1/Cowboy_Bebop
-                        obj_id = int(href_parts[2])
-                        new_obj = getattr(self.session, href_parts[1])(obj_id).set({'title': title})
+                        new_obj = getattr(self.session, media_type)(int(obj_id)).set({'title': title})
                         if relation_type not in related:
                             related[relation_type] = [new_obj]
                         else:
@@ -434,7 +507,7 @@ class Media(Base, metaclass=abc.ABCMeta):
         return media_info
 
     def parse_stats(self, media_page):
-        """Parses the DOM and returns media statistics attributes.
+        """Parses the DOM and returns media statistics attributes, along with the sidebar's attributes.
 
         :type media_page: :class:`lxml.html.HtmlElement`
         :param media_page: MAL media stats page's DOM
@@ -443,108 +516,85 @@ class Media(Base, metaclass=abc.ABCMeta):
         :return: media stats attributes.
 
         """
-
-        # cache common xpath strings:
-        xget_text = XPath(".//text()")
-
-        def _get_stat_row(property_name):
-            results = media_page.xpath(".//span[@class='dark_text' and text()[contains(.,'%s')]]" % property_name)
-            if len(results) == 0:
-                return None
-
-            return results[0]
-
-        def _get_clean_property_val(el):
-            return int(xget_text(el.getparent())[1].strip().replace(',', ''))
-
         media_info = self.parse_sidebar(media_page)
-        verb_progressive = self.consuming_verb + 'ing'
-        status_stats = {
-            verb_progressive: 0,
-            'completed': 0,
-            'on_hold': 0,
-            'dropped': 0,
-            'plan_to_' + self.consuming_verb: 0
-        }
+        media_info.update(self.parse_stats_section(media_page))
+        return media_info
 
-        try:
-            consuming_elt = _get_stat_row(verb_progressive.capitalize())
-            if consuming_elt:
-                status_stats[verb_progressive] = _get_clean_property_val(consuming_elt)
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+    def parse_stats_section(self, media_page):
+        """Parses the statistics section of a stats page in a single walk, collecting the status counts and the score
+        distribution together. The sidebar is not parsed.
 
-        try:
-            completed_elt = _get_stat_row("Completed:")
-            if completed_elt is not None:
-                status_stats['completed'] = _get_clean_property_val(completed_elt)
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+        :type media_page: :class:`lxml.html.HtmlElement`
+        :param media_page: MAL media stats page's DOM
 
-        try:
-            # On-Hold:
-            on_hold_elt = _get_stat_row("On-Hold:")
-            if on_hold_elt is not None:
-                status_stats['on_hold'] = _get_clean_property_val(on_hold_elt)
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+        :rtype: dict
+        :return: media stats attributes: status_stats, score_stats and score_histogram.
 
-        try:
-            dropped_elt = _get_stat_row("Dropped:")
-            if dropped_elt is not None:
-                status_stats['dropped'] = _get_clean_property_val(dropped_elt)
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+        :raises: :class:`.InvalidMediaError`
 
-        try:
-            # "Plan to " + self.consuming_verb.capitalize() + ":"
-            planning_elt = _get_stat_row("Plan to %s:" % self.consuming_verb.capitalize())
-            if planning_elt:
-                status_stats['plan_to_' + self.consuming_verb] = _get_clean_property_val(planning_elt)
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+        """
+        if not self._validate_page(media_page):
+            raise InvalidMediaError(self.id)
 
-        media_info['status_stats'] = status_stats
-
-        score_stats = {
-            1: 0,
-            2: 0,
-            3: 0,
-            4: 0,
-            5: 0,
-            6: 0,
-            7: 0,
-            8: 0,
-            9: 0,
-            10: 0
+        verb = self._consuming_verb
+        status_labels = {
+            verb.capitalize() + 'ing': verb + 'ing',
+            'Completed': 'completed',
+            'On-Hold': 'on_hold',
+            'Dropped': 'dropped',
+            'Plan to ' + verb.capitalize(): 'plan_to_' + verb,
+        }
+        status_stats = dict.fromkeys(status_labels.values(), 0)
+        # votes for scores 1 to 10, in order.
+        score_histogram = array.array('q', [0] * 10)
+
+        content = utilities.css_select_first("#content", media_page)
+        score_table = None
+        in_score_stats = False
+        for element in (content if content is not None else media_page).iter('span', 'h2', 'tr'):
+            try:
+                if element.tag == 'span':
+                    label = (element.text or '').strip().rstrip(':')
+                    if element.get('class') == 'dark_text' and label in status_labels:
+                        status_stats[status_labels.pop(label)] = int(element.tail.strip().replace(',', ''))
+                elif element.tag == 'h2':
+                    # the score table is the first one following its header.
+                    in_score_stats = 'Score Stats' in (element.text or '')
+                elif in_score_stats:
+                    if score_table is None:
+                        score_table = element.getparent()
+                    elif element.getparent() is not score_table:
+                        in_score_stats = False
+                        continue
+                    score_value = int(element.find('td').text)
+                    score_histogram[score_value - 1] = int(
+                        element.find('.//span/small').text.replace('(', '').replace(' votes)', ''))
+            except:
+                if not self.session.suppress_parse_exceptions:
+                    raise
+
+        return {
+            'status_stats': status_stats,
+            'score_stats': {score: votes for score, votes in enumerate(score_histogram, 1)},
+            'score_histogram': score_histogram,
         }
-        try:
-            temp = media_page.xpath(".//h2[text()[contains(.,'Score Stats')]]/following-sibling::table[1]")
-            if len(temp) != 0:
-                score_stats_table = temp[0]
-                if score_stats_table is not None:
-                    score_stats = {}
-                    score_rows = score_stats_table.findall('tr')
-                    for i in range(len(score_rows)):
-                        score_value = int(score_rows[i].find('td').text)
-                        score_stats[score_value] = int(
-                            score_rows[i].find('.//span/small').text.replace('(', '').replace(' votes)', ''))
 
-        except:
-            if not self.session.suppress_parse_exceptions:
-                raise
+    def parse_characters(self, character_page):
+        """Parses the DOM and returns media character attributes, along with the sidebar's attributes.
+
+        :type character_page: :class:`lxml.html.HtmlElement`
+        :param character_page: MAL character page's DOM
 
-        media_info['score_stats'] = score_stats
+        :rtype: dict
+        :return: character attributes.
 
+        """
+        media_info = self.parse_sidebar(character_page)
+        media_info.update(self.parse_characters_section(character_page))
         return media_info
 
-    def parse_characters(self, character_page):
-        """Parses the DOM and returns media character attributes in the sidebar.
+    def parse_characters_section(self, character_page):
+        """Parses the character tables of a characters page. The sidebar is not parsed.
 
         :type character_page: :class:`lxml.html.HtmlElement`
         :param character_page: MAL character page's DOM
@@ -552,8 +602,12 @@ class Media(Base, metaclass=abc.ABCMeta):
         :rtype: dict
         :return: character attributes.
 
+        :raises: :class:`.InvalidMediaError`
+
         """
-        media_info = self.parse_sidebar(character_page)
+        if not self._validate_page(character_page):
+            raise InvalidMediaError(self.id)
+        media_info = {}
 
         try:
             temp = character_page.xpath(".//h2[text()[contains(.,'Characters')]]/following-sibling::table[1]")
@@ -588,41 +642,136 @@ class Media(Base, metaclass=abc.ABCMeta):
 
         return media_info
 
-    def load(self):
+    def _section_markers(self, sections):
+        names = [name for name, _, _ in self._page_sections]
+        for name in sections:
+            if name not in names:
+                raise ValueError("Unknown media page section: " + str(name))
+        return [self._sidebar_end] + [marker for name, _, marker in self._page_sections if name in sections]
+
+    @loader
+    def load(self, sections=None):
         """Fetches the MAL media page and sets the current media's attributes.
 
+        :type sections: tuple
+        :param sections: Names of the sections below the sidebar to load, e.g. () for the sidebar alone, or ('synopsis',).
+            The sidebar is always loaded, and the download stops as soon as the requested sections have arrived.
+            Defaults to every section.
+
         :rtype: :class:`.Media`
         :return: current media object.
 
+        :raises: ValueError if a section is unknown.
+
         """
-        media_page = self.session.session.get(
-            'https://myanimelist.net/' + self.__class__.__name__.lower() + '/' + str(self.id)).text
-        self.set(self.parse(utilities.get_clean_dom(media_page)))
+        url = 'https://myanimelist.net/' + self.__class__.__name__.lower() + '/' + str(self.id)
+        if sections is None:
+            media_page = self.session.fetch_dom(url, content_only=True)
+        else:
+            media_page = self.session.fetch_dom(url, until=self._section_markers(sections))
+        self.set(self.parse(media_page, sections=sections))
+        self.loaded_sections.update(name for name, _, _ in self._page_sections if sections is None or name in sections)
         return self
 
-    def load_stats(self):
+    def _needs_sidebar(self, sidebar):
+        # self.title only loads the media page if the title wasn't already set, e.g. from a list or a related entry, so
+        # by default the sidebar is parsed from the other pages unless it has been loaded.
+        return self._members is None if sidebar is None else sidebar
+
+    @loader
+    def load_stats(self, sidebar=None):
         """Fetches the MAL media statistics page and sets the current media's statistics attributes.
 
+        :type sidebar: bool
+        :param sidebar: Whether to also set the sidebar's attributes from the page. Defaults to doing so only if they
+            haven't been loaded.
+
         :rtype: :class:`.Media`
         :return: current media object.
 
         """
-        stats_page = self.session.session.get('https://myanimelist.net/' + self.__class__.__name__.lower() + '/' + str(
-            self.id) + '/' + utilities.urlencode(self.title) + '/stats').text
-        self.set(self.parse_stats(utilities.get_clean_dom(stats_page)))
+        stats_page = self.session.fetch_dom('https://myanimelist.net/' + self.__class__.__name__.lower() + '/' + str(
+            self.id) + '/' + utilities.urlencode(self.title) + '/stats', content_only=True)
+        if self._needs_sidebar(sidebar):
+            self.set(self.parse_stats(stats_page))
+        else:
+            self.set(self.parse_stats_section(stats_page))
         return self
 
-    def load_characters(self):
+    @loader
+    def load_characters(self, sidebar=None):
         """Fetches the MAL media characters page and sets the current media's character attributes.
 
+        :type sidebar: bool
+        :param sidebar: Whether to also set the sidebar's attributes from the page. Defaults to doing so only if they
+            haven't been loaded.
+
         :rtype: :class:`.Media`
         :return: current media object.
 
         """
-        characters_page = self.session.session.get(
+        characters_page = self._characters_page()
+        if self._needs_sidebar(sidebar):
+            self.set(self.parse_characters(characters_page))
+        else:
+            self.set(self.parse_characters_section(characters_page))
+        return self
+
+    def _characters_page(self):
+        return self.session.fetch_dom(
             'https://myanimelist.net/' + self.__class__.__name__.lower() + '/' + str(
-                self.id) + '/' + utilities.urlencode(self.title) + '/characters').text
-        self.set(self.parse_characters(utilities.get_clean_dom(characters_page)))
+                self.id) + '/' + utilities.urlencode(self.title) + '/characters', content_only=True)
+
+    def load_all(self, parts=None):
+        """Fetches several of the MAL media pages at once and sets the current media's attributes from each.
+
+        The other pages' URLs hold the media's title, so the main page is loaded first if the title isn't known yet. The
+        remaining pages are then requested concurrently, and each is parsed for its own attributes only: the sidebar,
+        which every page repeats, is parsed once.
+
+        :type parts: tuple
+        :param parts: Names of the pages to load: 'main', 'stats', 'characters' and, for anime, 'videos'. Defaults to
+            every page.
+
+        :rtype: :class:`.Media`
+        :return: current media object.
+
+        :raises: ValueError if a part is unknown. Otherwise, whatever the first failed loader raised, once the other
+            loaders have finished.
+
+        """
+        parts = list(self._parts) if parts is None else list(parts)
+        for part in parts:
+            if part not in self._parts:
+                raise ValueError("Unknown media part: " + str(part))
+        loader_names = [self._parts[part] for part in parts]
+
+        # the main page's sidebar is parsed by load(); otherwise, by the first of the other pages that repeat it.
+        sidebar = None if 'load' not in loader_names else False
+        if self._title is None:
+            if 'load' in loader_names:
+                loader_names.remove('load')
+                self.load()
+            elif loader_names:
+                # the session's store may hold the title; otherwise, this loads the main page.
+                self.title
+
+        loads = []
+        for loader_name in loader_names:
+            if loader_name in self._sidebar_loaders:
+                loads.append((loader_name, {'sidebar': sidebar}))
+                sidebar = False
+            else:
+                loads.append((loader_name, {}))
+        if len(loads) == 1:
+            getattr(self, loads[0][0])(**loads[0][1])
+        elif loads:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(loads)) as pool:
+                # the pool's threads keep to the deadlines of the calling thread.
+                futures = [pool.submit(self.session.bind(getattr(self, loader_name)), **kwargs)
+                           for loader_name, kwargs in loads]
+            for future in futures:
+                future.result()
         return self
 
     @property
@@ -745,3 +894,11 @@ class Media(Base, metaclass=abc.ABCMeta):
         """
         return self._score_stats
 
+    @property
+    @loadable('load_stats')
+    def score_histogram(self):
+        """Score statistics as an array.array('q') of 10 ints: the number of users who gave each score, from 1 to 10.
+        Histograms of many media stack cheaply into a matrix, e.g. numpy.frombuffer(b''.join(histograms), 'int64').
+        """
+        return self._score_histogram
+
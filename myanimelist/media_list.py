@@ -9,7 +9,7 @@ import datetime
 import urllib.request, urllib.parse, urllib.error
 
 from . import utilities
-from .base import Base, MalformedPageError, InvalidBaseError, loadable
+from .base import Base, MalformedPageError, InvalidBaseError, loadable, loader
 
 
 class MalformedMediaListPageError(MalformedPageError):
@@ -21,7 +21,7 @@ class InvalidMediaListError(InvalidBaseError):
 
 
 class MediaList(Base, collections.Mapping, metaclass=abc.ABCMeta):
-    __id_attribute = "username"
+    _id_attribute = "username"
 
     def __getitem__(self, media):
         return self.list[media]
@@ -44,6 +44,10 @@ class MediaList(Base, collections.Mapping, metaclass=abc.ABCMeta):
         self._list = None
         self._stats = None
 
+    @property
+    def _resource_type(self):
+        return self.type + '_list'
+
     # subclasses must define a list type, ala "anime" or "manga"
     @abc.abstractproperty
     def type(self):
@@ -227,7 +231,7 @@ class MediaList(Base, collections.Mapping, metaclass=abc.ABCMeta):
 
     def parse(self, xml):
         list_info = {}
-        list_page = et.fromstring(xml.encode())
+        list_page = et.fromstring(xml.encode(), parser=utilities.xml_parser())
 
         primary_elt = list_page
         if primary_elt is None:
@@ -255,9 +259,10 @@ class MediaList(Base, collections.Mapping, metaclass=abc.ABCMeta):
 
         return list_info
 
+    @loader
     def load(self):
-        media_list = self.session.session.get('https://myanimelist.net/malappinfo.php?' + urllib.parse.urlencode(
-            {'u': self.username, 'status': 'all', 'type': self.type})).text
+        media_list = self.session.fetch('https://myanimelist.net/malappinfo.php?' + urllib.parse.urlencode(
+            {'u': self.username, 'status': 'all', 'type': self.type}))
         self.set(self.parse(media_list))
         return self
 
@@ -0,0 +1,177 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Remembers which resources MAL said don't exist, so that asking for them again costs no request.
+"""
+import importlib
+import sqlite3
+import threading
+import time
+
+from .base import InvalidBaseError
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS negative_cache (
+    type TEXT NOT NULL,
+    id NOT NULL,
+    error TEXT NOT NULL,
+    message TEXT,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (type, id)
+);
+"""
+
+
+def _error_name(error_class):
+    return error_class.__module__ + ':' + error_class.__qualname__
+
+
+def _error_class(name):
+    module, _, qualname = name.partition(':')
+    try:
+        error_class = importlib.import_module(module)
+        for attribute in qualname.split('.'):
+            error_class = getattr(error_class, attribute)
+    except (ImportError, AttributeError):
+        return InvalidBaseError
+    return error_class if isinstance(error_class, type) and issubclass(error_class, InvalidBaseError) else \
+        InvalidBaseError
+
+
+class NegativeCache(object):
+    """A cache of the (type, id) pairs that loaded as invalid, e.g. deleted anime or unknown usernames.
+
+    When a session has a negative cache, loaders raise the remembered error straight away for cached resources, and
+    record the invalid-resource errors they raise.
+    """
+
+    def __init__(self, ttl=86400, path=None):
+        """Creates a new instance of NegativeCache.
+
+        :type ttl: float
+        :param ttl: Number of seconds an entry is trusted for.
+
+        :type path: str
+        :param path: Path to a SQLite database file to persist entries in. Entries are only kept in memory if omitted.
+
+        :rtype: :class:`.NegativeCache`
+        :return: The desired cache.
+
+        """
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._connection:
+                self._connection.executescript(_SCHEMA)
+                self._connection.execute("DELETE FROM negative_cache WHERE expires_at < ?", (time.time(),))
+                for resource_type, resource_id, error, message, expires_at in self._connection.execute(
+                        "SELECT type, id, error, message, expires_at FROM negative_cache"):
+                    self._entries[(resource_type, resource_id)] = (_error_class(error), message, expires_at)
+
+    def close(self):
+        """Closes the underlying database connection, if there is one.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, resource_type, resource_id):
+        """Looks up a resource, counting a hit or a miss.
+
+        :type resource_type: str
+        :param resource_type: The resource's type, e.g. 'anime'.
+
+        :param resource_id: The resource's id.
+
+        :rtype: :class:`myanimelist.base.InvalidBaseError`
+        :return: The error to raise for the resource, or None if it isn't known to be invalid.
+
+        """
+        key = (resource_type, resource_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < time.time():
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        error_class, message, _ = entry
+        return error_class(resource_id, message=message)
+
+    def check(self, resource):
+        """Raises the remembered error if a resource is known to be invalid.
+
+        :type resource: :class:`myanimelist.base.Base`
+        :param resource: The resource about to be loaded.
+
+        :raises: :class:`myanimelist.base.InvalidBaseError`
+
+        """
+        error = self.get(resource._resource_type, getattr(resource, resource._id_attribute))
+        if error is not None:
+            raise error
+
+    def record(self, resource, error):
+        """Remembers that a resource is invalid.
+
+        :type resource: :class:`myanimelist.base.Base`
+        :param resource: The resource that failed to load.
+
+        :type error: :class:`myanimelist.base.InvalidBaseError`
+        :param error: The error its loader raised.
+
+        """
+        key = (resource._resource_type, getattr(resource, resource._id_attribute))
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._entries[key] = (error.__class__, error.message, expires_at)
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute("INSERT OR REPLACE INTO negative_cache (type, id, error, message, "
+                                             "expires_at) VALUES (?, ?, ?, ?, ?)",
+                                             key + (_error_name(error.__class__), error.message, expires_at))
+
+    def discard(self, resource_type, resource_id):
+        """Forgets a resource, so that the next load goes to MAL.
+
+        :type resource_type: str
+        :param resource_type: The resource's type, e.g. 'anime'.
+
+        :param resource_id: The resource's id.
+
+        """
+        with self._lock:
+            self._discard((resource_type, resource_id))
+
+    def _discard(self, key):
+        self._entries.pop(key, None)
+        if self._connection is not None:
+            with self._connection:
+                self._connection.execute("DELETE FROM negative_cache WHERE type = ? AND id = ?", key)
+
+    def stats(self):
+        """Counts the cache's entries, hits and misses.
+
+        :rtype: dict
+        :return: A dict with 'entries', 'hits', 'misses' and 'hit_rate' keys.
+
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': float(self.hits) / lookups if lookups else 0.0,
+            }
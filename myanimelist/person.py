@@ -5,6 +5,7 @@ import re
 
 from . import utilities
 from .base import Base, MalformedPageError, InvalidBaseError, loadable
+from .reference import PersonReference
 
 
 class MalformedPersonPageError(MalformedPageError):
@@ -31,3 +32,6 @@ class Person(Base):
     @loadable('load')
     def name(self):
         return self._name
+
+
+Person.register(PersonReference)
@@ -0,0 +1,181 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Lightweight references to MAL resources that have not been loaded.
+
+Parsers create far more resources than anyone loads: every related anime, genre, character and voice actor on a page
+becomes an object holding an id and maybe a title. A :class:`.Reference` keeps just that in a handful of slots. The
+first time anything else is asked of it (a loadable property, load(), ...), it builds the full resource, hands it the
+fields set so far, and delegates to it from then on.
+
+References pass isinstance() checks against the classes they stand for, and compare and hash equal to them.
+"""
+import importlib
+import threading
+
+from .base import Base
+
+_upgrade_lock = threading.Lock()
+
+
+class Reference(object):
+    """A compact stand-in for a MAL resource, upgraded to the full resource on first use.
+
+    To subclass, set _module and _class_name to the module and name of the full resource class.
+    """
+    __slots__ = ('session', 'id', '_fields', '_target')
+
+    _module = None
+    _class_name = None
+    _resource_type = None
+    _id_attribute = "id"
+    _resolved_class = None
+
+    @classmethod
+    def _target_class(cls):
+        # the full class's module is only imported once a reference needs it.
+        if cls._resolved_class is None:
+            cls._resolved_class = getattr(importlib.import_module(cls._module, __package__), cls._class_name)
+        return cls._resolved_class
+
+    def __init__(self, session, resource_id):
+        """Creates a new instance of Reference.
+
+        :type session: :class:`myanimelist.session.Session`
+        :param session: A valid MAL session.
+
+        :type resource_id: int
+        :param resource_id: The resource's ID.
+
+        :raises: The full resource class's invalid-ID error, e.g. :class:`myanimelist.anime.InvalidAnimeError`.
+
+        """
+        object.__setattr__(self, 'session', session)
+        object.__setattr__(self, 'id', resource_id)
+        object.__setattr__(self, '_fields', None)
+        object.__setattr__(self, '_target', None)
+        if not isinstance(resource_id, int) or resource_id < 1:
+            # let the full class reject the id with its own error.
+            self._upgrade()
+
+    def _upgrade(self):
+        target = self._target
+        if target is None:
+            target = self._target_class()(self.session, self.id)
+            with _upgrade_lock:
+                if self._target is None:
+                    if self._fields is not None:
+                        target.set(self._fields)
+                    object.__setattr__(self, '_target', target)
+                    object.__setattr__(self, '_fields', None)
+                target = self._target
+        return target
+
+    @property
+    def upgraded(self):
+        """Whether this reference has been upgraded to the full resource.
+        """
+        return self._target is not None
+
+    def set(self, attr_dict):
+        """Sets attributes of the referenced resource, without upgrading this reference.
+
+        :type attr_dict: dict
+        :param attr_dict: Parameters to set, with attribute keys.
+
+        :rtype: :class:`.Reference`
+        :return: The current reference.
+
+        """
+        if self._target is not None:
+            self._target.set(attr_dict)
+            return self
+        for key in attr_dict:
+            if key == self._id_attribute:
+                object.__setattr__(self, 'id', attr_dict[key])
+            else:
+                if self._fields is None:
+                    object.__setattr__(self, '_fields', {})
+                self._fields[key] = attr_dict[key]
+        return self
+
+    def field(self, name):
+        """Looks up an attribute that has already been set, without upgrading this reference or loading anything.
+
+        :type name: str
+        :param name: The attribute's name, e.g. 'title'.
+
+        :return: The attribute's value, or None if it hasn't been set.
+
+        """
+        if self._target is not None:
+            return self._target.__dict__.get('_' + name)
+        return self._fields.get(name) if self._fields is not None else None
+
+    def __getattr__(self, name):
+        # only called for names that aren't slots; never upgrade for special-method lookups (pickle, copy, ...).
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self._upgrade(), name)
+
+    def __setattr__(self, name, value):
+        if name in Reference.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._upgrade(), name, value)
+
+    def __getstate__(self):
+        return self.session, self.id, self._fields, self._target
+
+    def __setstate__(self, state):
+        for name, value in zip(Reference.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return "".join(["<", self._class_name, " ", self._id_attribute, ": ", str(self.id), ">"])
+
+    def __hash__(self):
+        return hash('-'.join([self._class_name, str(self.id)]))
+
+    def __eq__(self, other):
+        return isinstance(other, self._target_class()) and self.id == getattr(other, other._id_attribute)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+Base.register(Reference)
+
+
+class AnimeReference(Reference):
+    __slots__ = ()
+    _module = '.anime'
+    _class_name = 'Anime'
+    _resource_type = 'anime'
+
+
+class MangaReference(Reference):
+    __slots__ = ()
+    _module = '.manga'
+    _class_name = 'Manga'
+    _resource_type = 'manga'
+
+
+class CharacterReference(Reference):
+    __slots__ = ()
+    _module = '.character'
+    _class_name = 'Character'
+    _resource_type = 'character'
+
+
+class PersonReference(Reference):
+    __slots__ = ()
+    _module = '.person'
+    _class_name = 'Person'
+    _resource_type = 'person'
+
+
+class GenreReference(Reference):
+    __slots__ = ()
+    _module = '.genre'
+    _class_name = 'Genre'
+    _resource_type = 'genre'
@@ -0,0 +1,349 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Enumerates the anime or manga catalogue by walking ranges of IDs.
+
+Most IDs below :meth:`myanimelist.media.Media.newest` belong to deleted entries, and loading them only to have MAL
+answer with an invalid page wastes requests. :class:`.IdScanner` remembers the IDs found to be invalid in a bitmap
+kept in SQLite, alongside the highest valid ID seen so far, so that later scans skip them and incremental scans only
+walk IDs added since the last one.
+"""
+import concurrent.futures
+import sqlite3
+import threading
+import time
+
+from . import anime
+from . import manga
+from .base import Error, InvalidBaseError
+from .breaker import CircuitOpenError
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scan_state (
+    media_type TEXT PRIMARY KEY,
+    max_seen INTEGER NOT NULL DEFAULT 0,
+    invalid BLOB NOT NULL DEFAULT x''
+);
+"""
+
+"""Media classes that can be scanned, keyed by type.
+"""
+MEDIA_TYPES = {
+    'anime': anime.Anime,
+    'manga': manga.Manga,
+}
+
+
+class IdBitmap(object):
+    """A growable set of positive integer IDs, stored one bit per ID.
+    """
+
+    def __init__(self, data=b''):
+        """Creates a new instance of IdBitmap.
+
+        :type data: bytes
+        :param data: A bitmap previously returned by :meth:`.to_bytes`.
+
+        :rtype: :class:`.IdBitmap`
+        :return: The desired bitmap.
+
+        """
+        self._bits = bytearray(data)
+
+    def add(self, resource_id):
+        byte, bit = divmod(resource_id, 8)
+        if byte >= len(self._bits):
+            self._bits.extend(b'\x00' * (byte + 1 - len(self._bits)))
+        self._bits[byte] |= 1 << bit
+
+    def discard(self, resource_id):
+        byte, bit = divmod(resource_id, 8)
+        if byte < len(self._bits):
+            self._bits[byte] &= ~(1 << bit) & 0xFF
+
+    def __contains__(self, resource_id):
+        byte, bit = divmod(resource_id, 8)
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << bit))
+
+    def __len__(self):
+        return sum(bin(byte).count('1') for byte in self._bits)
+
+    def to_bytes(self):
+        return bytes(self._bits)
+
+
+class ScanState(object):
+    """Persists, per media type, the highest valid ID seen and the bitmap of IDs known to be invalid.
+    """
+
+    def __init__(self, path=':memory:'):
+        """Creates a new instance of ScanState.
+
+        :type path: str
+        :param path: Path to the SQLite database file. Defaults to an in-memory database.
+
+        :rtype: :class:`.ScanState`
+        :return: The desired scan state.
+
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        """Closes the underlying database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def load(self, media_type):
+        """Reads the state of a media type.
+
+        :type media_type: str
+        :param media_type: 'anime' or 'manga'.
+
+        :rtype: tuple
+        :return: (max_seen, invalid) where invalid is an :class:`.IdBitmap`.
+
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT max_seen, invalid FROM scan_state WHERE media_type = ?",
+                                           (media_type,)).fetchone()
+        if row is None:
+            return 0, IdBitmap()
+        return row[0], IdBitmap(row[1])
+
+    def save(self, media_type, max_seen, invalid):
+        """Writes the state of a media type.
+
+        :type media_type: str
+        :param media_type: 'anime' or 'manga'.
+
+        :type max_seen: int
+        :param max_seen: The highest valid ID seen.
+
+        :type invalid: :class:`.IdBitmap`
+        :param invalid: The IDs known to be invalid.
+
+        """
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO scan_state (media_type, max_seen, invalid) VALUES (?, ?, ?)",
+                                     (media_type, max_seen, sqlite3.Binary(invalid.to_bytes())))
+
+
+class ScanStats(object):
+    """Counts what a scan did, and how fast.
+    """
+
+    def __init__(self):
+        self.loaded = 0
+        self.invalid = 0
+        self.skipped = 0
+        self.errors = 0
+        self.rejected = 0
+        self.started_at = time.time()
+        self.finished_at = None
+
+        """IDs that failed to load or were turned away by the session's circuit breakers, mapped to the exception raised,
+        so that they can be scanned again with :meth:`.IdScanner.retry`.
+        """
+        self.failed = {}
+
+    @property
+    def requested(self):
+        """The number of IDs that were requested from MAL. IDs turned away by a circuit breaker were not requested.
+        """
+        return self.loaded + self.invalid + self.errors
+
+    @property
+    def elapsed(self):
+        """The number of seconds the scan ran for.
+        """
+        return (self.finished_at if self.finished_at is not None else time.time()) - self.started_at
+
+    @property
+    def throughput(self):
+        """The number of IDs requested per second.
+        """
+        elapsed = self.elapsed
+        return self.requested / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def hit_rate(self):
+        """The fraction of requested IDs that turned out to be valid.
+        """
+        return float(self.loaded) / self.requested if self.requested else 0.0
+
+    def __repr__(self):
+        return (u'<ScanStats loaded=%d invalid=%d skipped=%d errors=%d rejected=%d throughput=%.2f/s hit_rate=%.1f%%>' %
+                (self.loaded, self.invalid, self.skipped, self.errors, self.rejected, self.throughput,
+                 100 * self.hit_rate))
+
+
+class IdScanner(object):
+    """Loads every valid ID in a range of anime or manga IDs, skipping the IDs known to be invalid.
+    """
+
+    def __init__(self, session, media_type='anime', state=None, concurrency=4, loader='load', checkpoint=100):
+        """Creates a new instance of IdScanner.
+
+        :type session: :class:`myanimelist.session.Session`
+        :param session: A valid MAL session, used for every request.
+
+        :type media_type: str
+        :param media_type: 'anime' or 'manga'.
+
+        :type state: :class:`.ScanState`
+        :param state: Where to persist what scans learn. Defaults to an in-memory state.
+
+        :type concurrency: int
+        :param concurrency: Number of IDs requested at once.
+
+        :type loader: str
+        :param loader: Name of the loader method called on each media, e.g. 'load_stats'.
+
+        :type checkpoint: int
+        :param checkpoint: Number of requests between writes of the scan state.
+
+        :rtype: :class:`.IdScanner`
+        :return: The desired scanner.
+
+        """
+        if media_type not in MEDIA_TYPES:
+            raise ValueError("Can't scan media of type " + repr(media_type))
+        self.session = session
+        self.media_type = media_type
+        self.state = state if state is not None else ScanState()
+        self.concurrency = concurrency
+        self.loader = loader
+        self.checkpoint = checkpoint
+        self.max_seen, self.invalid = self.state.load(media_type)
+
+    def newest(self):
+        """Looks up the highest ID on MAL.
+
+        :rtype: int
+        :return: The newest media's ID.
+
+        """
+        return MEDIA_TYPES[self.media_type].newest(self.session).id
+
+    def fetch(self, media_id):
+        """Loads a single ID.
+
+        :type media_id: int
+        :param media_id: The media's ID.
+
+        :rtype: :class:`myanimelist.media.Media`
+        :return: The loaded media.
+
+        """
+        media = getattr(self.session, self.media_type)(media_id)
+        getattr(media, self.loader)()
+        return media
+
+    def save(self):
+        """Writes what this scanner has learned to its scan state.
+        """
+        self.state.save(self.media_type, self.max_seen, self.invalid)
+
+    def scan(self, start=1, stop=None, callback=None, skip_invalid=True):
+        """Walks a range of IDs.
+
+        :type start: int
+        :param start: The first ID to request.
+
+        :type stop: int
+        :param stop: The last ID to request. Defaults to the newest ID on MAL.
+
+        :type callback: function
+        :param callback: Called with each loaded media.
+
+        :type skip_invalid: bool
+        :param skip_invalid: Whether to skip IDs known to be invalid. Pass False to check them again.
+
+        :rtype: :class:`.ScanStats`
+        :return: What the scan did.
+
+        """
+        if stop is None:
+            stop = self.newest()
+        return self._walk(range(start, stop + 1), callback, skip_invalid)
+
+    def retry(self, stats, callback=None):
+        """Walks the IDs that failed during a previous scan.
+
+        :type stats: :class:`.ScanStats`
+        :param stats: What the previous scan did.
+
+        :type callback: function
+        :param callback: Called with each loaded media.
+
+        :rtype: :class:`.ScanStats`
+        :return: What this scan did.
+
+        """
+        return self._walk(sorted(stats.failed), callback, True)
+
+    def _walk(self, ids, callback, skip_invalid):
+        import requests
+        stats = ScanStats()
+        ids = iter(ids)
+        in_flight = {}
+        since_checkpoint = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while True:
+                for media_id in ids:
+                    if skip_invalid and media_id in self.invalid:
+                        stats.skipped += 1
+                        continue
+                    in_flight[pool.submit(self.fetch, media_id)] = media_id
+                    if len(in_flight) >= self.concurrency:
+                        break
+                if not in_flight:
+                    break
+                done, _ = concurrent.futures.wait(list(in_flight), return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    media_id = in_flight.pop(future)
+                    try:
+                        media = future.result()
+                    except InvalidBaseError:
+                        self.invalid.add(media_id)
+                        stats.invalid += 1
+                    except CircuitOpenError as e:
+                        # turned away without a request.
+                        stats.failed[media_id] = e
+                        stats.rejected += 1
+                        continue
+                    except (Error, requests.exceptions.RequestException) as e:
+                        stats.failed[media_id] = e
+                        stats.errors += 1
+                    else:
+                        self.invalid.discard(media_id)
+                        self.max_seen = max(self.max_seen, media_id)
+                        stats.loaded += 1
+                        if callback is not None:
+                            callback(media)
+                    since_checkpoint += 1
+                if since_checkpoint >= self.checkpoint:
+                    self.save()
+                    since_checkpoint = 0
+        self.save()
+        stats.finished_at = time.time()
+        return stats
+
+    def incremental(self, stop=None, callback=None):
+        """Walks the IDs above the highest valid ID seen by previous scans.
+
+        :type stop: int
+        :param stop: The last ID to request. Defaults to the newest ID on MAL.
+
+        :type callback: function
+        :param callback: Called with each loaded media.
+
+        :rtype: :class:`.ScanStats`
+        :return: What the scan did.
+
+        """
+        return self.scan(self.max_seen + 1, stop, callback)
@@ -0,0 +1,293 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""A local fuzzy index of anime and manga titles.
+
+Titles and alternative titles are normalized (accents stripped, case folded, punctuation collapsed to spaces) and split
+into words. Every distinct word is indexed by its character trigrams, so each word of a query is matched against the
+vocabulary, misspellings and prefixes included, rather than against every title. The titles holding the matched words
+are then ranked by how much of the query they cover, relative to their own length, with titles that contain the query
+as a whole ranked first.
+
+Media are identified by (type, id) keys, e.g. ('anime', 1).
+"""
+import collections
+import heapq
+import re
+import threading
+import unicodedata
+
+_SEPARATORS = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize(title):
+    """Reduces a title to the form it is indexed and searched by.
+
+    :type title: str
+    :param title: A title or query.
+
+    :rtype: str
+    :return: The title without accents, case or punctuation, e.g. 'pokemon the movie' for 'Pokémon: The Movie'.
+
+    """
+    title = unicodedata.normalize('NFKD', title)
+    title = u''.join(char for char in title if not unicodedata.combining(char))
+    return _SEPARATORS.sub(u' ', title.casefold()).strip()
+
+
+def trigrams(word):
+    """Splits a word into character trigrams.
+
+    A space is prepended, so that words sharing a beginning are more alike than words sharing a middle.
+
+    :type word: str
+    :param word: A normalized word.
+
+    :rtype: set
+    :return: The word's trigrams.
+
+    """
+    padded = u' ' + word
+    if len(padded) < 3:
+        return {padded} if word else set()
+    return set(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TitleIndex(object):
+    """A trigram index of media titles, supporting fuzzy search and incremental updates.
+    """
+
+    def __init__(self):
+        """Creates a new instance of TitleIndex.
+
+        :rtype: :class:`.TitleIndex`
+        :return: The desired index.
+
+        """
+        self._lock = threading.RLock()
+        # title id -> (key, normalized title, words).
+        self._entries = {}
+        # key -> list of title ids.
+        self._keys = {}
+        self._titles = {}
+        self._next_id = 0
+        # word -> set of title ids.
+        self._word_titles = {}
+        # trigram -> set of words, and word -> number of trigrams.
+        self._word_grams = collections.defaultdict(set)
+        self._word_sizes = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return tuple(key) in self._keys
+
+    def title(self, key):
+        """Looks up the main title a media was indexed with.
+
+        :type key: tuple
+        :param key: The media's (type, id) key.
+
+        :rtype: str
+        :return: The title, or None if the media isn't indexed.
+
+        """
+        return self._titles.get(tuple(key))
+
+    def add_titles(self, key, title, alternative_titles=None):
+        """Indexes a media's titles, replacing any previously indexed for it.
+
+        :type key: tuple
+        :param key: The media's (type, id) key.
+
+        :type title: str
+        :param title: The media's main title.
+
+        :type alternative_titles: dict
+        :param alternative_titles: Lists of titles keyed by language, e.g. {'English': ['Cowboy Bebop']}.
+
+        """
+        key = tuple(key)
+        forms = []
+        for name in [title] + [name for names in (alternative_titles or {}).values() for name in names]:
+            if name:
+                normalized = normalize(name)
+                if normalized and normalized not in forms:
+                    forms.append(normalized)
+        with self._lock:
+            self._remove(key)
+            if not forms:
+                return
+            ids = []
+            for normalized in forms:
+                title_id = self._next_id
+                self._next_id += 1
+                words = tuple(normalized.split())
+                self._entries[title_id] = (key, normalized, words)
+                for word in words:
+                    if word not in self._word_titles:
+                        self._word_titles[word] = set()
+                        grams = trigrams(word)
+                        self._word_sizes[word] = len(grams)
+                        for gram in grams:
+                            self._word_grams[gram].add(word)
+                    self._word_titles[word].add(title_id)
+                ids.append(title_id)
+            self._keys[key] = ids
+            self._titles[key] = title
+
+    def add(self, media):
+        """Indexes the titles of a loaded media.
+
+        :type media: :class:`myanimelist.media.Media`
+        :param media: The media. Only attributes that have already been set are read.
+
+        """
+        self.add_titles((media._resource_type, media.id), media.field('title'), media.field('alternative_titles'))
+
+    def add_store(self, store, resource_types=('anime', 'manga')):
+        """Indexes the titles of every media in a store.
+
+        :type store: :class:`myanimelist.store.Store`
+        :param store: The store to read.
+
+        :type resource_types: iterable
+        :param resource_types: The types of media to index.
+
+        :rtype: :class:`.TitleIndex`
+        :return: The current index.
+
+        """
+        for resource_type, resource_id, title, alternative_titles in store.titles(resource_types):
+            self.add_titles((resource_type, resource_id), title, alternative_titles)
+        return self
+
+    def remove(self, key):
+        """Removes a media's titles from the index.
+
+        :type key: tuple
+        :param key: The media's (type, id) key.
+
+        """
+        with self._lock:
+            self._remove(tuple(key))
+
+    def _remove(self, key):
+        for title_id in self._keys.pop(key, ()):
+            _, _, words = self._entries.pop(title_id)
+            for word in words:
+                titles = self._word_titles.get(word)
+                if titles is None:
+                    continue
+                titles.discard(title_id)
+                if not titles:
+                    # forget words no title uses any more.
+                    del self._word_titles[word], self._word_sizes[word]
+                    for gram in trigrams(word):
+                        self._word_grams[gram].discard(word)
+                        if not self._word_grams[gram]:
+                            del self._word_grams[gram]
+        self._titles.pop(key, None)
+
+    def listen(self, session):
+        """Indexes every media loaded through a session from now on.
+
+        :type session: :class:`myanimelist.session.Session`
+        :param session: The session to listen to.
+
+        :rtype: :class:`.TitleIndex`
+        :return: The current index.
+
+        """
+        session.add_load_listener(self._on_load)
+        return self
+
+    def _on_load(self, resource, loader_name):
+        # titles are only on the main page.
+        if loader_name == 'load' and resource._resource_type in ('anime', 'manga'):
+            self.add(resource)
+
+    def _similar_words(self, query_word, min_similarity):
+        # trigram Dice coefficient against every indexed word sharing a trigram; a word the query is a prefix of scores
+        # at least the share of the word it spells out, so that partially typed words match.
+        grams = trigrams(query_word)
+        counts = collections.Counter()
+        for gram in grams:
+            counts.update(self._word_grams.get(gram, ()))
+        size = len(grams)
+        similar = {}
+        for word, shared in counts.items():
+            similarity = 2.0 * shared / (size + self._word_sizes[word])
+            if similarity < 1 and word.startswith(query_word):
+                similarity = max(similarity, float(len(query_word)) / len(word))
+            if similarity >= min_similarity:
+                similar[word] = similarity
+        return similar
+
+    def search(self, query, resource_type=None, limit=10, min_score=0.3, min_similarity=0.5):
+        """Finds the media whose titles best match a query.
+
+        :type query: str
+        :param query: Free text, e.g. 'bebop'.
+
+        :type resource_type: str
+        :param resource_type: Only return media of this type, e.g. 'anime'. Defaults to every type.
+
+        :type limit: int
+        :param limit: Maximum number of results.
+
+        :type min_score: float
+        :param min_score: Minimum score, between 0 and 1, of titles that don't contain the query.
+
+        :type min_similarity: float
+        :param min_similarity: Minimum trigram similarity, between 0 and 1, for a title's word to match a query word.
+
+        :rtype: list
+        :return: (key, matched title, score) tuples, best first. A title scores the similarities of its best matches for
+            each query word, doubled and divided by the number of words in the query and the title. Titles containing
+            the whole query score above 1.
+
+        """
+        normalized = normalize(query)
+        query_words = list(collections.OrderedDict.fromkeys(normalized.split()))
+        if not query_words:
+            return []
+        with self._lock:
+            matches = [self._similar_words(word, min_similarity) for word in query_words]
+            # candidates come from the rarer query words; the commonest one ("no", "the", ...) is only checked against
+            # them, unless nothing else matched.
+            postings = [sum(len(self._word_titles[word]) for word in similar) for similar in matches]
+            order = sorted(range(len(query_words)), key=postings.__getitem__)
+            generating, checked = order, []
+            if len(order) > 1 and postings[order[-2]] > 0:
+                generating, checked = order[:-1], order[-1:]
+
+            totals = collections.Counter()
+            for position in generating:
+                best = {}
+                # ascending, so that each title keeps the similarity of its best matching word.
+                for word, similarity in sorted(matches[position].items(), key=lambda item: item[1]):
+                    best.update(dict.fromkeys(self._word_titles[word], similarity))
+                totals.update(best)
+
+            ranked = {}
+            query_size = len(query_words)
+            for title_id, total in totals.items():
+                key, title, words = self._entries[title_id]
+                if resource_type is not None and key[0] != resource_type:
+                    continue
+                for position in checked:
+                    similar = matches[position]
+                    if not similar.keys().isdisjoint(words):
+                        total += max(similar.get(word, 0) for word in words)
+                score = 2.0 * total / (query_size + len(words))
+                if total == query_size and normalized in title:
+                    score += 1
+                elif score < min_score:
+                    continue
+                # plain tuples sort without a key function: best score, then shortest title, then key.
+                entry = (-score, len(title), key, title)
+                if key not in ranked or entry < ranked[key]:
+                    ranked[key] = entry
+        entries = heapq.nsmallest(limit, ranked.values()) if limit is not None else sorted(ranked.values())
+        return [(key, title, -score) for score, _, key, title in entries]
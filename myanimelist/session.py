@@ -1,28 +1,18 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
-import requests
+# resource modules, lxml and requests are imported where they are first needed, so that importing this module stays
+# cheap for short-lived processes. see benchmarks/import_time.py.
+import contextlib
+import time
 
-from . import anime
-from . import manga
+from . import deadline
+from .base import Error, decode_value
+from .deadline import Deadline, DeadlineExceededError, RequestCancelledError, RequestTimeoutError
+from .singleflight import SingleFlight
 
-from . import character
-from . import person
-
-from . import user
-
-from . import club
-from . import genre
-from . import tag
-from . import publication
-from . import producer
-
-from . import anime_list
-from . import manga_list
-
-from .base import Error
-
-from lxml import html as ht
+# bytes read from a streamed response at a time.
+_STREAM_CHUNK_SIZE = 16384
 
 
 class UnauthorizedError(Error):
@@ -63,7 +53,9 @@ class Session(object):
     """Class to handle requests to MAL. Handles login, setting HTTP headers, etc.
     """
 
-    def __init__(self, username=None, password=None, user_agent="iMAL-iOS", proxy_settings=None):
+    def __init__(self, username=None, password=None, user_agent="iMAL-iOS", proxy_settings=None, store=None,
+                 rate_limiter=None, negative_cache=None, title_index=None, stream_pages=False, timeout=(10, 30),
+                 hedge_policy=None, circuit_breakers=None):
         """Creates a new instance of Session.
 
         :type username: str
@@ -75,10 +67,36 @@ class Session(object):
         :type user_agent: str
         :param user_agent: A user-agent to send to MAL in requests. If you have a user-agent assigned to you by Incapsula, pass it in here.
 
+        :type store: :class:`myanimelist.store.Store`
+        :param store: A resource store. Loadable attributes are read from it before going to MAL, and loaded pages are written to it. May be omitted.
+
+        :type rate_limiter: :class:`myanimelist.throttle.RateLimiter`
+        :param rate_limiter: Spaces out the requests made by this session. May be omitted.
+
+        :type negative_cache: :class:`myanimelist.negative_cache.NegativeCache`
+        :param negative_cache: Remembers resources that don't exist, so that loading them again fails without a request. May be omitted.
+
+        :type title_index: :class:`myanimelist.search.TitleIndex`
+        :param title_index: The index searched by :meth:`.search_local`, updated as media are loaded. Built on first search if omitted.
+
+        :type stream_pages: bool
+        :param stream_pages: Parse pages as they download, rather than once they have. See :meth:`.fetch_dom`.
+
+        :type timeout: tuple
+        :param timeout: Seconds to wait for a connection to MAL, and for each read from it, as a (connect, read) tuple or a single number for both. Requests waiting longer fail with a :class:`myanimelist.deadline.RequestTimeoutError`. None waits forever.
+
+        :type hedge_policy: :class:`myanimelist.hedge.HedgePolicy`
+        :param hedge_policy: Duplicates page requests that MAL is slow to answer, using whichever answer comes first. May be omitted.
+
+        :type circuit_breakers: :class:`myanimelist.breaker.CircuitBreakers`
+        :param circuit_breakers: Stops sending requests to endpoints MAL is failing to answer, which then fail with a :class:`myanimelist.breaker.CircuitOpenError`. May be omitted.
+
         :rtype: :class:`.Session`
         :return: The desired session.
 
         """
+        import requests
+
         self.username = username
         self.password = password
         self.session = requests.Session()
@@ -99,6 +117,313 @@ class Session(object):
         """
         self.suppress_parse_exceptions = False
 
+        self.stream_pages = stream_pages
+        self.timeout = timeout
+        self.hedge_policy = hedge_policy
+        self.circuit_breakers = circuit_breakers
+
+        self.store = store
+        self.rate_limiter = rate_limiter
+        self.negative_cache = negative_cache
+
+        """Deduplicates concurrent loads of the same object, and concurrent requests for the same URL.
+        """
+        self._flights = SingleFlight()
+
+        """Functions called with each resource and the name of its loader, after the loader has run.
+        """
+        self._load_listeners = []
+
+        self.title_index = None
+        if title_index is not None:
+            self.title_index = title_index.listen(self)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # stores and caches hold open database connections, which can't follow a session into another process.
+        state['store'] = None
+        state['negative_cache'] = None
+        state['_load_listeners'] = []
+        state['title_index'] = None
+        return state
+
+    def add_load_listener(self, listener):
+        """Registers a function to be called after every loader run through this session, e.g. to index what was loaded.
+
+        :type listener: function
+        :param listener: Called with the loaded resource and the name of the loader, e.g. 'load_characters'.
+
+        :rtype: :class:`.Session`
+        :return: The current session.
+
+        """
+        self._load_listeners.append(listener)
+        return self
+
+    def remove_load_listener(self, listener):
+        """Unregisters a function registered with :meth:`.add_load_listener`.
+
+        :type listener: function
+        :param listener: The function to unregister.
+
+        :rtype: :class:`.Session`
+        :return: The current session.
+
+        """
+        self._load_listeners.remove(listener)
+        return self
+
+    def fetch(self, url):
+        """Requests a page from MAL, within this session's rate budget.
+        Concurrent requests for the same URL share a single response.
+
+        :type url: str
+        :param url: The page's URL.
+
+        :rtype: str
+        :return: The page's body.
+
+        """
+        return self._flights.do(('fetch', url), self._fetch, url)
+
+    def _fetch(self, url):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return self._request('get', url).text
+
+    def _request(self, method, url, **kwargs):
+        # every request to MAL goes through here, bounded by the session's timeouts and the thread's deadlines, and
+        # turned away while MAL is failing to answer requests like it.
+        import requests
+        deadline.check(url)
+        if self.circuit_breakers is None:
+            return self._send(method, url, **kwargs)
+        breaker = self.circuit_breakers.breaker(url)
+        probe = breaker.allow(url)
+        started = time.monotonic()
+        try:
+            response = self._send(method, url, **kwargs)
+        except DeadlineExceededError:
+            # the caller ran out of time, which says nothing about MAL.
+            breaker.release(probe)
+            raise
+        except (RequestTimeoutError, requests.exceptions.RequestException):
+            breaker.record(probe, failed=True)
+            raise
+        except BaseException:
+            breaker.release(probe)
+            raise
+        breaker.record(probe, failed=response.status_code >= 500 or response.status_code == 429,
+                       latency=time.monotonic() - started)
+        return response
+
+    def _send(self, method, url, **kwargs):
+        import requests
+        timeout = self.timeout
+        remaining = deadline.remaining()
+        if remaining is not None:
+            if remaining <= 0:
+                # the deadline passed since the caller checked it; requests would reject a zero timeout.
+                deadline.check(url)
+            parts = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            timeout = tuple(remaining if part is None else min(part, remaining) for part in parts)
+        try:
+            if method == 'get' and self.hedge_policy is not None:
+                return self._hedged_get(url, timeout, **kwargs)
+            return getattr(self.session, method)(url, timeout=timeout, **kwargs)
+        except requests.exceptions.Timeout as e:
+            deadline.check(url)
+            raise RequestTimeoutError(url, message="Timed out: " + str(e))
+
+    def _hedged_get(self, url, timeout, stream=False, **kwargs):
+        import queue
+        import threading
+        import requests
+        from urllib3.exceptions import ReadTimeoutError
+
+        policy = self.hedge_policy
+        # (attempt, response, error) for every attempt that fails, and for the first that succeeds.
+        outcomes = queue.Queue()
+        answered = []
+        answered_lock = threading.Lock()
+
+        def attempt(number):
+            started = time.monotonic()
+            try:
+                # streamed, so that the call returns as soon as the headers have arrived.
+                response = self.session.get(url, timeout=timeout, stream=True, **kwargs)
+            except Exception as e:
+                outcomes.put((number, None, e))
+                return
+            policy.record(time.monotonic() - started)
+            with answered_lock:
+                first = not answered
+                answered.append(number)
+            if first:
+                outcomes.put((number, response, None))
+            else:
+                response.close()
+
+        def start(number):
+            thread = threading.Thread(target=attempt, args=(number,))
+            thread.daemon = True
+            thread.start()
+
+        start(0)
+        pending = 1
+        delay = policy.delay()
+        try:
+            outcome = outcomes.get(timeout=delay) if delay is not None else outcomes.get()
+        except queue.Empty:
+            # the duplicate is paid for like any other request.
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            start(1)
+            pending += 1
+            outcome = outcomes.get()
+        pending -= 1
+        while outcome[2] is not None and pending:
+            outcome = outcomes.get()
+            pending -= 1
+        number, response, error = outcome
+        if pending or number == 1:
+            policy.count(won=number == 1)
+        if error is not None:
+            raise error
+        if not stream:
+            try:
+                response.content
+            except requests.exceptions.ConnectionError as e:
+                if e.args and isinstance(e.args[0], ReadTimeoutError):
+                    raise requests.exceptions.ReadTimeout(e)
+                raise
+        return response
+
+    def _read(self, url, response):
+        # a streamed body, checked against the thread's deadlines as each chunk arrives.
+        import requests
+        from urllib3.exceptions import ReadTimeoutError
+        try:
+            for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+                deadline.check(url)
+                yield chunk
+        except requests.exceptions.ConnectionError as e:
+            if e.args and isinstance(e.args[0], ReadTimeoutError):
+                deadline.check(url)
+                raise RequestTimeoutError(url, message="Timed out: " + str(e))
+            raise
+
+    @contextlib.contextmanager
+    def within(self, deadline_or_seconds):
+        """Bounds every request the current thread makes, through any session, until the block is exited.
+        Loaders going through several pages, e.g. :meth:`myanimelist.user.User.load_reviews`, are bounded as a whole.
+
+        :type deadline_or_seconds: :class:`myanimelist.deadline.Deadline` or float
+        :param deadline_or_seconds: The deadline, which may be cancelled from another thread, or a number of seconds
+            from now.
+
+        :rtype: :class:`myanimelist.deadline.Deadline`
+        :return: The deadline, as the target of the with statement.
+
+        :raises: :class:`myanimelist.deadline.DeadlineExceededError` or
+            :class:`myanimelist.deadline.RequestCancelledError`, from requests in the block.
+
+        """
+        scope = deadline_or_seconds if isinstance(deadline_or_seconds, Deadline) else Deadline(deadline_or_seconds)
+        deadline.push(scope)
+        try:
+            yield scope
+        finally:
+            deadline.pop(scope)
+
+    def bind(self, func):
+        """Wraps a function so that it runs within the deadlines the current thread has entered, e.g. on a pool thread.
+
+        :type func: function
+        :param func: The function to wrap.
+
+        :rtype: function
+        :return: The wrapped function.
+
+        """
+        scopes = deadline.entered()
+
+        def bound(*args, **kwargs):
+            for scope in scopes:
+                deadline.push(scope)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                for scope in scopes:
+                    deadline.pop(scope)
+
+        return bound
+
+    def fetch_dom(self, url, content_only=False, until=None):
+        """Requests a page from MAL, within this session's rate budget, and parses it.
+        If this session streams pages, or until is given, the body is parsed chunk by chunk as it downloads, and the
+        whole page is parsed.
+        Concurrent requests for the same URL share a single response.
+
+        :type url: str
+        :param url: The page's URL.
+
+        :type content_only: bool
+        :param content_only: Only parse the page's #contentWrapper region. Ignored when streaming.
+
+        :type until: list
+        :param until: Compiled patterns that end the download once each has been found in the body, so that only the
+            page received until then is transferred and parsed. May be omitted.
+
+        :rtype: :class:`lxml.html.HtmlElement`
+        :return: The page's root element.
+
+        """
+        from . import utilities
+        if until is None and not self.stream_pages:
+            return utilities.get_clean_dom(self.fetch(url), content_only=content_only)
+        markers = tuple(until) if until is not None else None
+        return self._flights.do(('fetch_dom', url, markers), self._fetch_dom, url, markers)
+
+    def _fetch_dom(self, url, until=None):
+        from . import utilities
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        response = self._request('get', url, stream=True)
+        try:
+            return utilities.feed_clean_dom(self._read(url, response), response.encoding or 'utf-8', until=until)
+        finally:
+            # a response closed before its body was read ends the download.
+            response.close()
+
+    def search_local(self, query, type=None, limit=10):
+        """Searches the titles of the media known to this session, without making any request.
+
+        The first search builds the session's title index from its store, if it has one; media loaded through the
+        session are indexed as they load.
+
+        :type query: str
+        :param query: Free text, e.g. 'bebop'. Alternative titles and small typos match too.
+
+        :type type: str
+        :param type: Only return media of this type, 'anime' or 'manga'. Defaults to both.
+
+        :type limit: int
+        :param limit: Maximum number of results.
+
+        :rtype: list
+        :return: References to the best-matching media, best first, with their titles set.
+
+        """
+        if self.title_index is None:
+            from .search import TitleIndex
+            title_index = TitleIndex()
+            if self.store is not None:
+                title_index.add_store(self.store)
+            self.title_index = title_index.listen(self)
+        return [getattr(self, key[0])(key[1]).set({'title': self.title_index.title(key)})
+                for key, _, _ in self.title_index.search(query, resource_type=type, limit=limit)]
+
     def logged_in(self):
         """Checks the logged-in status of the current session.
         Expensive (requests a page), so use sparingly! Best practice is to try a request and catch an UnauthorizedError.
@@ -111,8 +436,10 @@ class Session(object):
             return False
 
         panel_url = 'https://myanimelist.net/panel.php'
-        panel = self.session.get(panel_url)
-        html = ht.fromstring(panel.content.decode("utf-8"))
+        panel = self._request('get', panel_url)
+        from lxml import html as ht
+        from . import utilities
+        html = ht.fromstring(panel.content.decode("utf-8"), parser=utilities.html_parser())
 
         if 'Logout' in panel.content.decode("utf-8") or len(html.xpath(".//*[text()[contains(.,'Logout')]]")) > 0:
             return True
@@ -141,17 +468,20 @@ class Session(object):
             'User-Agent': 'iMAL-iOS',
         }
 
+        from lxml import html as ht
+        from . import utilities
+
         panel_url = 'https://myanimelist.net'
         # set the session cookies:
-        r = self.session.get(panel_url)
+        r = self._request('get', panel_url)
 
         if len(r.history) > 0:
             cookies = r.history[0].cookies
-            html = ht.fromstring(r.content.decode("utf-8"))
+            html = ht.fromstring(r.content.decode("utf-8"), parser=utilities.html_parser())
             token_tag = html.xpath(".//meta[@name='csrf_token']")
         else:
             cookies = r.cookies
-            html = ht.fromstring(r.content.decode("utf-8"))
+            html = ht.fromstring(r.content.decode("utf-8"), parser=utilities.html_parser())
             token_tag = html.xpath(".//meta[@name='csrf_token']")
 
         if len(token_tag) == 0:
@@ -172,11 +502,24 @@ class Session(object):
         self.session.headers.update(mal_headers)
         if "MALHLOGSESSID" in cookies.keys():
             self.session.cookies = cookies
-        r = self.session.post('https://myanimelist.net/login.php', data=mal_payload)
+        r = self._request('post', 'https://myanimelist.net/login.php', data=mal_payload)
         # remove content type:
         self.session.headers.pop("Content-Type")
         return self
 
+    def from_record(self, record):
+        """Rebuilds a MAL resource from a record produced by :meth:`myanimelist.base.Base.to_record`.
+
+        :type record: dict
+        :param record: A resource record.
+
+        :rtype: :class:`myanimelist.base.Base`
+        :return: A resource bound to this session, with the record's attributes set.
+
+        """
+        resource = getattr(self, record['type'])(record['id'])
+        return resource.set({key: decode_value(self, value) for key, value in record['attrs'].items()})
+
     def anime(self, anime_id):
         """Creates an instance of myanimelist.Anime with the given ID.
 
@@ -184,10 +527,11 @@ class Session(object):
         :param anime_id: The desired anime's ID.
 
         :rtype: :class:`myanimelist.anime.Anime`
-        :return: A new Anime instance with the given ID.
+        :return: A reference to the anime with the given ID, upgraded to a full Anime instance on first use.
 
         """
-        return anime.Anime(self, anime_id)
+        from . import reference
+        return reference.AnimeReference(self, anime_id)
 
     def anime_list(self, username):
         """Creates an instance of myanimelist.AnimeList belonging to the given username.
@@ -199,6 +543,7 @@ class Session(object):
         :return: A new AnimeList instance belonging to the given username.
 
         """
+        from . import anime_list
         return anime_list.AnimeList(self, username)
 
     def character(self, character_id):
@@ -208,10 +553,11 @@ class Session(object):
         :param character_id: The desired character's ID.
 
         :rtype: :class:`myanimelist.character.Character`
-        :return: A new Character instance with the given ID.
+        :return: A reference to the character with the given ID, upgraded to a full Character instance on first use.
 
         """
-        return character.Character(self, character_id)
+        from . import reference
+        return reference.CharacterReference(self, character_id)
 
     def club(self, club_id):
         """Creates an instance of myanimelist.Club with the given ID.
@@ -223,6 +569,7 @@ class Session(object):
         :return: A new Club instance with the given ID.
 
         """
+        from . import club
         return club.Club(self, club_id)
 
     def genre(self, genre_id):
@@ -232,10 +579,11 @@ class Session(object):
         :param genre_id: The desired genre's ID.
 
         :rtype: :class:`myanimelist.genre.Genre`
-        :return: A new Genre instance with the given ID.
+        :return: A reference to the genre with the given ID, upgraded to a full Genre instance on first use.
 
         """
-        return genre.Genre(self, genre_id)
+        from . import reference
+        return reference.GenreReference(self, genre_id)
 
     def manga(self, manga_id):
         """Creates an instance of myanimelist.Manga with the given ID.
@@ -244,10 +592,11 @@ class Session(object):
         :param manga_id: The desired manga's ID.
 
         :rtype: :class:`myanimelist.manga.Manga`
-        :return: A new Manga instance with the given ID.
+        :return: A reference to the manga with the given ID, upgraded to a full Manga instance on first use.
 
         """
-        return manga.Manga(self, manga_id)
+        from . import reference
+        return reference.MangaReference(self, manga_id)
 
     def manga_list(self, username):
         """Creates an instance of myanimelist.MangaList belonging to the given username.
@@ -259,6 +608,7 @@ class Session(object):
         :return: A new MangaList instance belonging to the given username.
 
         """
+        from . import manga_list
         return manga_list.MangaList(self, username)
 
     def person(self, person_id):
@@ -268,10 +618,11 @@ class Session(object):
         :param person_id: The desired person's ID.
 
         :rtype: :class:`myanimelist.person.Person`
-        :return: A new Person instance with the given ID.
+        :return: A reference to the person with the given ID, upgraded to a full Person instance on first use.
 
         """
-        return person.Person(self, person_id)
+        from . import reference
+        return reference.PersonReference(self, person_id)
 
     def producer(self, producer_id):
         """Creates an instance of myanimelist.Producer with the given ID.
@@ -283,6 +634,7 @@ class Session(object):
         :return: A new Producer instance with the given ID.
 
         """
+        from . import producer
         return producer.Producer(self, producer_id)
 
     def publication(self, publication_id):
@@ -295,6 +647,7 @@ class Session(object):
         :return: A new Publication instance with the given ID.
 
         """
+        from . import publication
         return publication.Publication(self, publication_id)
 
     def tag(self, tag_id):
@@ -307,6 +660,7 @@ class Session(object):
         :return: A new Tag instance with the given ID.
 
         """
+        from . import tag
         return tag.Tag(self, tag_id)
 
     def user(self, username):
@@ -319,4 +673,5 @@ class Session(object):
         :return: A new User instance with the given username.
 
         """
+        from . import user
         return user.User(self, username)
@@ -0,0 +1,109 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Deduplicates concurrent calls that would do the same work.
+"""
+import threading
+
+from . import deadline
+from .deadline import DeadlineExceededError, RequestCancelledError
+
+# seconds between checks for cancellation, while waiting on another thread's call under a deadline.
+_CANCEL_POLL = 0.05
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.leader = threading.get_ident()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Runs at most one call per key at a time; callers that arrive while it is in flight wait for its outcome instead
+    of repeating it.
+    """
+
+    def __init__(self):
+        """Creates a new instance of SingleFlight.
+
+        :rtype: :class:`.SingleFlight`
+        :return: The desired group of calls.
+
+        """
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def __getstate__(self):
+        # in-flight calls and their locks can't follow a session into another process.
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def do(self, key, func, *args, **kwargs):
+        """Calls a function, unless a call with the same key is already in flight, in which case its outcome is shared.
+
+        A call made with a key that the current thread is already running runs straight away, so that keys may be
+        re-entered. Callers that wait on another thread's call stay bounded by their own deadlines, and run the call
+        themselves if it was cut short by the other thread's deadline.
+
+        :type key: object
+        :param key: A hashable key identifying the work.
+
+        :type func: function
+        :param func: The function to call.
+
+        :return: The function's return value.
+
+        :raises: Whatever the function raised.
+
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    leader = True
+                else:
+                    leader = False
+            if leader:
+                break
+            if call.leader == threading.get_ident():
+                return func(*args, **kwargs)
+            self._wait(key, call)
+            if isinstance(call.error, (DeadlineExceededError, RequestCancelledError)):
+                # the other thread's deadline doesn't bound this one.
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def _wait(self, key, call):
+        if not deadline.entered():
+            call.done.wait()
+            return
+        while True:
+            remaining = deadline.remaining()
+            if call.done.wait(_CANCEL_POLL if remaining is None else min(remaining, _CANCEL_POLL)):
+                return
+            deadline.check(_describe(key))
+
+
+def _describe(key):
+    # the URL a key is for, to report in deadline errors, e.g. the url of a ('fetch', url) key.
+    if isinstance(key, tuple):
+        for part in key:
+            if isinstance(part, str) and '://' in part:
+                return part
+    return repr(key)
@@ -0,0 +1,177 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Compact binary snapshots of loaded MAL resources.
+
+A snapshot holds the records (see :meth:`myanimelist.base.Base.to_record`) of any number of resources, with every
+string interned into a single table. Snapshots are encoded with msgpack when it is installed, and with zlib-compressed
+JSON otherwise; :func:`loads` reads either.
+"""
+import json
+import zlib
+
+from .base import Error, decode_value
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MAGIC = b'MALS'
+VERSION = 1
+
+_MSGPACK_CODEC = b'm'
+_JSON_CODEC = b'j'
+
+
+class SnapshotError(Error):
+    """Indicates that a snapshot could not be read.
+    """
+    pass
+
+
+class _StringTable(object):
+    def __init__(self):
+        self.strings = []
+        self._indices = {}
+
+    def intern(self, string):
+        index = self._indices.get(string)
+        if index is None:
+            index = self._indices[string] = len(self.strings)
+            self.strings.append(string)
+        return index
+
+
+def _pack_value(value, table):
+    # interned strings become one-element lists, which never collide with [tag, payload] pairs.
+    if isinstance(value, str):
+        return [table.intern(value)]
+    if not isinstance(value, list):
+        return value
+    tag, payload = value
+    if tag == 'd':
+        return [tag, [[_pack_value(key, table), _pack_value(item, table)] for key, item in payload]]
+    if tag in ('l', 't', 's'):
+        return [tag, [_pack_value(item, table) for item in payload]]
+    if tag == 'r':
+        return [tag, [table.intern(payload[0]), _pack_value(payload[1], table)]]
+    return value
+
+
+def _unpack_value(value, strings):
+    if not isinstance(value, list):
+        return value
+    if len(value) == 1:
+        return strings[value[0]]
+    tag, payload = value
+    if tag == 'd':
+        return [tag, [[_unpack_value(key, strings), _unpack_value(item, strings)] for key, item in payload]]
+    if tag in ('l', 't', 's'):
+        return [tag, [_unpack_value(item, strings) for item in payload]]
+    if tag == 'r':
+        return [tag, [strings[payload[0]], _unpack_value(payload[1], strings)]]
+    return value
+
+
+def dumps(resources):
+    """Serializes resources into a snapshot.
+
+    :type resources: iterable
+    :param resources: :class:`myanimelist.base.Base` objects to serialize.
+
+    :rtype: bytes
+    :return: The snapshot.
+
+    """
+    table = _StringTable()
+    records = []
+    for resource in resources:
+        record = resource.to_record()
+        records.append([
+            table.intern(record['type']),
+            _pack_value(record['id'], table),
+            [[table.intern(key), _pack_value(value, table)] for key, value in record['attrs'].items()]
+        ])
+    payload = [VERSION, table.strings, records]
+    if msgpack is not None:
+        return MAGIC + _MSGPACK_CODEC + msgpack.packb(payload, use_bin_type=True)
+    return MAGIC + _JSON_CODEC + zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+
+def loads(session, data):
+    """Rebuilds the resources stored in a snapshot.
+
+    References between resources of the same snapshot resolve to the rebuilt objects themselves; all other references
+    are created through the session's factories.
+
+    :type session: :class:`myanimelist.session.Session`
+    :param session: The session to bind rebuilt resources to.
+
+    :type data: bytes
+    :param data: A snapshot produced by :func:`dumps`.
+
+    :rtype: list
+    :return: The rebuilt resources, in the order they were serialized.
+
+    :raises: :class:`.SnapshotError`
+
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise SnapshotError("Not a MAL snapshot")
+    codec = data[len(MAGIC):len(MAGIC) + 1]
+    body = data[len(MAGIC) + 1:]
+    if codec == _MSGPACK_CODEC:
+        if msgpack is None:
+            raise SnapshotError("This snapshot was written with msgpack, which is not installed")
+        payload = msgpack.unpackb(body, raw=False)
+    elif codec == _JSON_CODEC:
+        payload = json.loads(zlib.decompress(body).decode('utf-8'))
+    else:
+        raise SnapshotError("Unknown snapshot codec: " + repr(codec))
+
+    version, strings, records = payload
+    if version != VERSION:
+        raise SnapshotError("Unsupported snapshot version: " + str(version))
+
+    references = {}
+    resources = []
+    for type_index, packed_id, _ in records:
+        resource_type = strings[type_index]
+        resource_id = _unpack_value(packed_id, strings)
+        resource = getattr(session, resource_type)(resource_id)
+        references[(resource_type, resource_id)] = resource
+        resources.append(resource)
+
+    for resource, (_, _, attrs) in zip(resources, records):
+        resource.set({strings[key]: decode_value(session, _unpack_value(value, strings), references)
+                      for key, value in attrs})
+    return resources
+
+
+def dump(resources, fp):
+    """Writes a snapshot of resources to a binary file object.
+
+    :type resources: iterable
+    :param resources: :class:`myanimelist.base.Base` objects to serialize.
+
+    :type fp: file
+    :param fp: A file object opened for binary writing.
+
+    """
+    fp.write(dumps(resources))
+
+
+def load(session, fp):
+    """Reads a snapshot from a binary file object.
+
+    :type session: :class:`myanimelist.session.Session`
+    :param session: The session to bind rebuilt resources to.
+
+    :type fp: file
+    :param fp: A file object opened for binary reading.
+
+    :rtype: list
+    :return: The rebuilt resources.
+
+    """
+    return loads(session, fp.read())
@@ -0,0 +1,431 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""A persistent SQLite store for parsed MAL resources.
+
+Scalar attributes are kept per resource, alongside the time they were fetched. Relations between resources (related
+media, genres, characters, voice actors, staff and character appearances) live in their own tables, so that they can be
+queried directly and rebuilt with the names of the resources they point at.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+from .base import decode_value
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    type TEXT NOT NULL,
+    id NOT NULL,
+    name TEXT,
+    attrs TEXT NOT NULL DEFAULT '{}',
+    relations TEXT NOT NULL DEFAULT '',
+    fetched_at REAL,
+    PRIMARY KEY (type, id)
+);
+CREATE TABLE IF NOT EXISTS media_related (
+    type TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    relation TEXT NOT NULL,
+    related_type TEXT NOT NULL,
+    related_id INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS media_related_source ON media_related (type, id);
+CREATE INDEX IF NOT EXISTS media_related_target ON media_related (related_type, related_id);
+CREATE TABLE IF NOT EXISTS media_genres (
+    type TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    genre_id INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS media_genres_source ON media_genres (type, id);
+CREATE TABLE IF NOT EXISTS media_characters (
+    type TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    character_id INTEGER NOT NULL,
+    role TEXT,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS media_characters_source ON media_characters (type, id);
+CREATE TABLE IF NOT EXISTS anime_voice_actors (
+    anime_id INTEGER NOT NULL,
+    character_id INTEGER NOT NULL,
+    person_id INTEGER NOT NULL,
+    language TEXT,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS anime_voice_actors_source ON anime_voice_actors (anime_id);
+CREATE INDEX IF NOT EXISTS anime_voice_actors_person ON anime_voice_actors (person_id);
+CREATE TABLE IF NOT EXISTS anime_staff (
+    anime_id INTEGER NOT NULL,
+    person_id INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS anime_staff_source ON anime_staff (anime_id);
+CREATE TABLE IF NOT EXISTS character_appearances (
+    character_id INTEGER NOT NULL,
+    media_type TEXT NOT NULL,
+    media_id INTEGER NOT NULL,
+    role TEXT,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS character_appearances_source ON character_appearances (character_id);
+CREATE TABLE IF NOT EXISTS character_voice_actors (
+    character_id INTEGER NOT NULL,
+    person_id INTEGER NOT NULL,
+    language TEXT,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS character_voice_actors_source ON character_voice_actors (character_id);
+"""
+
+"""Attributes of each resource type that are stored in relation tables rather than with the resource itself.
+"""
+RELATION_ATTRIBUTES = {
+    'anime': ('related', 'genres', 'characters', 'voice_actors', 'staff'),
+    'manga': ('related', 'genres', 'characters'),
+    'character': ('animeography', 'mangaography', 'voice_actors'),
+}
+
+
+def _reference_name(resource):
+    # only look at what is already set; a reference must never trigger a load or an upgrade here.
+    return resource.field('title') or resource.field('name')
+
+
+class Store(object):
+    """Persists MAL resources and their relations into a local SQLite database.
+    """
+
+    def __init__(self, path=':memory:', max_age=None):
+        """Creates a new instance of Store.
+
+        :type path: str
+        :param path: Path to the SQLite database file. Defaults to an in-memory database.
+
+        :type max_age: float
+        :param max_age: Number of seconds after which a stored resource is considered stale. None never expires.
+
+        :rtype: :class:`.Store`
+        :return: The desired store.
+
+        """
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        """Closes the underlying database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def upsert(self, resource, fetched_at=None):
+        """Inserts or updates a single resource.
+
+        :type resource: :class:`myanimelist.base.Base`
+        :param resource: The resource to persist.
+
+        :type fetched_at: float
+        :param fetched_at: UNIX time at which the resource was fetched. Defaults to now.
+
+        """
+        self.upsert_many([resource], fetched_at=fetched_at)
+
+    def upsert_many(self, resources, fetched_at=None):
+        """Inserts or updates resources in a single transaction.
+
+        Newly-stored attributes are merged into the ones already stored for each resource, and relations are replaced
+        per attribute. Resources referenced through relations are recorded by name without marking them as fetched.
+
+        :type resources: iterable
+        :param resources: :class:`myanimelist.base.Base` objects to persist.
+
+        :type fetched_at: float
+        :param fetched_at: UNIX time at which the resources were fetched. Defaults to now.
+
+        """
+        if fetched_at is None:
+            fetched_at = time.time()
+        with self._lock, self._connection:
+            cursor = self._connection.cursor()
+            for resource in resources:
+                self._upsert(cursor, resource, fetched_at)
+
+    def fetched_at(self, resource_type, resource_id):
+        """Looks up when a resource was last fetched.
+
+        :type resource_type: str
+        :param resource_type: The resource's type, e.g. 'anime'.
+
+        :param resource_id: The resource's id.
+
+        :rtype: float
+        :return: UNIX time of the last fetch, or None if the resource has never been fetched.
+
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT fetched_at FROM resources WHERE type = ? AND id = ?",
+                                           (resource_type, resource_id)).fetchone()
+        return row[0] if row is not None else None
+
+    def is_fresh(self, resource_type, resource_id, max_age=None):
+        """Checks whether a resource has been fetched recently enough.
+
+        :type resource_type: str
+        :param resource_type: The resource's type, e.g. 'anime'.
+
+        :param resource_id: The resource's id.
+
+        :type max_age: float
+        :param max_age: Maximum age in seconds. Defaults to the store's max_age.
+
+        :rtype: bool
+        :return: Whether the stored copy may be used.
+
+        """
+        fetched_at = self.fetched_at(resource_type, resource_id)
+        if fetched_at is None:
+            return False
+        if max_age is None:
+            max_age = self.max_age
+        return max_age is None or time.time() - fetched_at <= max_age
+
+    def hydrate(self, resource, max_age=None):
+        """Sets a resource's attributes from its stored copy, if there is a fresh one.
+
+        :type resource: :class:`myanimelist.base.Base`
+        :param resource: The resource to fill in.
+
+        :type max_age: float
+        :param max_age: Maximum age in seconds. Defaults to the store's max_age.
+
+        :rtype: bool
+        :return: Whether the resource was filled in.
+
+        """
+        resource_type = resource._resource_type
+        resource_id = getattr(resource, resource._id_attribute)
+        if max_age is None:
+            max_age = self.max_age
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT attrs, relations, fetched_at FROM resources WHERE type = ? AND id = ?",
+                (resource_type, resource_id)).fetchone()
+            if row is None or row[2] is None:
+                return False
+            if max_age is not None and time.time() - row[2] > max_age:
+                return False
+            session = resource.session
+            attrs = {key: decode_value(session, value) for key, value in json.loads(row[0]).items()}
+            for attribute in row[1].split(','):
+                if attribute:
+                    attrs[attribute] = getattr(self, '_read_' + attribute)(session, resource_type, resource_id)
+        resource.set(attrs)
+        return True
+
+    def titles(self, resource_types=('anime', 'manga')):
+        """Iterates over the titles of stored media, including media only known by name through another's relations.
+
+        :type resource_types: iterable
+        :param resource_types: The types of media to read.
+
+        :rtype: generator
+        :return: (type, id, title, alternative titles) tuples, where alternative titles is a dict of lists keyed by
+            language, as parsed into :attr:`myanimelist.media.Media.alternative_titles`.
+
+        """
+        resource_types = list(resource_types)
+        with self._lock:
+            rows = self._rows("SELECT type, id, name, attrs FROM resources WHERE type IN (" +
+                              ", ".join("?" * len(resource_types)) + ")", resource_types)
+        for resource_type, resource_id, name, attrs in rows:
+            alternative_titles = json.loads(attrs).get('alternative_titles')
+            yield (resource_type, resource_id, name,
+                   decode_value(None, alternative_titles) if alternative_titles is not None else {})
+
+    def _upsert(self, cursor, resource, fetched_at):
+        resource_type = resource._resource_type
+        resource_id = getattr(resource, resource._id_attribute)
+        attrs = resource.to_record()['attrs']
+
+        relations = []
+        for attribute in RELATION_ATTRIBUTES.get(resource_type, ()):
+            if attribute in attrs:
+                del attrs[attribute]
+                relations.append(attribute)
+                getattr(self, '_write_' + attribute)(cursor, resource_type, resource_id,
+                                                     getattr(resource, '_' + attribute))
+
+        row = cursor.execute("SELECT attrs, relations FROM resources WHERE type = ? AND id = ?",
+                             (resource_type, resource_id)).fetchone()
+        if row is not None:
+            stored_attrs = json.loads(row[0])
+            stored_attrs.update(attrs)
+            attrs = stored_attrs
+            relations = sorted(set(relations) | set(filter(None, row[1].split(','))))
+        cursor.execute("INSERT OR REPLACE INTO resources (type, id, name, attrs, relations, fetched_at) "
+                       "VALUES (?, ?, ?, ?, ?, ?)",
+                       (resource_type, resource_id, _reference_name(resource) or attrs.get('title') or attrs.get('name'),
+                        json.dumps(attrs, separators=(',', ':')), ','.join(relations), fetched_at))
+
+    def _write_reference(self, cursor, resource):
+        key = (resource._resource_type, getattr(resource, resource._id_attribute))
+        cursor.execute("INSERT OR IGNORE INTO resources (type, id) VALUES (?, ?)", key)
+        name = _reference_name(resource)
+        if name is not None:
+            cursor.execute("UPDATE resources SET name = ? WHERE type = ? AND id = ? AND name IS NULL",
+                           (name,) + key)
+        return key
+
+    def _reference(self, session, resource_type, resource_id, name):
+        resource = getattr(session, resource_type)(resource_id)
+        if name is not None:
+            resource.set({'title' if resource_type in ('anime', 'manga') else 'name': name})
+        return resource
+
+    def _rows(self, query, params):
+        return self._connection.execute(query, params).fetchall()
+
+    def _write_related(self, cursor, resource_type, resource_id, related):
+        cursor.execute("DELETE FROM media_related WHERE type = ? AND id = ?", (resource_type, resource_id))
+        position = 0
+        for relation, media in (related or {}).items():
+            for medium in media:
+                key = self._write_reference(cursor, medium)
+                cursor.execute("INSERT INTO media_related VALUES (?, ?, ?, ?, ?, ?)",
+                               (resource_type, resource_id, relation) + key + (position,))
+                position += 1
+
+    def _read_related(self, session, resource_type, resource_id):
+        related = {}
+        for relation, related_type, related_id, name in self._rows(
+                "SELECT r.relation, r.related_type, r.related_id, s.name FROM media_related r "
+                "LEFT JOIN resources s ON s.type = r.related_type AND s.id = r.related_id "
+                "WHERE r.type = ? AND r.id = ? ORDER BY r.position", (resource_type, resource_id)):
+            related.setdefault(relation, []).append(self._reference(session, related_type, related_id, name))
+        return related
+
+    def _write_genres(self, cursor, resource_type, resource_id, genres):
+        cursor.execute("DELETE FROM media_genres WHERE type = ? AND id = ?", (resource_type, resource_id))
+        cursor.executemany("INSERT INTO media_genres VALUES (?, ?, ?, ?)",
+                           [(resource_type, resource_id, self._write_reference(cursor, genre)[1], position)
+                            for position, genre in enumerate(genres)])
+
+    def _read_genres(self, session, resource_type, resource_id):
+        return [self._reference(session, 'genre', genre_id, name) for genre_id, name in self._rows(
+            "SELECT g.genre_id, s.name FROM media_genres g "
+            "LEFT JOIN resources s ON s.type = 'genre' AND s.id = g.genre_id "
+            "WHERE g.type = ? AND g.id = ? ORDER BY g.position", (resource_type, resource_id))]
+
+    def _write_characters(self, cursor, resource_type, resource_id, characters):
+        cursor.execute("DELETE FROM media_characters WHERE type = ? AND id = ?", (resource_type, resource_id))
+        if resource_type == 'anime':
+            cursor.execute("DELETE FROM anime_voice_actors WHERE anime_id = ?", (resource_id,))
+        voice_actor_position = 0
+        for position, (character, entry) in enumerate(characters.items()):
+            character_id = self._write_reference(cursor, character)[1]
+            cursor.execute("INSERT INTO media_characters VALUES (?, ?, ?, ?, ?)",
+                           (resource_type, resource_id, character_id, entry.get('role'), position))
+            for person, language in entry.get('voice_actors', {}).items():
+                cursor.execute("INSERT INTO anime_voice_actors VALUES (?, ?, ?, ?, ?)",
+                               (resource_id, character_id, self._write_reference(cursor, person)[1], language,
+                                voice_actor_position))
+                voice_actor_position += 1
+
+    def _read_characters(self, session, resource_type, resource_id):
+        characters = {}
+        by_id = {}
+        for character_id, role, name in self._rows(
+                "SELECT c.character_id, c.role, s.name FROM media_characters c "
+                "LEFT JOIN resources s ON s.type = 'character' AND s.id = c.character_id "
+                "WHERE c.type = ? AND c.id = ? ORDER BY c.position", (resource_type, resource_id)):
+            character = self._reference(session, 'character', character_id, name)
+            by_id[character_id] = characters[character] = {'role': role}
+            if resource_type == 'anime':
+                characters[character]['voice_actors'] = {}
+        if resource_type == 'anime':
+            for character_id, person, language in self._read_voice_actor_rows(session, resource_id):
+                by_id[character_id]['voice_actors'][person] = language
+        return characters
+
+    def _read_voice_actor_rows(self, session, anime_id):
+        return [(character_id, self._reference(session, 'person', person_id, name), language)
+                for character_id, person_id, language, name in self._rows(
+                    "SELECT v.character_id, v.person_id, v.language, s.name FROM anime_voice_actors v "
+                    "LEFT JOIN resources s ON s.type = 'person' AND s.id = v.person_id "
+                    "WHERE v.anime_id = ? ORDER BY v.position", (anime_id,))]
+
+    def _write_voice_actors(self, cursor, resource_type, resource_id, voice_actors):
+        if resource_type == 'anime':
+            # anime voice actors are derived from, and written with, the anime's characters.
+            return
+        cursor.execute("DELETE FROM character_voice_actors WHERE character_id = ?", (resource_id,))
+        cursor.executemany("INSERT INTO character_voice_actors VALUES (?, ?, ?, ?)",
+                           [(resource_id, self._write_reference(cursor, person)[1], language, position)
+                            for position, (person, language) in enumerate(voice_actors.items())])
+
+    def _read_voice_actors(self, session, resource_type, resource_id):
+        if resource_type == 'anime':
+            characters = self._read_characters(session, resource_type, resource_id)
+            by_id = {character.id: (character, entry) for character, entry in characters.items()}
+            voice_actors = {}
+            for character_id, person, language in self._read_voice_actor_rows(session, resource_id):
+                character, entry = by_id[character_id]
+                voice_actors.setdefault(person, []).append({'role': entry['role'], 'character': character,
+                                                            'language': language})
+            return voice_actors
+        return {self._reference(session, 'person', person_id, name): language
+                for person_id, language, name in self._rows(
+                    "SELECT v.person_id, v.language, s.name FROM character_voice_actors v "
+                    "LEFT JOIN resources s ON s.type = 'person' AND s.id = v.person_id "
+                    "WHERE v.character_id = ? ORDER BY v.position", (resource_id,))}
+
+    def _write_staff(self, cursor, resource_type, resource_id, staff):
+        cursor.execute("DELETE FROM anime_staff WHERE anime_id = ?", (resource_id,))
+        rows = []
+        for position, (person, roles) in enumerate(staff.items()):
+            person_id = self._write_reference(cursor, person)[1]
+            rows.extend((resource_id, person_id, role, position) for role in sorted(roles))
+        cursor.executemany("INSERT INTO anime_staff VALUES (?, ?, ?, ?)", rows)
+
+    def _read_staff(self, session, resource_type, resource_id):
+        staff = {}
+        for person_id, role, name in self._rows(
+                "SELECT a.person_id, a.role, s.name FROM anime_staff a "
+                "LEFT JOIN resources s ON s.type = 'person' AND s.id = a.person_id "
+                "WHERE a.anime_id = ? ORDER BY a.position", (resource_id,)):
+            staff.setdefault(self._reference(session, 'person', person_id, name), set()).add(role)
+        return staff
+
+    def _write_appearances(self, cursor, character_id, media_type, appearances):
+        cursor.execute("DELETE FROM character_appearances WHERE character_id = ? AND media_type = ?",
+                       (character_id, media_type))
+        cursor.executemany("INSERT INTO character_appearances VALUES (?, ?, ?, ?, ?)",
+                           [(character_id, media_type, self._write_reference(cursor, medium)[1], role, position)
+                            for position, (medium, role) in enumerate(appearances.items())])
+
+    def _read_appearances(self, session, character_id, media_type):
+        return {self._reference(session, media_type, media_id, name): role
+                for media_id, role, name in self._rows(
+                    "SELECT a.media_id, a.role, s.name FROM character_appearances a "
+                    "LEFT JOIN resources s ON s.type = a.media_type AND s.id = a.media_id "
+                    "WHERE a.character_id = ? AND a.media_type = ? ORDER BY a.position",
+                    (character_id, media_type))}
+
+    def _write_animeography(self, cursor, resource_type, resource_id, animeography):
+        self._write_appearances(cursor, resource_id, 'anime', animeography)
+
+    def _read_animeography(self, session, resource_type, resource_id):
+        return self._read_appearances(session, resource_id, 'anime')
+
+    def _write_mangaography(self, cursor, resource_type, resource_id, mangaography):
+        self._write_appearances(cursor, resource_id, 'manga', mangaography)
+
+    def _read_mangaography(self, session, resource_type, resource_id):
+        return self._read_appearances(session, resource_id, 'manga')
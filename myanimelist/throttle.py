@@ -0,0 +1,78 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+
+class RateLimiter(object):
+    """A thread-safe token bucket that spaces out requests to MAL.
+    """
+
+    def __init__(self, rate, burst=1):
+        """Creates a new instance of RateLimiter.
+
+        :type rate: float
+        :param rate: Number of requests allowed per second, on average.
+
+        :type burst: int
+        :param burst: Number of requests that may be made back-to-back after an idle period.
+
+        :rtype: :class:`.RateLimiter`
+        :return: The desired rate limiter.
+
+        """
+        self.rate = float(rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Takes tokens from the bucket if they are available right now.
+
+        :type tokens: int
+        :param tokens: Number of tokens to take.
+
+        :rtype: bool
+        :return: Whether the tokens were taken.
+
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """Takes tokens from the bucket, blocking until they are available.
+
+        :type tokens: int
+        :param tokens: Number of tokens to take.
+
+        :rtype: float
+        :return: Number of seconds spent waiting.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # reserve the tokens now, so concurrent callers queue up behind each other.
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
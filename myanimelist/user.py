@@ -5,7 +5,7 @@ import re
 import urllib.request, urllib.parse, urllib.error
 
 from . import utilities
-from .base import Base, MalformedPageError, InvalidBaseError, loadable
+from .base import Base, MalformedPageError, InvalidBaseError, loadable, loader
 
 
 class MalformedUserPageError(MalformedPageError):
@@ -40,8 +40,8 @@ class User(Base):
         :rtype: str
         :return: The given user's username.
         """
-        comments_page = session.session.get(
-                'http://myanimelist.net/comments.php?' + urllib.parse.urlencode({'id': int(user_id)})).text
+        comments_page = session.fetch(
+                'http://myanimelist.net/comments.php?' + urllib.parse.urlencode({'id': int(user_id)}))
         comments_page = utilities.get_clean_dom(comments_page)
         username_elt = comments_page.find('.//h1')
         if "'s Comments" not in username_elt.text:
@@ -634,6 +634,7 @@ class User(Base):
 
         return user_info
 
+    @loader
     def load(self):
         """Fetches the MAL user page and sets the current user's attributes.
 
@@ -641,11 +642,12 @@ class User(Base):
         :return: Current user object.
 
         """
-        user_profile = self.session.session.get(
-                'http://myanimelist.net/profile/' + utilities.urlencode(self.username)).text
-        self.set(self.parse(utilities.get_clean_dom(user_profile)))
+        user_profile = self.session.fetch_dom(
+                'http://myanimelist.net/profile/' + utilities.urlencode(self.username))
+        self.set(self.parse(user_profile))
         return self
 
+    @loader
     def load_reviews(self):
         """Fetches the MAL user reviews page and sets the current user's reviews attributes.
 
@@ -657,11 +659,11 @@ class User(Base):
         # collect all reviews over all pages.
         review_collection = []
         while True:
-            user_reviews = self.session.session.get('http://myanimelist.net/profile/' + utilities.urlencode(
-                    self.username) + '/reviews/?' + urllib.parse.urlencode({'p': page})).text
+            user_reviews = self.session.fetch_dom('http://myanimelist.net/profile/' + utilities.urlencode(
+                    self.username) + '/reviews/?' + urllib.parse.urlencode({'p': page}))
             if user_reviews is None:
                 break
-            parse_result = self.parse_reviews(utilities.get_clean_dom(user_reviews))
+            parse_result = self.parse_reviews(user_reviews)
             if page == 0:
                 # only set attributes once the first time around.
                 self.set(parse_result)
@@ -676,6 +678,7 @@ class User(Base):
         })
         return self
 
+    @loader
     def load_recommendations(self):
         """Fetches the MAL user recommendations page and sets the current user's recommendations attributes.
 
@@ -683,11 +686,12 @@ class User(Base):
         :return: Current user object.
 
         """
-        user_recommendations = self.session.session.get(
-                'http://myanimelist.net/profile/' + utilities.urlencode(self.username) + '/recommendations').text
-        self.set(self.parse_recommendations(utilities.get_clean_dom(user_recommendations)))
+        user_recommendations = self.session.fetch_dom(
+                'http://myanimelist.net/profile/' + utilities.urlencode(self.username) + '/recommendations')
+        self.set(self.parse_recommendations(user_recommendations))
         return self
 
+    @loader
     def load_clubs(self):
         """Fetches the MAL user clubs page and sets the current user's clubs attributes.
 
@@ -695,11 +699,12 @@ class User(Base):
         :return: Current user object.
 
         """
-        user_clubs = self.session.session.get(
-                'http://myanimelist.net/profile/' + utilities.urlencode(self.username) + '/clubs').text
-        self.set(self.parse_clubs(utilities.get_clean_dom(user_clubs)))
+        user_clubs = self.session.fetch_dom(
+                'http://myanimelist.net/profile/' + utilities.urlencode(self.username) + '/clubs')
+        self.set(self.parse_clubs(user_clubs))
         return self
 
+    @loader
     def load_friends(self):
         """Fetches the MAL user friends page and sets the current user's friends attributes.
 
@@ -707,9 +712,9 @@ class User(Base):
         :return: Current user object.
 
         """
-        user_friends = self.session.session.get(
-                'http://myanimelist.net/profile/' + utilities.urlencode(self.username) + '/friends').text
-        self.set(self.parse_friends(utilities.get_clean_dom(user_friends)))
+        user_friends = self.session.fetch_dom(
+                'http://myanimelist.net/profile/' + utilities.urlencode(self.username) + '/friends')
+        self.set(self.parse_friends(user_friends))
         return self
 
     @property
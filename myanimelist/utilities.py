@@ -4,24 +4,35 @@ from lxml.cssselect import CSSSelector
 from lxml import html as ht
 from lxml import etree as et
 from lxml.html import HtmlElement
+import codecs
 import datetime
+import functools
 import re
+import threading
 import urllib.parse as urllib
 
 
+# begins with a literal, unlike the substitution it guards, so that it is searched for quickly.
+_UNOPENED_TD = re.compile(r'td class=(?<=\std class=)')
+
+
 def fix_bad_html(html):
     """
       Fixes for various DOM errors that MAL commits.
       Yes, I know this is a cardinal sin, but there's really no elegant way to fix this.
     """
     # on anime list pages, sometimes tds won't be properly opened.
-    html = re.sub(r'[\s]td class=', "<td class=", html)
+    # the substitutions below that begin with a character class scan pages slowly, so they only run where a cheap check
+    # finds the markup they fix.
+    if _UNOPENED_TD.search(html) is not None:
+        html = re.sub(r'[\s]td class=', "<td class=", html)
 
     # on anime list pages, if the user doesn't specify progress, MAL will try to close a span it didn't open.
     def anime_list_closing_span(match):
         return match.group('count') + '/' + match.group('total') + '</td>'
 
-    html = re.sub(r'(?P<count>[0-9\-]+)</span>/(?P<total>[0-9\-]+)</a></span></td>', anime_list_closing_span, html)
+    if '</span>/' in html:
+        html = re.sub(r'(?P<count>[0-9\-]+)</span>/(?P<total>[0-9\-]+)</a></span></td>', anime_list_closing_span, html)
 
     # on anime info pages, under rating, there's an extra </div> by the "licensing company" note.
     html = html.replace('<small>L</small></sup><small> represents licensing company</small></div>',
@@ -47,11 +58,150 @@ def fix_bad_html(html):
     return html
 
 
-def get_clean_dom(html):
+_CONTENT_START = re.compile(r'<div\b[^>]*\bid\s*=\s*["\']?contentWrapper\b', re.I)
+
+# div tags, plus comments and scripts whose text may contain div tags that don't count.
+_CONTENT_TOKENS = re.compile(r'<!--.*?-->|<script\b.*?</script\s*>|<(/?)div\b', re.I | re.S)
+
+# markup the parsers look for within the region, e.g. section headers, which must not be left after its end.
+_CONTENT_MARKERS = re.compile(r'<h2\b', re.I)
+
+# the start of a tag, up to a position inside its class attribute.
+_IN_CLASS_ATTRIBUTE = re.compile(r'<[^<>]*\bclass\s*=\s*["\']?[^"\'<>=]*$', re.I)
+
+
+def _has_error_notice(html, start, end):
+    # an element whose class mentions an error, as looked for by the parsers' page validation. a case-insensitive
+    # regex alternation scans pages far slower than str.find does.
+    lowered = html[start:end].lower()
+    for word in ('error', 'badresult'):
+        position = lowered.find(word)
+        while position != -1:
+            tag_start = lowered.rfind('<', 0, position)
+            if tag_start != -1 and _IN_CLASS_ATTRIBUTE.match(lowered, tag_start, position) is not None:
+                return True
+            position = lowered.find(word, position + 1)
+    return False
+
+
+def slice_content(html):
+    """
+      Given raw HTML from a MAL page, return just its #contentWrapper div, wrapped in html and body tags, so that the
+      header, menus, scripts and footer around it are never parsed.
+      The whole page is returned if the region can't be delimited, if an error notice lies outside of it, or if
+      section headers follow it, as when a stray closing div tag ends it early.
+    """
+    start_match = _CONTENT_START.search(html)
+    if start_match is None:
+        return html
+    start = start_match.start()
+    end = None
+    depth = 0
+    for token in _CONTENT_TOKENS.finditer(html, start):
+        if token.group(1) is None:
+            continue
+        depth += -1 if token.group(1) else 1
+        if depth == 0:
+            end = html.find('>', token.end()) + 1
+            break
+    if not end:
+        return html
+    # pages reporting an invalid resource must still be recognised as such.
+    if _has_error_notice(html, 0, start) or _has_error_notice(html, end, len(html)):
+        return html
+    if _CONTENT_MARKERS.search(html, end) is not None:
+        return html
+    return '<html><body>' + html[start:end] + '</body></html>'
+
+
+# lxml parsers may be reused for any number of documents, but not by several threads at once.
+_parsers = threading.local()
+
+
+def html_parser():
+    """
+      Returns this thread's parser for MAL pages. Comments and processing instructions, which no parser reads, are
+      dropped; nothing is fetched over the network; ids aren't collected into a lookup table; and very large pages are
+      accepted.
+    """
+    parser = getattr(_parsers, 'html', None)
+    if parser is None:
+        parser = _parsers.html = ht.HTMLParser(remove_comments=True, remove_pis=True, no_network=True,
+                                               collect_ids=False, huge_tree=True)
+    return parser
+
+
+def xml_parser():
+    """
+      Returns this thread's parser for MAL's XML lists, configured as html_parser is, and without resolving entities.
+    """
+    parser = getattr(_parsers, 'xml', None)
+    if parser is None:
+        parser = _parsers.xml = et.XMLParser(remove_comments=True, remove_pis=True, no_network=True,
+                                             collect_ids=False, huge_tree=True, resolve_entities=False)
+    return parser
+
+
+def get_clean_dom(html, content_only=False):
     """
       Given raw HTML from a MAL page, return a lxml.objectify object with cleaned HTML.
+      If content_only is set, only the page's #contentWrapper region is parsed; see slice_content.
+    """
+    html = fix_bad_html(html)
+    if content_only:
+        html = slice_content(html)
+    return ht.fromstring(html, parser=html_parser())
+
+
+# characters held back from the parser while streaming, so that fix_bad_html sees any markup it fixes in one piece.
+_FEED_WINDOW = 8192
+
+
+# the longest text a marker given to feed_clean_dom may match, for markers split across chunks to be found.
+_MARKER_SPAN = 256
+
+
+def feed_clean_dom(chunks, encoding='utf-8', until=None):
     """
-    return ht.fromstring(fix_bad_html(html))
+      Given the raw HTML of a MAL page as an iterable of byte chunks, e.g. a streamed response body, return the same
+      object get_clean_dom would, parsing each chunk as it arrives rather than once the whole page has.
+      The whole page is parsed, as there's no knowing where its #contentWrapper region ends until it has arrived.
+      If until is given, a list of compiled patterns, no more chunks are read once each of them has been found, and the
+      page received so far is parsed, with its open elements closed.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    parser = html_parser()
+    pending = u''
+    awaited = list(until) if until is not None else None
+    recent = u''
+    try:
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+            pending += text
+            if awaited is not None:
+                searched = recent + text
+                awaited = [marker for marker in awaited if marker.search(searched) is None]
+                if not awaited:
+                    break
+                recent = searched[-_MARKER_SPAN:]
+            if len(pending) >= 2 * _FEED_WINDOW:
+                head, tail = pending[:-_FEED_WINDOW], pending[-_FEED_WINDOW:]
+                fixed_head = fix_bad_html(head)
+                # text is only handed over once no fix spans its end. fixes can't be applied twice, as some would apply
+                # to their own output, so the held back text is kept as it arrived.
+                if fix_bad_html(pending) == fixed_head + fix_bad_html(tail):
+                    parser.feed(fixed_head)
+                    pending = tail
+        pending += decoder.decode(b'', final=True)
+        parser.feed(fix_bad_html(pending))
+    except:
+        # the parser is reused, so the partial document mustn't be left in it.
+        try:
+            parser.close()
+        except et.LxmlError:
+            pass
+        raise
+    return parser.close()
 
 
 def urlencode(url):
@@ -65,6 +215,55 @@ def extract_tags(tags):
     list(map(lambda x: x.extract(), tags))
 
 
+_RELATIVE_DATE = re.compile(r'(?P<count>[0-9]+) (?P<unit>second|minute|hour)(s)? ago'
+                            r'|(?P<day>Today|Yesterday), (?P<hour>[0-9]+):(?P<minute>[0-9]+) (?P<am>[APM]+)')
+
+# absolute date formats, in the order they are tried, and whether each one yields a date rather than a datetime.
+# a format can only match text with the same (letters, '-', ',', ':') signature, so each signature gets the formats
+# that may match it and a single strptime call usually suffices.
+_ABSOLUTE_DATE_FORMATS = [
+    ('%m-%d-%y, %I:%M %p', False),
+    ('%m-%d-%y', True),
+    ('%Y-%m-%d', True),
+    ('%Y-%m-00', True),
+    ('%Y-00-00', True),
+    ('%B %d, %Y', True),
+    ('%b %d, %Y', True),
+    ('%Y', True),
+    ('%b %d, %Y %I:%M %p', False),
+    ('%b %d, %I:%M %p', False),
+    ('%b %Y', False),
+]
+
+
+def _date_signature(text):
+    return any(c.isalpha() for c in text), '-' in text, ',' in text, ':' in text
+
+
+def _date_candidates(formats):
+    # groups (format, is_date) pairs by the signature of the text each format matches, keeping their order.
+    candidates = {}
+    for date_format, is_date in formats:
+        # month names and AM/PM match letters; every other directive matches digits.
+        example = re.sub(r'%\w', '0', re.sub(r'%[bBp]', 'a', date_format))
+        candidates.setdefault(_date_signature(example), []).append((date_format, is_date))
+    return candidates
+
+
+_ABSOLUTE_DATE_CANDIDATES = _date_candidates(_ABSOLUTE_DATE_FORMATS)
+
+
+@functools.lru_cache(maxsize=16384)
+def _parse_absolute_date(text):
+    for date_format, is_date in _ABSOLUTE_DATE_CANDIDATES.get(_date_signature(text), ()):
+        try:
+            parsed = datetime.datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+        return parsed.date() if is_date else parsed
+    return None
+
+
 def parse_profile_date(text, suppress=False):
     """
       Parses a MAL date on a profile page.
@@ -78,111 +277,42 @@ def parse_profile_date(text, suppress=False):
         if text == "Now":
             return datetime.datetime.now()
 
-        seconds_match = re.match(r'(?P<seconds>[0-9]+) second(s)? ago', text)
-        if seconds_match:
-            return datetime.datetime.now() - datetime.timedelta(seconds=int(seconds_match.group('seconds')))
-
-        minutes_match = re.match(r'(?P<minutes>[0-9]+) minute(s)? ago', text)
-        if minutes_match:
-            return datetime.datetime.now() - datetime.timedelta(minutes=int(minutes_match.group('minutes')))
-
-        hours_match = re.match(r'(?P<hours>[0-9]+) hour(s)? ago', text)
-        if hours_match:
-            return datetime.datetime.now() - datetime.timedelta(hours=int(hours_match.group('hours')))
-
-        today_match = re.match(r'Today, (?P<hour>[0-9]+):(?P<minute>[0-9]+) (?P<am>[APM]+)', text)
-        if today_match:
-            hour = int(today_match.group('hour'))
-            minute = int(today_match.group('minute'))
-            am = today_match.group('am')
-            if am == 'PM' and hour < 12:
-                hour += 12
-            today = datetime.date.today()
-            return datetime.datetime(year=today.year, month=today.month, day=today.day, hour=hour, minute=minute,
-                                     second=0)
-
-        yesterday_match = re.match(r'Yesterday, (?P<hour>[0-9]+):(?P<minute>[0-9]+) (?P<am>[APM]+)', text)
-        if yesterday_match:
-            hour = int(yesterday_match.group('hour'))
-            minute = int(yesterday_match.group('minute'))
-            am = yesterday_match.group('am')
-            if am == 'PM' and hour < 12:
+        relative_match = _RELATIVE_DATE.match(text)
+        if relative_match:
+            if relative_match.group('unit'):
+                ago = datetime.timedelta(**{relative_match.group('unit') + 's': int(relative_match.group('count'))})
+                return datetime.datetime.now() - ago
+            hour = int(relative_match.group('hour'))
+            minute = int(relative_match.group('minute'))
+            if relative_match.group('am') == 'PM' and hour < 12:
                 hour += 12
-            yesterday = datetime.date.today() - datetime.timedelta(days=1)
-            return datetime.datetime(year=yesterday.year, month=yesterday.month, day=yesterday.day, hour=hour,
-                                     minute=minute, second=0)
+            day = datetime.date.today()
+            if relative_match.group('day') == 'Yesterday':
+                day -= datetime.timedelta(days=1)
+            return datetime.datetime(year=day.year, month=day.month, day=day.day, hour=hour, minute=minute, second=0)
 
-        try:
-            return datetime.datetime.strptime(text, '%m-%d-%y, %I:%M %p')
-        except ValueError:
-            pass
-        # see if it's a date.
-        try:
-            return datetime.datetime.strptime(text, '%m-%d-%y').date()
-        except ValueError:
-            pass
-        try:
-            return datetime.datetime.strptime(text, '%Y-%m-%d').date()
-        except ValueError:
-            pass
-        try:
-            return datetime.datetime.strptime(text, '%Y-%m-00').date()
-        except ValueError:
-            pass
-        try:
-            return datetime.datetime.strptime(text, '%Y-00-00').date()
-        except ValueError:
-            pass
-        try:
-            return datetime.datetime.strptime(text, '%B %d, %Y').date()
-        except ValueError:
-            pass
-        try:
-            return datetime.datetime.strptime(text, '%b %d, %Y').date()
-        except ValueError:
-            pass
-        try:
-            return datetime.datetime.strptime(text, '%Y').date()
-        except ValueError:
-            pass
-        try:
-            return datetime.datetime.strptime(text, '%b %d, %Y').date()
-        except ValueError:
-            pass
-        try:
-            return datetime.datetime.strptime(text, "%b %d, %Y %I:%M %p")
-        except ValueError:
-            pass
-        parsed_date = None
-        try:
-            parsed_date = datetime.datetime.strptime(text, '%b %d, %I:%M %p')
-        except ValueError:
-            try:
-                parsed_date = datetime.datetime.strptime(text, '%b %d, %Y %I:%M %p')
-            except ValueError: # if the user don't display his birthday year, it never work.
-                try:
-                    parsed_date = datetime.datetime.strptime(text, '%b %Y')
-                except ValueError:
-                    parsed_date = None
-        # see if it's a month/year pairing.
-        return parsed_date if parsed_date is not None else None
+        return _parse_absolute_date(text)
     except:
         if suppress:
             return None
         raise
 
 
+# translating a CSS selector to XPath and compiling it costs far more than running it, so each selector is compiled once.
+_compiled_selector = functools.lru_cache(maxsize=None)(CSSSelector)
+
+
 def css_select(selector_str, element):
     if not isinstance(element, et.ElementBase):
         raise TypeError("css_select_first - the element argument (1) is not a subtype of lxml.etree.ElementBase")
-    selector = CSSSelector(selector_str)
+    selector = _compiled_selector(selector_str)
     return selector(element)
 
 
 def css_select_first(selector_str, element):
     if not isinstance(element, et.ElementBase):
         raise TypeError("css_select_first - the element argument (1) is not a subtype of lxml.etree.ElementBase")
-    selector = CSSSelector(selector_str)
+    selector = _compiled_selector(selector_str)
     results = selector(element)
     return results[0] if len(results) >= 1 else None
 
@@ -22,6 +22,7 @@ config = {
   'author_email': 'contact@pushrbx.net',
   'version': '0.2.14',
   'install_requires': ['urllib3>=1.21.1,<1.23', 'requests<=2.18.4', 'pytz', 'lxml', 'cssselect'],
+  'extras_require': {'snapshot': ['msgpack']},
   'tests_require': ['nose'],
   'packages': ['myanimelist']
 }
@@ -0,0 +1,81 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import anime
+    from myanimelist import session
+    from myanimelist import utilities
+else:
+    try:
+        from ..myanimelist import anime
+        from ..myanimelist import session
+        from ..myanimelist import utilities
+    except:
+        from myanimelist import anime
+        from myanimelist import session
+        from myanimelist import utilities
+
+CHARACTER_TABLE = u"""
+<table><tr>
+  <td><img/></td>
+  <td><a href="/character/{id}/X">Char, {id}</a><div><small>{role}</small></div></td>
+  <td><table>
+    <tr></tr>
+    <tr><td><a href="https://myanimelist.net/people/{va}/Y">Actor, {va}</a><br/><small>Japanese</small></td></tr>
+  </table></td>
+</tr></table>
+"""
+
+STAFF_TABLE = u"""
+<table><tr><td><img/></td><td><a href="/people/{id}/Z">Staff, {id}</a><div><small>{roles}</small></div></td></tr></table>
+"""
+
+
+def characters_page(characters, staff):
+    return utilities.get_clean_dom(u"<html><body><div id='contentWrapper'><h1>Cowboy Bebop</h1><h2>Characters &amp; Voice Actors</h2>" +
+                                   u"".join(CHARACTER_TABLE.format(id=i, role=role, va=va) for i, role, va in characters) +
+                                   u"<br/><h2>Staff</h2>" +
+                                   u"".join(STAFF_TABLE.format(id=i, roles=roles) for i, roles in staff) +
+                                   u"</div></body></html>")
+
+
+class testAnimeCharactersClass(object):
+    @classmethod
+    def setUpClass(self):
+        self.session = session.Session()
+        self.anime = anime.Anime(self.session, 1)
+        self.page = characters_page([(1, u'Main', 11), (2, u'Supporting', 11), (3, u'Main', 12)],
+                                    [(1870, u'Director, Storyboard'), (1871, u'Music')])
+
+    def testIterCharacters(self):
+        entries = list(self.anime.iter_characters(self.page))
+        assert [entry['character'] for entry in entries] == [self.session.character(i) for i in (1, 2, 3)]
+        assert entries[0]['character'].field('name') == u'1 Char'
+        assert entries[1]['role'] == u'Supporting'
+        assert entries[2]['voice_actors'] == {self.session.person(12): u'Japanese'}
+
+    def testIterVoiceActors(self):
+        roles = [(role['person'].id, role['character'].id) for role in self.anime.iter_voice_actors(self.page)]
+        assert roles == [(11, 1), (11, 2), (12, 3)]
+
+    def testIterStaff(self):
+        assert list(self.anime.iter_staff(self.page)) == [(self.session.person(1870), {u'Director', u'Storyboard'}),
+                                                          (self.session.person(1871), {u'Music'})]
+
+    def testIterIsLazy(self):
+        characters = self.anime.iter_characters(self.page)
+        assert next(characters)['character'] == self.session.character(1)
+        characters.close()
+
+    def testParseCharacters(self):
+        sidebarless_session = session.Session()
+        # the fixture has no sidebar; only the character sections are checked here.
+        sidebarless_session.suppress_parse_exceptions = True
+        info = anime.Anime(sidebarless_session, 1).parse_characters(self.page)
+        assert info['characters'][self.session.character(2)] == {
+            'role': u'Supporting', 'voice_actors': {self.session.person(11): u'Japanese'}}
+        assert [role['character'].id for role in info['voice_actors'][self.session.person(11)]] == [1, 2]
+        assert info['staff'][self.session.person(1871)] == {u'Music'}
@@ -0,0 +1,140 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import breaker
+    from myanimelist import deadline
+    from myanimelist import session
+else:
+    try:
+        from ..myanimelist import breaker
+        from ..myanimelist import deadline
+        from ..myanimelist import session
+    except:
+        from myanimelist import breaker
+        from myanimelist import deadline
+        from myanimelist import session
+
+
+class OutageHandler(BaseHTTPRequestHandler):
+    """Answers with a server error while the server is down, and with a page otherwise.
+    """
+    down = True
+    hits = 0
+
+    def do_GET(self):
+        OutageHandler.hits += 1
+        body = b'<html><body><p>up</p></body></html>'
+        self.send_response(503 if self.down else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class testCircuitBreakerClass(object):
+    def setUp(self):
+        self.breaker = breaker.CircuitBreaker(u'pages', window=4, min_requests=4, reset_timeout=0.05)
+
+    def fail(self, times):
+        for _ in range(times):
+            self.breaker.record(self.breaker.allow(u'url'), failed=True)
+
+    def testOpensAfterFailures(self):
+        self.fail(3)
+        assert self.breaker.state == breaker.CLOSED
+        self.fail(1)
+        assert self.breaker.state == breaker.OPEN and self.breaker.trips == 1
+        assert_raises(breaker.CircuitOpenError, self.breaker.allow, u'url')
+        assert 0 < self.breaker.retry_after() <= 0.05
+
+    def testOpensAfterSlowRequests(self):
+        for _ in range(4):
+            self.breaker.record(self.breaker.allow(u'url'), failed=False, latency=20)
+        assert self.breaker.state == breaker.OPEN
+
+    def testHalfOpenProbe(self):
+        self.fail(4)
+        time.sleep(0.06)
+        assert self.breaker.state == breaker.HALF_OPEN
+        probe = self.breaker.allow(u'url')
+        assert probe
+        # only one probe at a time.
+        assert_raises(breaker.CircuitOpenError, self.breaker.allow, u'url')
+        self.breaker.record(probe, failed=False, latency=0.01)
+        assert self.breaker.state == breaker.CLOSED
+        assert not self.breaker.allow(u'url')
+
+    def testFailedProbeReopens(self):
+        self.fail(4)
+        time.sleep(0.06)
+        self.breaker.record(self.breaker.allow(u'url'), failed=True)
+        assert self.breaker.state == breaker.OPEN and self.breaker.trips == 2
+
+    def testReleasedProbe(self):
+        self.fail(4)
+        time.sleep(0.06)
+        self.breaker.release(self.breaker.allow(u'url'))
+        assert self.breaker.allow(u'url')
+
+    def testFamilies(self):
+        breakers = breaker.CircuitBreakers()
+        assert breakers.family(u'https://myanimelist.net/malappinfo.php?u=shaldengeki') == u'malappinfo'
+        assert breakers.family(u'http://myanimelist.net/profile/shaldengeki/clubs') == u'profiles'
+        assert breakers.family(u'https://myanimelist.net/anime/1/Cowboy_Bebop') == u'pages'
+        assert breakers.states() == {u'malappinfo': breaker.CLOSED, u'profiles': breaker.CLOSED,
+                                     u'pages': breaker.CLOSED}
+
+
+class testSessionCircuitBreakersClass(object):
+    @classmethod
+    def setUpClass(self):
+        self.server = ThreadingServer(('127.0.0.1', 0), OutageHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.url = 'http://127.0.0.1:%d' % self.server.server_port
+
+    @classmethod
+    def tearDownClass(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def testOutage(self):
+        OutageHandler.down, OutageHandler.hits = True, 0
+        breakers = breaker.CircuitBreakers(min_requests=3, reset_timeout=0.1)
+        guarded = session.Session(circuit_breakers=breakers)
+        for _ in range(3):
+            guarded.fetch(self.url + '/anime/1')
+        assert breakers.states()[u'pages'] == breaker.OPEN
+        assert_raises(breaker.CircuitOpenError, guarded.fetch, self.url + '/anime/1')
+        assert OutageHandler.hits == 3
+        # other families are unaffected.
+        guarded.fetch(self.url + '/profile/shaldengeki')
+        assert OutageHandler.hits == 4
+
+        OutageHandler.down = False
+        time.sleep(0.11)
+        assert u'up' in guarded.fetch(self.url + '/anime/1')
+        assert breakers.states()[u'pages'] == breaker.CLOSED
+
+    def testCancelledRequestsDontCount(self):
+        OutageHandler.down = True
+        breakers = breaker.CircuitBreakers(min_requests=1)
+        guarded = session.Session(circuit_breakers=breakers)
+        with guarded.within(deadline.Deadline().cancel()):
+            assert_raises(deadline.RequestCancelledError, guarded.fetch, self.url + '/anime/1')
+        assert breakers.states()[u'pages'] == breaker.CLOSED
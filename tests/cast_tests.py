@@ -0,0 +1,121 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import shutil
+import tempfile
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import base
+    from myanimelist import cast
+    from myanimelist import session
+else:
+    try:
+        from ..myanimelist import base
+        from ..myanimelist import cast
+        from ..myanimelist import session
+    except:
+        from myanimelist import base
+        from myanimelist import cast
+        from myanimelist import session
+
+# anime 1 and 2 share person 100, who voices character 10 in Japanese and character 20 in both languages.
+CHARACTERS = {
+    1: {10: (u'Main', {100: u'Japanese', 101: u'English'}), 11: (u'Supporting', {102: u'Japanese'})},
+    2: {20: (u'Main', {100: u'Japanese', 103: u'English'})},
+}
+
+
+class FakeAnime(base.Base):
+    _resource_type = 'anime'
+
+    def __init__(self, session, anime_id):
+        super(FakeAnime, self).__init__(session)
+        self.id = anime_id
+        self._characters = None
+
+    def load(self):
+        pass
+
+    @base.loader
+    def load_characters(self):
+        self.set({'title': u'Anime %d' % self.id, 'characters': {
+            self.session.character(character_id).set({'name': u'Character %d' % character_id}): {
+                'role': role,
+                'voice_actors': {self.session.person(person_id): language for person_id, language in people.items()}
+            } for character_id, (role, people) in CHARACTERS[self.id].items()}})
+
+
+class FakeCharacter(base.Base):
+    _resource_type = 'character'
+
+    def __init__(self, session, character_id):
+        super(FakeCharacter, self).__init__(session)
+        self.id = character_id
+
+    @base.loader
+    def load(self):
+        self.set({'name': u'Character %d' % self.id,
+                  'animeography': {self.session.anime(2): u'Main', self.session.anime(3): u'Supporting'},
+                  'mangaography': {self.session.manga(5): u'Main'},
+                  'voice_actors': {self.session.person(100): u'English', self.session.person(104): u'German'}})
+
+
+class testCastIndexClass(object):
+    def setUp(self):
+        self.session = session.Session()
+        self.index = cast.CastIndex().listen(self.session)
+        FakeAnime(self.session, 1).load_characters()
+        FakeAnime(self.session, 2).load_characters()
+
+    def testListens(self):
+        assert len(self.index) == 5
+        assert self.index.name(('character', 10)) == u'Character 10'
+        assert self.index.name(('anime', 2)) == u'Anime 2'
+        assert self.index.cast(('anime', 1)) == {('character', 10): u'Main', ('character', 11): u'Supporting'}
+        FakeAnime(self.session, 1).load()
+        assert len(self.index) == 5
+
+    def testRoles(self):
+        assert self.index.roles(('person', 100)) == [
+            {'character': ('character', 10), 'media': ('anime', 1), 'language': u'Japanese', 'role': u'Main'},
+            {'character': ('character', 20), 'media': ('anime', 2), 'language': u'Japanese', 'role': u'Main'},
+        ]
+        assert self.index.roles(self.session.person(999)) == []
+
+    def testSharedVoiceActors(self):
+        assert self.index.shared_voice_actors(('anime', 1), self.session.anime(2)) == {('person', 100)}
+        assert self.index.shared_voice_actors(('anime', 1), ('anime', 9)) == set()
+        assert self.index.voice_actors(('anime', 2)) == {('person', 100), ('person', 103)}
+
+    def testCharactersVoiced(self):
+        assert self.index.characters_voiced(('person', 100)) == {('character', 10), ('character', 20)}
+        assert self.index.characters_voiced(('person', 100), u'Japanese') == {('character', 10), ('character', 20)}
+        assert self.index.characters_voiced(('person', 100), u'English') == set()
+        assert self.index.characters_voiced(('person', 101), u'English') == {('character', 10)}
+
+    def testCharacterPage(self):
+        FakeCharacter(self.session, 20).load()
+        assert self.index.appearances(('character', 20)) == {('anime', 2): u'Main', ('anime', 3): u'Supporting',
+                                                             ('manga', 5): u'Main'}
+        assert self.index.characters_voiced(('person', 100), u'English') == {('character', 20)}
+        # the character's page doesn't say which media a role is in, so the media's own page wins.
+        assert [(role['character'], role['media']) for role in self.index.roles(('person', 100))] == [
+            (('character', 10), ('anime', 1)), (('character', 20), ('anime', 2))]
+        assert self.index.roles(('person', 104)) == [
+            {'character': ('character', 20), 'media': None, 'language': u'German', 'role': None}]
+
+    def testSaveLoad(self):
+        FakeCharacter(self.session, 20).load()
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'cast.json')
+            self.index.save(path)
+            loaded = cast.CastIndex.load(path)
+        finally:
+            shutil.rmtree(directory)
+        assert loaded.to_dict() == cast.CastIndex.from_dict(self.index.to_dict()).to_dict()
+        assert loaded.roles(('person', 104)) == self.index.roles(('person', 104))
+        assert loaded.shared_voice_actors(('anime', 1), ('anime', 2)) == {('person', 100)}
+        assert loaded.name(('anime', 3)) == self.index.name(('anime', 3))
@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import shutil
+import tempfile
+import threading
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import base
+    from myanimelist import breaker
+    from myanimelist import crawler
+    from myanimelist import session
+else:
+    try:
+        from ..myanimelist import base
+        from ..myanimelist import breaker
+        from ..myanimelist import crawler
+        from ..myanimelist import session
+    except:
+        from myanimelist import base
+        from myanimelist import breaker
+        from myanimelist import crawler
+        from myanimelist import session
+
+LINKS = {1: [2, 3], 2: [3, 4, 99], 3: [], 4: [1], 99: []}
+
+
+class Node(base.Base):
+    def __init__(self, session, node_id):
+        super(Node, self).__init__(session)
+        self.id = node_id
+        self._links = None
+
+    def load(self):
+        if self.id == 99:
+            raise base.InvalidBaseError(self.id)
+        self.session.loaded.append(self.id)
+        self.set({'links': [self.session.node(link) for link in LINKS[self.id]]})
+
+
+class NodeSession(session.Session):
+    def __init__(self):
+        super(NodeSession, self).__init__()
+        self.loaded = []
+
+    def node(self, node_id):
+        return Node(self, node_id)
+
+
+def expand(resource, task):
+    for reference in resource.references():
+        yield ('node', reference.id, 'load', task[3] + 1)
+
+
+class testCrawlerClass(object):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'frontier.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testFrontierDeduplicates(self):
+        frontier = crawler.Frontier()
+        frontier.add('anime', 1)
+        frontier.add('anime', 1)
+        frontier.add('anime', 1, 'load_stats')
+        assert frontier.counts()['pending'] == 2
+
+    def testFrontierPriority(self):
+        frontier = crawler.Frontier()
+        frontier.add('anime', 1, priority=5)
+        frontier.add('anime', 2, priority=1)
+        frontier.add('anime', 1, priority=0)
+        assert [task[1] for task in frontier.claim(2)] == [1, 2]
+
+    def testFrontierRecover(self):
+        frontier = crawler.Frontier()
+        frontier.add('anime', 1)
+        frontier.claim()
+        assert frontier.counts()['running'] == 1
+        assert frontier.recover() == 1
+        assert frontier.counts()['pending'] == 1
+
+    def testCrawl(self):
+        node_session = NodeSession()
+        stats = crawler.Crawler(node_session, expand=expand).seed('node', 1).run()
+        assert sorted(node_session.loaded) == [1, 2, 3, 4]
+        assert stats == {'completed': 4, 'failed': 1, 'deferred': 0}
+
+    def testOutageDefersTasks(self):
+        class OutageNode(Node):
+            def load(self):
+                if self.session.outages:
+                    self.session.outages -= 1
+                    raise breaker.CircuitOpenError(u'https://myanimelist.net/node/1', u'pages', 0.05)
+                super(OutageNode, self).load()
+
+        node_session = NodeSession()
+        node_session.outages = 2
+        node_session.node = lambda node_id: OutageNode(node_session, node_id)
+        stats = crawler.Crawler(node_session, concurrency=1, expand=expand, max_attempts=1).seed('node', 1).run()
+        # turned-away tasks are retried regardless of max_attempts.
+        assert stats == {'completed': 4, 'failed': 1, 'deferred': 2}
+
+    def testResume(self):
+        first_session = NodeSession()
+        crawler.Crawler(first_session, crawler.Frontier(self.path), concurrency=1, expand=expand).seed('node', 1).run(
+            limit=2)
+        assert first_session.loaded == [1, 2]
+
+        second_session = NodeSession()
+        frontier = crawler.Frontier(self.path)
+        crawler.Crawler(second_session, frontier, expand=expand).run()
+        assert sorted(second_session.loaded) == [3, 4]
+        assert frontier.counts() == {'pending': 0, 'running': 0, 'done': 4, 'failed': 1}
+
+    def testShardOf(self):
+        shards = [crawler.shard_of('anime', anime_id, 4) for anime_id in range(1000)]
+        assert set(shards) == {0, 1, 2, 3}
+        # growing the number of shards only moves resources into the new shard.
+        assert all(crawler.shard_of('anime', anime_id, 5) in (shard, 4) for anime_id, shard in enumerate(shards))
+
+    def testReshard(self):
+        frontier = crawler.Frontier(self.path, num_shards=2)
+        for node_id in LINKS:
+            frontier.add('node', node_id)
+        assert crawler.Frontier(self.path).num_shards == 2
+        frontier = crawler.Frontier(self.path, num_shards=3)
+        claimed = [frontier.claim(10, shard=shard) for shard in range(3)]
+        assert sorted(task[1] for tasks in claimed for task in tasks) == sorted(LINKS)
+        assert all(crawler.shard_of('node', task[1], 3) == shard for shard, tasks in enumerate(claimed) for task in tasks)
+
+    def testExpiredLeaseReclaimed(self):
+        frontier = crawler.Frontier()
+        frontier.add('anime', 1)
+        frontier.claim(owner='dead', lease=-1)
+        assert frontier.active() == 0
+        assert frontier.claim(owner='alive', lease=60) == [('anime', 1, 'load', 0)]
+        assert frontier.recover() == 0
+        assert frontier.attempts(('anime', 1, 'load')) == 2
+
+    def testOrphanedShards(self):
+        frontier = crawler.Frontier(num_shards=3)
+        frontier.heartbeat('worker', 1, 60)
+        assert frontier.orphaned_shards(60) == [0, 2]
+        frontier.unregister('worker')
+        assert frontier.orphaned_shards(60) == [0, 1, 2]
+
+    def testWorkers(self):
+        crawler.Frontier(self.path, num_shards=2).add('node', 1)
+        sessions = [NodeSession(), NodeSession()]
+        workers = [crawler.Worker(node_session, crawler.Frontier(self.path), shard, expand=expand, adopt_orphans=False,
+                                  poll=0.01, rate=1000) for shard, node_session in enumerate(sessions)]
+        threads = [threading.Thread(target=worker.run) for worker in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(sessions[0].loaded + sessions[1].loaded) == [1, 2, 3, 4]
+        for shard, node_session in enumerate(sessions):
+            assert all(crawler.shard_of('node', node_id, 2) == shard for node_id in node_session.loaded)
+        assert crawler.Frontier(self.path).counts() == {'pending': 0, 'running': 0, 'done': 4, 'failed': 1}
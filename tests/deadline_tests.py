@@ -0,0 +1,163 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import deadline
+    from myanimelist import session
+else:
+    try:
+        from ..myanimelist import deadline
+        from ..myanimelist import session
+    except:
+        from myanimelist import deadline
+        from myanimelist import session
+
+
+class StallingHandler(BaseHTTPRequestHandler):
+    """Answers /wait/<seconds> after that many seconds, and /trickle with a page sent a little at a time.
+    """
+
+    def do_GET(self):
+        try:
+            if self.path.startswith('/wait/'):
+                time.sleep(float(self.path.split('/')[2]))
+                body = b'<html><body><p>waited</p></body></html>'
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            else:
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.end_headers()
+                self.wfile.write(b'<html><body>')
+                for _ in range(50):
+                    self.wfile.write(b'<p>' + b'x' * 20000 + b'</p>')
+                    self.wfile.flush()
+                    time.sleep(0.02)
+        except (IOError, OSError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class testDeadlineClass(object):
+    @classmethod
+    def setUpClass(self):
+        self.server = ThreadingServer(('127.0.0.1', 0), StallingHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.url = 'http://127.0.0.1:%d' % self.server.server_port
+
+    @classmethod
+    def tearDownClass(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def testReadTimeout(self):
+        impatient = session.Session(timeout=(1, 0.1))
+        assert_raises(deadline.RequestTimeoutError, impatient.fetch, self.url + '/wait/0.5')
+        try:
+            impatient.fetch(self.url + '/wait/0.5')
+        except deadline.RequestTimeoutError as e:
+            assert not isinstance(e, deadline.DeadlineExceededError) and e.url.endswith('/wait/0.5')
+        assert u'waited' in session.Session(timeout=(1, 1)).fetch(self.url + '/wait/0.01')
+
+    def testDeadlineSpansRequests(self):
+        patient = session.Session(timeout=(1, 5))
+        start = time.time()
+        with patient.within(0.3):
+            patient.fetch(self.url + '/wait/0.2')
+            # the second wait is cut short by the time left.
+            assert_raises(deadline.DeadlineExceededError, patient.fetch, self.url + '/wait/0.21')
+        assert time.time() - start < 0.5
+        assert not deadline.entered()
+
+    def testCancelledBeforeRequest(self):
+        patient = session.Session()
+        with patient.within(deadline.Deadline().cancel()):
+            assert_raises(deadline.RequestCancelledError, patient.fetch, self.url + '/wait/5')
+
+    def testCancelWhileStreaming(self):
+        streaming = session.Session(stream_pages=True)
+        scope = deadline.Deadline()
+        threading.Timer(0.1, scope.cancel).start()
+        start = time.time()
+        with streaming.within(scope):
+            assert_raises(deadline.RequestCancelledError, streaming.fetch_dom, self.url + '/trickle')
+        assert time.time() - start < 0.5
+
+    def testBind(self):
+        patient = session.Session()
+        scope = deadline.Deadline(10)
+        seen = []
+        with patient.within(scope):
+            bound = patient.bind(lambda: seen.append(deadline.entered()))
+        thread = threading.Thread(target=bound)
+        thread.start()
+        thread.join()
+        assert seen == [[scope]]
+
+    def fetch_alongside(self, url, first_scope, second_scope, stream_pages=False):
+        # the second thread asks for the url while the first one's request is in flight.
+        patient = session.Session(stream_pages=stream_pages)
+        outcomes = {}
+
+        def fetch(name, scope):
+            start = time.time()
+            try:
+                with patient.within(scope if scope is not None else deadline.Deadline()):
+                    outcomes[name] = patient.fetch(url) if not stream_pages else patient.fetch_dom(url).text_content()
+            except Exception as e:
+                outcomes[name] = e
+            outcomes[name + ' took'] = time.time() - start
+
+        first = threading.Thread(target=fetch, args=('first', first_scope))
+        second = threading.Thread(target=fetch, args=('second', second_scope))
+        first.start()
+        time.sleep(0.05)
+        second.start()
+        first.join()
+        second.join()
+        return outcomes
+
+    def testSharedRequestOutlivesDeadline(self):
+        outcomes = self.fetch_alongside(self.url + '/wait/0.6', deadline.Deadline(0.2), None)
+        assert isinstance(outcomes['first'], deadline.DeadlineExceededError)
+        assert u'waited' in outcomes['second']
+
+    def testSharedRequestOutlivesCancellation(self):
+        scope = deadline.Deadline()
+        threading.Timer(0.1, scope.cancel).start()
+        # a streamed page, so that the cancellation is noticed while the response is read.
+        outcomes = self.fetch_alongside(self.url + '/wait/0.4', scope, None, stream_pages=True)
+        assert isinstance(outcomes['first'], deadline.RequestCancelledError)
+        assert u'waited' in outcomes['second']
+
+    def testWaitingOnSharedRequestWithinDeadline(self):
+        outcomes = self.fetch_alongside(self.url + '/wait/0.8', None, deadline.Deadline(0.2))
+        assert u'waited' in outcomes['first']
+        assert isinstance(outcomes['second'], deadline.DeadlineExceededError)
+        assert outcomes['second took'] < 0.4
+        assert outcomes['second'].url.endswith('/wait/0.8')
+
+    def testDeadlinePassingBeforeSend(self):
+        patient = session.Session()
+        scope = deadline.Deadline(10)
+        with patient.within(scope):
+            # as if the deadline passed between the request's first check and its timeout being computed.
+            scope.expires_at = time.monotonic() - 1
+            assert_raises(deadline.DeadlineExceededError, patient._send, 'get', self.url + '/wait/0')
@@ -0,0 +1,150 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import shutil
+import tempfile
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import anime
+    from myanimelist import base
+    from myanimelist import graph
+    from myanimelist import session
+else:
+    try:
+        from ..myanimelist import anime
+        from ..myanimelist import base
+        from ..myanimelist import graph
+        from ..myanimelist import session
+    except:
+        from myanimelist import anime
+        from myanimelist import base
+        from myanimelist import graph
+        from myanimelist import session
+
+# a small franchise: 1 -> 2 -> 3 in airing order, 4 is a side story of 2, and manga 10 was adapted into 1.
+RELATIONS = {
+    ('anime', 1): {u'Sequel': [('anime', 2)], u'Adaptation': [('manga', 10)]},
+    ('anime', 2): {u'Prequel': [('anime', 1)], u'Sequel': [('anime', 3)], u'Side story': [('anime', 4)]},
+    ('anime', 3): {u'Prequel': [('anime', 2)]},
+    ('anime', 4): {u'Parent story': [('anime', 2)]},
+    ('manga', 10): {u'Adaptation': [('anime', 1)]},
+}
+
+
+class FakeMedia(base.Base):
+    def __init__(self, session, resource_type, media_id):
+        super(FakeMedia, self).__init__(session)
+        self.id = media_id
+        self.resource_type = resource_type
+        self._related = None
+        self._title = None
+
+    @property
+    def _resource_type(self):
+        return self.resource_type
+
+    @base.loader
+    def load(self):
+        if (self.resource_type, self.id) not in RELATIONS:
+            raise anime.InvalidAnimeError(self.id)
+        self.session.loaded.append((self.resource_type, self.id))
+        self.set({'title': u'Media %d' % self.id, 'related': {
+            relation: [getattr(self.session, item[0])(item[1]) for item in items]
+            for relation, items in RELATIONS[(self.resource_type, self.id)].items()}})
+
+
+class FakeSession(session.Session):
+    def __init__(self):
+        super(FakeSession, self).__init__()
+        self.loaded = []
+
+    def anime(self, anime_id):
+        return FakeMedia(self, 'anime', anime_id)
+
+    def manga(self, manga_id):
+        return FakeMedia(self, 'manga', manga_id)
+
+
+def related_page(title, relation, related_id):
+    return u"<html><body><div id='contentWrapper'><h1><span>%s</span></h1><div id='content'><table><tr><td></td><td>" \
+           u"<h2>Synopsis</h2><span itemprop='description'>A synopsis.</span><h2>Background</h2>" \
+           u"<h2>Related Anime</h2><table class='anime_detail_related_anime'><tr><td>%s:</td><td>" \
+           u"<a href='/anime/%d/Other'>Other</a></td></tr></table><h2>Characters &amp; Voice Actors</h2>" \
+           u"</td></tr></table></div></div></body></html>" % (title, relation, related_id)
+
+
+class RelatedPageSession(session.Session):
+    PAGES = {
+        u'https://myanimelist.net/anime/1': related_page(u'First', u'Sequel', 2),
+        u'https://myanimelist.net/anime/2': related_page(u'Second', u'Prequel', 1),
+    }
+
+    def __init__(self):
+        super(RelatedPageSession, self).__init__()
+        # the pages only have a title and the sections below the sidebar.
+        self.suppress_parse_exceptions = True
+        self.urls = []
+
+    def _fetch(self, url):
+        self.urls.append(url)
+        return self.PAGES[url]
+
+    def _fetch_dom(self, url, until=None):
+        # the whole page, rather than the download stopping at the requested sections.
+        return self.fetch_dom(url)
+
+
+class testRelationGraphClass(object):
+    def setUp(self):
+        self.session = FakeSession()
+        self.graph = graph.RelationGraph().listen(self.session)
+
+    def testListens(self):
+        self.session.anime(2).load()
+        assert self.graph.expanded(('anime', 2)) and not self.graph.expanded(('anime', 1))
+        assert self.graph.title(('anime', 2)) == u'Media 2'
+        assert self.graph.relations(('anime', 2))[u'Sequel'] == [('anime', 3)]
+
+    def testFranchiseFetchesOnlyMissing(self):
+        self.session.anime(2).load()
+        franchise = self.graph.franchise(('anime', 2), self.session)
+        assert franchise == {('anime', 1), ('anime', 2), ('anime', 3), ('anime', 4), ('manga', 10)}
+        assert sorted(self.session.loaded) == [('anime', 1), ('anime', 2), ('anime', 3), ('anime', 4), ('manga', 10)]
+        # once indexed, the franchise is answered without fetching.
+        assert self.graph.franchise(('anime', 4), self.session) == franchise
+        assert len(self.session.loaded) == 5
+
+    def testFranchiseWithoutSession(self):
+        self.session.anime(1).load()
+        assert self.graph.franchise(('anime', 1)) == {('anime', 1), ('anime', 2), ('manga', 10)}
+
+    def testWatchOrder(self):
+        assert self.graph.watch_order(('anime', 3), self.session) == [('anime', 1), ('anime', 2), ('anime', 3)]
+
+    def testShortestPath(self):
+        path = self.graph.shortest_path(('anime', 4), ('manga', 10), self.session)
+        assert path == [(('anime', 4), u'Parent story', ('anime', 2)), (('anime', 2), u'Prequel', ('anime', 1)),
+                        (('anime', 1), u'Adaptation', ('manga', 10))]
+        assert self.graph.shortest_path(('anime', 1), ('anime', 99), self.session) is None
+
+    def testPersistence(self):
+        self.graph.franchise(('anime', 1), self.session)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'graph.json')
+            self.graph.save(path)
+            loaded = graph.RelationGraph.load(path)
+        finally:
+            shutil.rmtree(directory)
+        assert loaded.watch_order(('anime', 2)) == [('anime', 1), ('anime', 2), ('anime', 3)]
+        assert loaded.title(('anime', 4)) == u'Media 4'
+
+    def testPartialLoadIsNotIndexed(self):
+        pages = RelatedPageSession()
+        relation_graph = graph.RelationGraph().listen(pages)
+        anime.Anime(pages, 1).load(sections=('synopsis',))
+        assert not relation_graph.expanded(('anime', 1))
+        assert relation_graph.franchise(('anime', 1), pages) == {('anime', 1), ('anime', 2)}
+        assert relation_graph.relations(('anime', 1)) == {u'Sequel': [('anime', 2)]}
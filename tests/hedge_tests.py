@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import hedge
+    from myanimelist import session
+else:
+    try:
+        from ..myanimelist import hedge
+        from ..myanimelist import session
+    except:
+        from myanimelist import hedge
+        from myanimelist import session
+
+
+class FirstHitStallsHandler(BaseHTTPRequestHandler):
+    """Answers the first request for each path after a second, and later ones at once.
+    """
+    seen = set()
+    seen_lock = threading.Lock()
+
+    def do_GET(self):
+        with self.seen_lock:
+            first = self.path not in self.seen
+            self.seen.add(self.path)
+        if first:
+            time.sleep(1)
+        body = ('<html><body><p>%s</p></body></html>' % ('first' if first else 'hedge')).encode()
+        try:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (IOError, OSError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def seeded_policy(latency, samples=20):
+    policy = hedge.HedgePolicy(min_samples=samples)
+    for _ in range(samples):
+        policy.record(latency)
+    return policy
+
+
+class testHedgePolicyClass(object):
+    def testNoDelayUntilEnoughSamples(self):
+        policy = hedge.HedgePolicy(min_samples=3)
+        policy.record(0.1)
+        policy.record(0.2)
+        assert policy.delay() is None
+        policy.record(0.3)
+        assert policy.delay() == 0.2
+
+    def testPercentile(self):
+        policy = hedge.HedgePolicy(percentile=0.5, min_samples=1)
+        for latency in range(1, 102):
+            policy.record(latency / 100.0)
+        assert policy.delay() == 0.51
+        policy.min_delay = 2
+        assert policy.delay() == 2
+
+    def testWindow(self):
+        policy = hedge.HedgePolicy(percentile=1, window=10, min_samples=1)
+        policy.record(5)
+        for _ in range(10):
+            policy.record(0.1)
+        assert policy.delay() == 0.1
+
+
+class testHedgedRequestsClass(object):
+    @classmethod
+    def setUpClass(self):
+        self.server = ThreadingServer(('127.0.0.1', 0), FirstHitStallsHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.url = 'http://127.0.0.1:%d' % self.server.server_port
+
+    @classmethod
+    def tearDownClass(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def testSlowRequestIsHedged(self):
+        policy = seeded_policy(0.01)
+        hedged = session.Session(hedge_policy=policy)
+        start = time.time()
+        assert u'hedge' in hedged.fetch(self.url + '/slow')
+        assert time.time() - start < 0.5
+        assert policy.hedges == 1 and policy.wins == 1
+
+    def testFastRequestIsNotHedged(self):
+        policy = seeded_policy(5)
+        hedged = session.Session(hedge_policy=policy)
+        assert u'first' in hedged.fetch(self.url + '/patient')
+        assert policy.hedges == 0
+
+    def testHedgeTakesFromRateBudget(self):
+        class CountingLimiter(object):
+            acquired = 0
+
+            def acquire(self):
+                self.acquired += 1
+
+        limiter = CountingLimiter()
+        hedged = session.Session(rate_limiter=limiter, hedge_policy=seeded_policy(0.01))
+        hedged.fetch(self.url + '/budget')
+        assert limiter.acquired == 2
@@ -24,3 +24,10 @@ class testMediaListClass(object):
     @raises(TypeError)
     def testCannotInstantiateMediaList(self):
         myanimelist.media_list.MediaList(self.session, "test_username")
+
+    def testIdentifiedByUsername(self):
+        shal = self.session.anime_list(u'shaldengeki')
+        assert shal == self.session.anime_list(u'shaldengeki') and shal != self.session.anime_list(u'mona')
+        assert hash(shal) == hash(self.session.anime_list(u'shaldengeki'))
+        assert shal != self.session.manga_list(u'shaldengeki')
+        assert repr(shal) == u'<AnimeList username: shaldengeki>'
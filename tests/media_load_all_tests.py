@@ -0,0 +1,99 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import threading
+import time
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import anime
+    from myanimelist import manga
+    from myanimelist import session
+else:
+    try:
+        from ..myanimelist import anime
+        from ..myanimelist import manga
+        from ..myanimelist import session
+    except:
+        from myanimelist import anime
+        from myanimelist import manga
+        from myanimelist import session
+
+MAIN_PAGE = u"<html><body><div id='contentWrapper'><h1><span>Cowboy Bebop</span></h1><div id='content'><table><tr>" \
+            u"<td><img src='cover.jpg'/></td><td><h2>Synopsis</h2><span itemprop='description'>In the year 2071." \
+            u"</span></td></tr></table></div></div></body></html>"
+
+OTHER_PAGE = u"<html><body><div id='contentWrapper'><h1>Cowboy Bebop</h1><div id='content'></div></div></body></html>"
+
+
+class PageSession(session.Session):
+    """Serves the main page and empty sub-pages slowly, recording how many requests were in flight at once.
+    """
+
+    def __init__(self):
+        super(PageSession, self).__init__()
+        # the fixtures only have the attributes checked here.
+        self.suppress_parse_exceptions = True
+        self.urls = []
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self._count_lock = threading.Lock()
+
+    def _fetch(self, url):
+        with self._count_lock:
+            self.urls.append(url)
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self._count_lock:
+            self.in_flight -= 1
+        return MAIN_PAGE if url.endswith('/1') else OTHER_PAGE
+
+
+class CountingAnime(anime.Anime):
+    def __init__(self, session, anime_id):
+        super(CountingAnime, self).__init__(session, anime_id)
+        self.sidebar_parses = 0
+
+    def parse_sidebar(self, anime_page):
+        self.sidebar_parses += 1
+        return super(CountingAnime, self).parse_sidebar(anime_page)
+
+
+class testMediaLoadAllClass(object):
+    def testMainPageFirst(self):
+        pages = PageSession()
+        bebop = anime.Anime(pages, 1).load_all()
+        assert pages.urls[0] == u'https://myanimelist.net/anime/1'
+        assert sorted(url.rsplit('/', 1)[1] for url in pages.urls[1:]) == [u'characters', u'stats', u'video']
+        # the sub-pages were requested together, once the title was known.
+        assert pages.most_in_flight == 3
+        assert bebop.field('synopsis') == u'In the year 2071.'
+
+    def testKnownTitle(self):
+        pages = PageSession()
+        anime.Anime(pages, 1).set({'title': u'Cowboy Bebop'}).load_all()
+        assert len(pages.urls) == 4 and pages.most_in_flight == 4
+
+    def testParts(self):
+        pages = PageSession()
+        anime.Anime(pages, 1).set({'title': u'Cowboy Bebop'}).load_all(parts=('stats',))
+        assert pages.urls == [u'https://myanimelist.net/anime/1/Cowboy_Bebop/stats']
+
+    def testUnknownPart(self):
+        pages = PageSession()
+        assert_raises(ValueError, manga.Manga(pages, 1).load_all, parts=('videos',))
+        assert not pages.urls
+
+    def testSidebarParsedOnce(self):
+        bebop = CountingAnime(PageSession(), 1)
+        bebop.load_all()
+        assert bebop.sidebar_parses == 1
+        bebop = CountingAnime(PageSession(), 1).set({'title': u'Cowboy Bebop'})
+        bebop.load_all()
+        assert bebop.sidebar_parses == 1
+        # without the main page, one of the other pages provides the sidebar.
+        bebop = CountingAnime(PageSession(), 1).set({'title': u'Cowboy Bebop'})
+        bebop.load_all(parts=('stats', 'characters', 'videos'))
+        assert bebop.sidebar_parses == 1
@@ -0,0 +1,311 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import datetime
+import os
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import anime
+    from myanimelist import manga
+    from myanimelist import session
+    from myanimelist import utilities
+else:
+    try:
+        from ..myanimelist import anime
+        from ..myanimelist import manga
+        from ..myanimelist import session
+        from ..myanimelist import utilities
+    except:
+        from myanimelist import anime
+        from myanimelist import manga
+        from myanimelist import session
+        from myanimelist import utilities
+
+PAGE = u"""<html><body><div id='contentWrapper'><h1>Cowboy Bebop</h1><div id='content'><table><tr><td>
+<img src='cover.jpg'/>
+<h2>Alternative Titles</h2>
+<div class='spaceit_pad'><span class='dark_text'>English:</span> Cowboy Bebop</div>
+<div class='spaceit_pad'><span class='dark_text'>Synonyms:</span> Bebop, Space Cowboys</div>
+<br/>
+<div class='spaceit_pad'><span class='dark_text'>Japanese:</span> カウボーイビバップ</div>
+<div class='spaceit_pad'>Not a language</div>
+<div class='spaceit_pad'><span class='dark_text'>Ignored:</span> After the break</div>
+</td><td><div><h2>Related Anime</h2><table class='anime_detail_related_anime'>
+<tr><td>Side story:</td><td><a href='/anime/5/Tengoku_no_Tobira'>Tengoku no Tobira</a>, <a href='/anime//'>Broken</a>,
+<a href='http://myanimelist.net/anime/17205/Ein_no_Natsuyasumi'>Ein no Natsuyasumi</a></td></tr>
+<tr><td>Adaptation:</td><td><a href='/manga/173/Cowboy_Bebop'>Cowboy Bebop</a>, <a href='/people/1/X'>Stop</a>,
+<a href='/manga/174/Cowboy_Bebop'>Skipped</a></td></tr>
+</table></div></td></tr></table></div></div></body></html>"""
+
+
+ANIME_PAGE = u"""<html><body><div id='contentWrapper'><h1><span>Cowboy Bebop</span></h1><div id='content'><table><tr><td>
+<img src='cover.jpg'/>
+<h2>Alternative Titles</h2>
+<div class='spaceit_pad'><span class='dark_text'>English:</span> Cowboy Bebop</div>
+<div class='spaceit_pad'><span class='dark_text'>Japanese:</span> カウボーイビバップ</div>
+<br/>
+<h2>Information</h2>
+<div>
+  <span class='dark_text'>Type:</span>
+  <a href='https://myanimelist.net/topanime.php?type=tv'>TV</a></div>
+<div class='spaceit'>
+  <span class='dark_text'>Episodes:</span>
+  26
+  </div>
+<div>
+  <span class='dark_text'>Status:</span>
+  Finished Airing
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Aired:</span>
+  Apr 3, 1998 to Apr 24, 1999
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Broadcast:</span>
+  Saturdays at 01:00 (JST)
+  </div>
+<div>
+  <span class='dark_text'>Producers:</span>
+  <a href='/anime/producer/23/Bandai_Visual' title='Bandai Visual'>Bandai Visual</a>, <a href='/anime.php?p=14'>Sunrise</a>
+</div>
+<div>
+  <span class='dark_text'>Genres:</span>
+  <a href='/anime/genre/1/Action' title='Action'>Action</a>, <a href='/anime/genre/24/Sci-Fi' title='Sci-Fi'>Sci-Fi</a>
+</div>
+<div class='spaceit'>
+  <span class='dark_text'>Duration:</span>
+  1 hr. 24 min. per ep.
+  </div>
+<div>
+  <span class='dark_text'>Rating:</span>
+  R - 17+ (violence &amp; profanity)
+  </div>
+<h2>Statistics</h2>
+<div class='po-r js-statistics-info' itemprop='aggregateRating'>
+  <span class='dark_text'>Score:</span>
+  <span itemprop='ratingValue'>8.78</span><sup>1</sup> (scored by <span itemprop='ratingCount'>704,527</span> users)
+</div>
+<div class='spaceit po-r js-statistics-info'>
+  <span class='dark_text'>Ranked:</span>
+  #26<sup>2</sup>
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Popularity:</span>
+  #39
+  </div>
+<div>
+  <span class='dark_text'>Members:</span>
+  1,236,530
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Favorites:</span>
+  64,658
+  </div>
+</td><td></td></tr></table></div></div></body></html>"""
+
+MANGA_PAGE = u"""<html><body><div id='contentWrapper'><h1><span>Monster</span></h1><div id='content'><table><tr><td>
+<img src='cover.jpg'/>
+<h2>Alternative Titles</h2>
+<div class='spaceit_pad'><span class='dark_text'>Japanese:</span> MONSTER</div>
+<br/>
+<h2>Information</h2>
+<div>
+  <span class='dark_text'>Type:</span>
+  <a href='https://myanimelist.net/topmanga.php?type=manga'>Manga</a></div>
+<div class='spaceit'>
+  <span class='dark_text'>Volumes:</span>
+  18
+  </div>
+<div>
+  <span class='dark_text'>Chapters:</span>
+  Unknown
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Status:</span>
+  Finished
+  </div>
+<div>
+  <span class='dark_text'>Published:</span>
+  Dec 5, 1994 to Dec 20, 2001
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Genres:</span>
+  <a href='/manga/genre/7/Mystery' title='Mystery'>Mystery</a>
+</div>
+<div>
+  <span class='dark_text'>Authors:</span>
+  <a href='/people/1867/Naoki_Urasawa'>Urasawa, Naoki</a> (Story &amp; Art)
+</div>
+<div class='spaceit'>
+  <span class='dark_text'>Serialization:</span>
+  <a href='/manga/magazine/1/Big_Comic_Original' title='Big Comic Original'>Big Comic Original</a>
+</div>
+<h2>Statistics</h2>
+<div class='po-r js-statistics-info'>
+  <span class='dark_text'>Score:</span>
+  <span itemprop='ratingValue'>9.13</span><sup>1</sup> (scored by <span>70,000</span> users)
+</div>
+<div class='spaceit po-r js-statistics-info'>
+  <span class='dark_text'>Ranked:</span>
+  #4<sup>2</sup>
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Popularity:</span>
+  #25
+  </div>
+<div>
+  <span class='dark_text'>Members:</span>
+  150,000
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Favorites:</span>
+  20,000
+  </div>
+</td><td></td></tr></table></div></div></body></html>"""
+
+class testMediaSidebarClass(object):
+    @classmethod
+    def setUpClass(self):
+        self.session = session.Session()
+        partial_session = session.Session()
+        # the fixture only has the sections checked here.
+        partial_session.suppress_parse_exceptions = True
+        self.info = anime.Anime(partial_session, 1).parse(utilities.get_clean_dom(PAGE))
+
+    def testAlternativeTitles(self):
+        assert self.info['alternative_titles'] == {
+            u'English': [u'Cowboy Bebop'],
+            u'Synonyms': [u'Bebop', u'Space Cowboys'],
+            u'Japanese': [u'カウボーイビバップ'],
+        }
+
+    def testRelated(self):
+        assert self.info['related'] == {
+            u'Side story': [self.session.anime(5), self.session.anime(17205)],
+            u'Adaptation': [self.session.manga(173)],
+        }
+        assert self.info['related'][u'Side story'][1].field('title') == u'Ein no Natsuyasumi'
+
+
+class SeasonedAnime(anime.Anime):
+    _sidebar_handlers = dict(anime.Anime._sidebar_handlers, Premiered='_parse_premiered')
+
+    def _parse_premiered(self, label_tag, media_info):
+        media_info['premiered'] = label_tag.tail.strip() if label_tag is not None else None
+
+
+class testMediaInfoPanelClass(object):
+    @classmethod
+    def setUpClass(self):
+        self.session = session.Session()
+        self.anime_info = anime.Anime(self.session, 1).parse_sidebar(utilities.get_clean_dom(ANIME_PAGE))
+        self.manga_info = manga.Manga(self.session, 1).parse_sidebar(utilities.get_clean_dom(MANGA_PAGE))
+
+    def testMediaRows(self):
+        assert self.anime_info['type'] == u'TV'
+        assert self.anime_info['status'] == u'Finished Airing'
+        assert self.anime_info['genres'] == [self.session.genre(1), self.session.genre(24)]
+        assert self.anime_info['score'][1] == 704527
+        assert (self.anime_info['rank'], self.anime_info['popularity']) == (26, 39)
+        assert (self.anime_info['members'], self.anime_info['favorites']) == (1236530, 64658)
+
+    def testAnimeRows(self):
+        assert self.anime_info['episodes'] == 26
+        assert self.anime_info['aired'] == (datetime.date(1998, 4, 3), datetime.date(1999, 4, 24))
+        assert self.anime_info['producers'] == [self.session.producer(23), self.session.producer(14)]
+        assert self.anime_info['duration'] == datetime.timedelta(minutes=84)
+        assert self.anime_info['rating'] == u'R - 17+ (violence & profanity)'
+        assert self.anime_info['broadcast'] == {'weekday': u'Saturday', 'hour': 1, 'minute': 0, 'timezone': u'JST'}
+
+    def testMangaRows(self):
+        assert self.manga_info['type'] == u'Manga'
+        assert (self.manga_info['volumes'], self.manga_info['chapters']) == (18, None)
+        assert self.manga_info['published'] == (datetime.date(1994, 12, 5), datetime.date(2001, 12, 20))
+        assert list(self.manga_info['authors']) == [self.session.person(1867)]
+        assert self.manga_info['serialization'].id == 1
+        assert 'episodes' not in self.manga_info
+
+    def testMissingRow(self):
+        page = utilities.get_clean_dom(ANIME_PAGE.replace(u'Members:', u'Watching:'))
+        assert_raises(Exception, anime.Anime(self.session, 1).parse_sidebar, page)
+        partial_session = session.Session()
+        partial_session.suppress_parse_exceptions = True
+        info = anime.Anime(partial_session, 1).parse_sidebar(page)
+        assert 'members' not in info and info['favorites'] == 64658
+
+    def testExtendedHandlers(self):
+        page = ANIME_PAGE.replace(u"<h2>Statistics</h2>",
+                                  u"<div><span class='dark_text'>Premiered:</span> Spring 1998</div><h2>Statistics</h2>")
+        info = SeasonedAnime(self.session, 1).parse_sidebar(utilities.get_clean_dom(page))
+        assert info['premiered'] == u'Spring 1998' and info['episodes'] == 26
+        assert 'Premiered' not in anime.Anime._sidebar_handlers
+
+
+FULL_PAGE = ANIME_PAGE.replace(u"</td><td></td></tr></table>", u"""</td><td>
+<h2>Synopsis</h2><span itemprop='description'>In the year 2071, humanity has colonized several of the planets.</span>
+<h2>Background</h2>Cowboy Bebop won the Seiun Award in 2000.
+<h2>Related Anime</h2><table class='anime_detail_related_anime'>
+<tr><td>Side story:</td><td><a href='/anime/5/Tengoku_no_Tobira'>Tengoku no Tobira</a></td></tr></table>
+<h2>Characters &amp; Voice Actors</h2>""" + u"<div class='review'>A review.</div>" * 20000 + u"""
+</td></tr></table>""")
+
+
+class StreamedPage(object):
+    def __init__(self, body):
+        self.body = body
+        self.encoding = 'utf-8'
+        self.received = 0
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.body), chunk_size):
+            self.received += len(self.body[start:start + chunk_size])
+            yield self.body[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class PageRequests(object):
+    def __init__(self, page):
+        self.page = page.encode('utf-8')
+        self.responses = []
+
+    def get(self, url, stream=False, timeout=None):
+        self.responses.append(StreamedPage(self.page))
+        return self.responses[-1]
+
+
+class testMediaSectionsClass(object):
+    def setUp(self):
+        self.session = session.Session()
+        self.session.session = PageRequests(FULL_PAGE)
+
+    def testSidebarOnly(self):
+        bebop = anime.Anime(self.session, 1).load(sections=())
+        assert bebop.field('title') == u'Cowboy Bebop' and bebop.field('members') == 1236530
+        assert bebop.field('synopsis') is None and bebop.field('related') is None
+        response = self.session.session.responses[0]
+        assert response.received < len(response.body) / 10
+
+    def testSections(self):
+        bebop = anime.Anime(self.session, 1).load(sections=('synopsis', 'related'))
+        assert bebop.field('synopsis').startswith(u'In the year 2071')
+        assert bebop.field('related') == {u'Side story': [self.session.anime(5)]}
+        response = self.session.session.responses[0]
+        assert response.received < len(response.body) / 10
+
+    def testSectionsList(self):
+        bebop = anime.Anime(self.session, 1).load(sections=['synopsis'])
+        assert bebop.field('synopsis').startswith(u'In the year 2071')
+
+    def testWholePage(self):
+        class PageSession(session.Session):
+            def _fetch(self, url):
+                return FULL_PAGE
+        bebop = anime.Anime(PageSession(), 1).load()
+        assert bebop.field('synopsis').startswith(u'In the year 2071') and bebop.field('members') == 1236530
+
+    def testUnknownSection(self):
+        assert_raises(ValueError, anime.Anime(self.session, 1).load, sections=('reviews',))
+        assert not self.session.session.responses
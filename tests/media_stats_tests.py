@@ -0,0 +1,182 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import array
+import os
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import anime
+    from myanimelist import base
+    from myanimelist import manga
+    from myanimelist import session
+    from myanimelist import utilities
+else:
+    try:
+        from ..myanimelist import anime
+        from ..myanimelist import base
+        from ..myanimelist import manga
+        from ..myanimelist import session
+        from ..myanimelist import utilities
+    except:
+        from myanimelist import anime
+        from myanimelist import base
+        from myanimelist import manga
+        from myanimelist import session
+        from myanimelist import utilities
+
+PAGE = u"""<html><body><div id='contentWrapper'><h1><span>Cowboy Bebop</span></h1><div id='content'><table><tr><td>
+<img src='cover.jpg'/>
+<h2>Alternative Titles</h2>
+<div class='spaceit_pad'><span class='dark_text'>English:</span> Cowboy Bebop</div>
+<div class='spaceit_pad'><span class='dark_text'>Japanese:</span> カウボーイビバップ</div>
+<br/>
+<h2>Information</h2>
+<div>
+  <span class='dark_text'>Type:</span>
+  <a href='https://myanimelist.net/topanime.php?type=tv'>TV</a></div>
+<div class='spaceit'>
+  <span class='dark_text'>Episodes:</span>
+  26
+  </div>
+<div>
+  <span class='dark_text'>Status:</span>
+  Finished Airing
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Aired:</span>
+  Apr 3, 1998 to Apr 24, 1999
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Broadcast:</span>
+  Saturdays at 01:00 (JST)
+  </div>
+<div>
+  <span class='dark_text'>Producers:</span>
+  <a href='/anime/producer/23/Bandai_Visual' title='Bandai Visual'>Bandai Visual</a>, <a href='/anime.php?p=14'>Sunrise</a>
+</div>
+<div>
+  <span class='dark_text'>Genres:</span>
+  <a href='/anime/genre/1/Action' title='Action'>Action</a>, <a href='/anime/genre/24/Sci-Fi' title='Sci-Fi'>Sci-Fi</a>
+</div>
+<div class='spaceit'>
+  <span class='dark_text'>Duration:</span>
+  1 hr. 24 min. per ep.
+  </div>
+<div>
+  <span class='dark_text'>Rating:</span>
+  R - 17+ (violence &amp; profanity)
+  </div>
+<h2>Statistics</h2>
+<div class='po-r js-statistics-info' itemprop='aggregateRating'>
+  <span class='dark_text'>Score:</span>
+  <span itemprop='ratingValue'>8.78</span><sup>1</sup> (scored by <span itemprop='ratingCount'>704,527</span> users)
+</div>
+<div class='spaceit po-r js-statistics-info'>
+  <span class='dark_text'>Ranked:</span>
+  #26<sup>2</sup>
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Popularity:</span>
+  #39
+  </div>
+<div>
+  <span class='dark_text'>Members:</span>
+  1,236,530
+  </div>
+<div class='spaceit'>
+  <span class='dark_text'>Favorites:</span>
+  64,658
+  </div>
+</td><td><h2>Summary Stats</h2>
+<div class='spaceit_pad'><span class='dark_text'>Watching:</span> 96,498</div>
+<div class='spaceit_pad'><span class='dark_text'>Completed:</span> 1,113,010</div>
+<div class='spaceit_pad'><span class='dark_text'>On-Hold:</span> 29,874</div>
+<div class='spaceit_pad'><span class='dark_text'>Dropped:</span> 8,972</div>
+<div class='spaceit_pad'><span class='dark_text'>Plan to Watch:</span> 113,411</div>
+<div class='spaceit_pad'><span class='dark_text'>Total:</span> 1,361,765</div>
+<br/>
+<h2>Score Stats</h2>
+<table border='0' width='420' cellpadding='0' cellspacing='0'>
+<tr><td width='20'>10</td><td><div class='spaceit_pad'><div class='updatesBar' style='width: 10px'></div>
+<span>&nbsp;1% <small>(10007 votes)</small></span></div></td></tr>
+<tr><td width='20'>9</td><td><div class='spaceit_pad'><div class='updatesBar' style='width: 10px'></div>
+<span>&nbsp;2% <small>(9007 votes)</small></span></div></td></tr>
+<tr><td width='20'>8</td><td><div class='spaceit_pad'><div class='updatesBar' style='width: 10px'></div>
+<span>&nbsp;3% <small>(8007 votes)</small></span></div></td></tr>
+<tr><td width='20'>7</td><td><div class='spaceit_pad'><div class='updatesBar' style='width: 10px'></div>
+<span>&nbsp;4% <small>(7007 votes)</small></span></div></td></tr>
+<tr><td width='20'>6</td><td><div class='spaceit_pad'><div class='updatesBar' style='width: 10px'></div>
+<span>&nbsp;5% <small>(6007 votes)</small></span></div></td></tr>
+<tr><td width='20'>5</td><td><div class='spaceit_pad'><div class='updatesBar' style='width: 10px'></div>
+<span>&nbsp;6% <small>(5007 votes)</small></span></div></td></tr>
+<tr><td width='20'>4</td><td><div class='spaceit_pad'><div class='updatesBar' style='width: 10px'></div>
+<span>&nbsp;7% <small>(4007 votes)</small></span></div></td></tr>
+<tr><td width='20'>3</td><td><div class='spaceit_pad'><div class='updatesBar' style='width: 10px'></div>
+<span>&nbsp;8% <small>(3007 votes)</small></span></div></td></tr>
+<tr><td width='20'>2</td><td><div class='spaceit_pad'><div class='updatesBar' style='width: 10px'></div>
+<span>&nbsp;9% <small>(2007 votes)</small></span></div></td></tr>
+<tr><td width='20'>1</td><td><div class='spaceit_pad'><div class='updatesBar' style='width: 10px'></div>
+<span>&nbsp;10% <small>(1007 votes)</small></span></div></td></tr>
+</table>
+<h2>Recent Updates</h2><table><tr><td>9</td><td><span><small>(1 votes)</small></span></td></tr></table>
+</td></tr></table></div></div></body></html>"""
+
+
+class StatsSession(session.Session):
+    def __init__(self):
+        super(StatsSession, self).__init__()
+        self.urls = []
+
+    def _fetch(self, url):
+        self.urls.append(url)
+        return PAGE
+
+
+class testMediaStatsClass(object):
+    @classmethod
+    def setUpClass(self):
+        self.session = session.Session()
+        self.page = utilities.get_clean_dom(PAGE)
+        self.stats = anime.Anime(self.session, 1).parse_stats_section(self.page)
+
+    def testStatusStats(self):
+        assert self.stats['status_stats'] == {'watching': 96498, 'completed': 1113010, 'on_hold': 29874,
+                                              'dropped': 8972, 'plan_to_watch': 113411}
+
+    def testScoreHistogram(self):
+        histogram = self.stats['score_histogram']
+        assert isinstance(histogram, array.array) and histogram.itemsize == 8
+        # the table after "Recent Updates" is not part of the score stats.
+        assert histogram.tolist() == [1007, 2007, 3007, 4007, 5007, 6007, 7007, 8007, 9007, 10007]
+        assert self.stats['score_stats'] == {score: votes for score, votes in enumerate(histogram, 1)}
+        assert base.decode_value(None, base.encode_value(histogram)) == histogram
+
+    def testMissingRows(self):
+        page = utilities.get_clean_dom(PAGE.replace(u'On-Hold:', u'Paused:').replace(u'<h2>Score Stats</h2>', u''))
+        stats = anime.Anime(self.session, 1).parse_stats_section(page)
+        assert stats['status_stats']['on_hold'] == 0 and stats['status_stats']['completed'] == 1113010
+        assert stats['score_histogram'].tolist() == [0] * 10
+
+    def testConsumingVerb(self):
+        page = utilities.get_clean_dom(PAGE.replace(u'Watching:', u'Reading:').replace(u'Plan to Watch:', u'Plan to Read:'))
+        stats = manga.Manga(self.session, 1).parse_stats_section(page)
+        assert stats['status_stats']['reading'] == 96498 and stats['status_stats']['plan_to_read'] == 113411
+
+    def testParseStats(self):
+        info = anime.Anime(self.session, 1).parse_stats(self.page)
+        assert info['title'] == u'Cowboy Bebop' and info['episodes'] == 26
+        assert info['score_histogram'] == self.stats['score_histogram']
+
+    def testInvalidPage(self):
+        page = utilities.get_clean_dom(u"<html><body><div class='badresult'>No such anime</div></body></html>")
+        assert_raises(anime.media.InvalidMediaError, anime.Anime(self.session, 1).parse_stats_section, page)
+
+    def testLoadStatsWithKnownTitle(self):
+        # a media whose title came from elsewhere hasn't had its sidebar loaded.
+        stats_session = StatsSession()
+        bebop = anime.Anime(stats_session, 1).set({'title': u'Cowboy Bebop'})
+        bebop.load_stats()
+        assert stats_session.urls == [u'https://myanimelist.net/anime/1/Cowboy_Bebop/stats']
+        assert bebop._members is not None and bebop._episodes == 26
+        assert bebop._score_histogram == self.stats['score_histogram']
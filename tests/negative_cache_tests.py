@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import shutil
+import tempfile
+import time
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import anime
+    from myanimelist import base
+    from myanimelist import negative_cache
+    from myanimelist import session
+else:
+    try:
+        from ..myanimelist import anime
+        from ..myanimelist import base
+        from ..myanimelist import negative_cache
+        from ..myanimelist import session
+    except:
+        from myanimelist import anime
+        from myanimelist import base
+        from myanimelist import negative_cache
+        from myanimelist import session
+
+
+class Missing(base.Base):
+    _resource_type = 'anime'
+
+    def __init__(self, session, missing_id):
+        super(Missing, self).__init__(session)
+        self.id = missing_id
+        self.loads = 0
+
+    @base.loader
+    def load(self):
+        self.loads += 1
+        raise anime.InvalidAnimeError(self.id, message=u'No such anime')
+
+
+class testNegativeCacheClass(object):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'negative.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def load(self, resource):
+        try:
+            resource.load()
+        except anime.InvalidAnimeError as e:
+            return e
+        raise AssertionError("InvalidAnimeError not raised")
+
+    def testShortCircuits(self):
+        cache = negative_cache.NegativeCache()
+        cached_session = session.Session(negative_cache=cache)
+        missing = Missing(cached_session, 2)
+        self.load(missing)
+        error = self.load(missing)
+        assert missing.loads == 1
+        assert error.id == 2 and error.message == u'No such anime'
+        assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+    def testExpires(self):
+        cache = negative_cache.NegativeCache(ttl=0.01)
+        missing = Missing(session.Session(negative_cache=cache), 2)
+        self.load(missing)
+        time.sleep(0.02)
+        self.load(missing)
+        assert missing.loads == 2 and cache.hits == 0
+
+    def testPersists(self):
+        self.load(Missing(session.Session(negative_cache=negative_cache.NegativeCache(path=self.path)), 2))
+        cache = negative_cache.NegativeCache(path=self.path)
+        missing = Missing(session.Session(negative_cache=cache), 2)
+        assert isinstance(self.load(missing), anime.InvalidAnimeError)
+        assert missing.loads == 0 and len(cache) == 1
+
+    def testDiscard(self):
+        cache = negative_cache.NegativeCache(path=self.path)
+        missing = Missing(session.Session(negative_cache=cache), 2)
+        self.load(missing)
+        cache.discard('anime', 2)
+        self.load(missing)
+        assert missing.loads == 2
@@ -0,0 +1,67 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import pickle
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import anime
+    from myanimelist import base
+    from myanimelist import genre
+    from myanimelist import reference
+    from myanimelist import session
+else:
+    try:
+        from ..myanimelist import anime
+        from ..myanimelist import base
+        from ..myanimelist import genre
+        from ..myanimelist import reference
+        from ..myanimelist import session
+    except:
+        from myanimelist import anime
+        from myanimelist import base
+        from myanimelist import genre
+        from myanimelist import reference
+        from myanimelist import session
+
+
+class testReferenceClass(object):
+    def setUp(self):
+        self.session = session.Session()
+
+    def testFactoriesHandOutReferences(self):
+        bebop = self.session.anime(1)
+        assert isinstance(bebop, reference.AnimeReference)
+        assert not hasattr(bebop, '__dict__')
+        assert isinstance(bebop, anime.Anime) and isinstance(bebop, base.Base)
+        assert not isinstance(bebop, genre.Genre)
+
+    def testEquality(self):
+        full_bebop = anime.Anime(self.session, 1)
+        assert self.session.anime(1) == full_bebop and full_bebop == self.session.anime(1)
+        assert hash(self.session.anime(1)) == hash(full_bebop)
+        assert self.session.anime(1) != self.session.manga(1)
+        assert len({self.session.anime(1), full_bebop, self.session.anime(2)}) == 2
+
+    def testSetDoesNotUpgrade(self):
+        bebop = self.session.anime(1).set({'title': u'Cowboy Bebop'})
+        assert not bebop.upgraded
+        assert bebop.field('title') == u'Cowboy Bebop'
+        assert repr(bebop) == u'<Anime id: 1>'
+
+    def testUpgrade(self):
+        bebop = self.session.anime(1).set({'title': u'Cowboy Bebop'})
+        # a loadable property that is already set upgrades the reference without loading anything.
+        assert bebop.title == u'Cowboy Bebop'
+        assert bebop.upgraded
+        bebop.set({'episodes': 26})
+        assert bebop.episodes == 26 and bebop.field('episodes') == 26
+
+    @raises(anime.InvalidAnimeError)
+    def testInvalidId(self):
+        self.session.anime(0)
+
+    def testPickle(self):
+        spike = pickle.loads(pickle.dumps(self.session.character(1).set({'name': u'Spike Spiegel'})))
+        assert spike == self.session.character(1) and spike.field('name') == u'Spike Spiegel'
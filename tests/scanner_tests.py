@@ -0,0 +1,109 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import shutil
+import tempfile
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import base
+    from myanimelist import breaker
+    from myanimelist import scanner
+    from myanimelist import session
+else:
+    try:
+        from ..myanimelist import base
+        from ..myanimelist import breaker
+        from ..myanimelist import scanner
+        from ..myanimelist import session
+    except:
+        from myanimelist import base
+        from myanimelist import breaker
+        from myanimelist import scanner
+        from myanimelist import session
+
+VALID = {1, 2, 5, 8, 9}
+
+
+class Entry(base.Base):
+    def __init__(self, session, entry_id):
+        super(Entry, self).__init__(session)
+        self.id = entry_id
+
+    def load(self):
+        if self.id in self.session.failures:
+            raise self.session.failures.pop(self.id)
+        self.session.requested.append(self.id)
+        if self.id not in VALID:
+            raise base.InvalidBaseError(self.id)
+
+
+class EntrySession(session.Session):
+    def __init__(self):
+        super(EntrySession, self).__init__()
+        self.requested = []
+        self.failures = {}
+
+    def anime(self, anime_id):
+        return Entry(self, anime_id)
+
+
+class testScannerClass(object):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'scan.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testBitmap(self):
+        bitmap = scanner.IdBitmap()
+        bitmap.add(3)
+        bitmap.add(1000)
+        assert 3 in bitmap and 1000 in bitmap and 4 not in bitmap and 99999 not in bitmap
+        bitmap.discard(3)
+        assert len(scanner.IdBitmap(bitmap.to_bytes())) == 1
+
+    def testScan(self):
+        loaded = []
+        stats = scanner.IdScanner(EntrySession()).scan(1, 10, callback=lambda entry: loaded.append(entry.id))
+        assert sorted(loaded) == sorted(VALID)
+        assert (stats.loaded, stats.invalid, stats.skipped, stats.errors) == (5, 5, 0, 0)
+        assert stats.hit_rate == 0.5
+
+    def testSkipsKnownInvalid(self):
+        scanner.IdScanner(EntrySession(), state=scanner.ScanState(self.path)).scan(1, 10)
+        entry_session = EntrySession()
+        stats = scanner.IdScanner(entry_session, state=scanner.ScanState(self.path)).scan(1, 10)
+        assert sorted(entry_session.requested) == sorted(VALID)
+        assert stats.skipped == 5 and stats.hit_rate == 1.0
+
+    def testIncremental(self):
+        scanner.IdScanner(EntrySession(), state=scanner.ScanState(self.path)).scan(1, 6)
+        entry_session = EntrySession()
+        id_scanner = scanner.IdScanner(entry_session, state=scanner.ScanState(self.path))
+        assert id_scanner.max_seen == 5
+        id_scanner.incremental(stop=10)
+        assert sorted(entry_session.requested) == [7, 8, 9, 10]
+        assert scanner.ScanState(self.path).load('anime')[0] == 9
+
+    def testFailedIds(self):
+        entry_session = EntrySession()
+        entry_session.failures = {
+            2: base.MalformedPageError(2, u'<html></html>'),
+            5: breaker.CircuitOpenError(u'https://myanimelist.net/anime/5', u'pages', 30),
+        }
+        id_scanner = scanner.IdScanner(entry_session)
+        stats = id_scanner.scan(1, 6)
+        assert sorted(stats.failed) == [2, 5] and isinstance(stats.failed[2], base.MalformedPageError)
+        # the rejected ID was never requested.
+        assert (stats.loaded, stats.errors, stats.rejected, stats.requested) == (1, 1, 1, 5)
+
+        retried = id_scanner.retry(stats)
+        assert (retried.loaded, retried.requested, retried.failed) == (2, 2, {})
+
+    def testProgrammingErrorsSurface(self):
+        entry_session = EntrySession()
+        entry_session.failures = {3: AttributeError('oops')}
+        assert_raises(AttributeError, scanner.IdScanner(entry_session).scan, 1, 5)
@@ -0,0 +1,105 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import base
+    from myanimelist import search
+    from myanimelist import session
+    from myanimelist import store
+else:
+    try:
+        from ..myanimelist import base
+        from ..myanimelist import search
+        from ..myanimelist import session
+        from ..myanimelist import store
+    except:
+        from myanimelist import base
+        from myanimelist import search
+        from myanimelist import session
+        from myanimelist import store
+
+TITLES = {
+    ('anime', 1): (u'Cowboy Bebop', {u'English': [u'Cowboy Bebop'], u'Japanese': [u'カウボーイビバップ']}),
+    ('anime', 5): (u'Cowboy Bebop: Tengoku no Tobira', {u'English': [u'Cowboy Bebop: The Movie']}),
+    ('anime', 20): (u'Naruto', {u'Synonyms': [u'NARUTO']}),
+    ('anime', 527): (u'Pokémon', {u'Synonyms': [u'Pocket Monsters']}),
+    ('manga', 2): (u'Cowboy Bebop', {}),
+}
+
+
+class FakeMedia(base.Base):
+    def __init__(self, session, resource_type, media_id):
+        super(FakeMedia, self).__init__(session)
+        self.id = media_id
+        self.resource_type = resource_type
+
+    @property
+    def _resource_type(self):
+        return self.resource_type
+
+    @base.loader
+    def load(self):
+        title, alternative_titles = TITLES[(self.resource_type, self.id)]
+        self.set({'title': title, 'alternative_titles': alternative_titles})
+
+
+class testTitleIndexClass(object):
+    def setUp(self):
+        self.index = search.TitleIndex()
+        for key, (title, alternative_titles) in TITLES.items():
+            self.index.add_titles(key, title, alternative_titles)
+
+    def testNormalize(self):
+        assert search.normalize(u'Pokémon: The  Movie!') == u'pokemon the movie'
+        assert search.normalize(u'...') == u''
+
+    def testSearch(self):
+        results = self.index.search(u'bebop')
+        assert [key for key, _, _ in results] == [('anime', 1), ('manga', 2), ('anime', 5)]
+        assert results[0][1] == u'cowboy bebop' and results[0][2] > 1
+        assert [key for key, _, _ in self.index.search(u'bebop', resource_type='manga')] == [('manga', 2)]
+        assert len(self.index.search(u'bebop', limit=1)) == 1
+
+    def testAlternativeTitles(self):
+        assert self.index.search(u'pocket monsters')[0][0] == ('anime', 527)
+        assert self.index.search(u'pokemon')[0][0] == ('anime', 527)
+        assert self.index.search(u'カウボーイ')[0][0] == ('anime', 1)
+
+    def testTypos(self):
+        assert self.index.search(u'cowboy bebob')[0][0] in (('anime', 1), ('manga', 2))
+        assert self.index.search(u'narutp')[0][0] == ('anime', 20)
+        assert self.index.search(u'gintama') == []
+        assert self.index.search(u'') == []
+
+    def testRemove(self):
+        self.index.remove(('anime', 1))
+        assert ('anime', 1) not in self.index and len(self.index) == 4
+        assert [key for key, _, _ in self.index.search(u'bebop')] == [('manga', 2), ('anime', 5)]
+        self.index.add_titles(('anime', 5), u'Tengoku no Tobira')
+        assert [key for key, _, _ in self.index.search(u'bebop')] == [('manga', 2)]
+        assert self.index.title(('anime', 5)) == u'Tengoku no Tobira'
+
+
+class testSearchLocalClass(object):
+    def setUp(self):
+        self.session = session.Session()
+
+    def testLoadedMedia(self):
+        assert self.session.search_local(u'bebop') == []
+        FakeMedia(self.session, 'anime', 1).load()
+        FakeMedia(self.session, 'manga', 2).load()
+        results = self.session.search_local(u'bebop', type='anime')
+        assert results == [self.session.anime(1)]
+        assert results[0].field('title') == u'Cowboy Bebop'
+        assert len(self.session.search_local(u'bebop')) == 2
+
+    def testStore(self):
+        resource_store = store.Store()
+        resource_store.upsert(FakeMedia(self.session, 'anime', 527).set(
+            {'title': TITLES[('anime', 527)][0], 'alternative_titles': TITLES[('anime', 527)][1]}))
+        self.session.store = resource_store
+        assert self.session.search_local(u'pocket monster') == [self.session.anime(527)]
+        resource_store.close()
@@ -0,0 +1,101 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import threading
+import time
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import base
+    from myanimelist import session
+    from myanimelist import singleflight
+else:
+    try:
+        from ..myanimelist import base
+        from ..myanimelist import session
+        from ..myanimelist import singleflight
+    except:
+        from myanimelist import base
+        from myanimelist import session
+        from myanimelist import singleflight
+
+
+class Slow(base.Base):
+    def __init__(self, session):
+        super(Slow, self).__init__(session)
+        self.id = 1
+        self._value = None
+        self.loads = 0
+
+    @base.loader
+    def load(self):
+        self.loads += 1
+        time.sleep(0.05)
+        self.set({'value': self.session.fetch(u'https://myanimelist.net/slow')})
+
+    @property
+    @base.loadable('load')
+    def value(self):
+        return self._value
+
+
+class CountingSession(session.Session):
+    def __init__(self):
+        super(CountingSession, self).__init__()
+        self.requests = 0
+
+    def _fetch(self, url):
+        self.requests += 1
+        time.sleep(0.05)
+        return url
+
+
+def run_concurrently(func, count=8):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(func())) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class testSingleFlightClass(object):
+    def testSharesResult(self):
+        calls = []
+        flights = singleflight.SingleFlight()
+
+        def work():
+            calls.append(1)
+            time.sleep(0.05)
+            return len(calls)
+
+        assert run_concurrently(lambda: flights.do('key', work)) == [1] * 8
+        assert flights.do('key', work) == 2
+
+    @raises(ValueError)
+    def testSharesError(self):
+        flights = singleflight.SingleFlight()
+
+        def work():
+            raise ValueError()
+
+        flights.do('key', work)
+
+    def testReentrant(self):
+        flights = singleflight.SingleFlight()
+        assert flights.do('key', lambda: flights.do('key', lambda: 1) + 1) == 2
+
+    def testLoadable(self):
+        counting_session = CountingSession()
+        slow = Slow(counting_session)
+        assert run_concurrently(lambda: slow.value) == [u'https://myanimelist.net/slow'] * 8
+        assert slow.loads == 1 and counting_session.requests == 1
+
+    def testFetchAcrossObjects(self):
+        counting_session = CountingSession()
+        objects = [Slow(counting_session) for _ in range(4)]
+        # distinct objects each run their own load, but their requests for the same URL are shared.
+        assert run_concurrently(lambda: objects.pop().value, count=4) == [u'https://myanimelist.net/slow'] * 4
+        assert counting_session.requests == 1
@@ -0,0 +1,86 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import datetime
+import decimal
+import os
+import pickle
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import session
+    from myanimelist import snapshot
+else:
+    try:
+        from ..myanimelist import session
+        from ..myanimelist import snapshot
+    except:
+        from myanimelist import session
+        from myanimelist import snapshot
+
+
+class testSnapshotClass(object):
+    @classmethod
+    def setUpClass(self):
+        self.session = session.Session()
+        self.side_story = self.session.anime(5).set({'title': u'Cowboy Bebop: Tengoku no Tobira'})
+        self.spike = self.session.character(1).set({'name': u'Spike Spiegel'})
+        self.bebop = self.session.anime(1).set({
+            'title': u'Cowboy Bebop',
+            'score': (decimal.Decimal('8.78'), 409420),
+            'aired': (datetime.date(1998, 4, 3), datetime.date(1999, 4, 24)),
+            'duration': datetime.timedelta(minutes=24),
+            'genres': [self.session.genre(1).set({'name': u'Action'})],
+            'related': {u'Side story': [self.side_story]},
+            'characters': {self.spike: {'role': u'Main', 'voice_actors': {self.session.person(11): u'Japanese'}}},
+            'staff': {self.session.person(1870): {u'Director'}},
+        })
+        self.user = self.session.user(u'shaldengeki').set({
+            'id': 64611,
+            'last_online': datetime.datetime(2014, 6, 1, 12, 30),
+            'favorite_anime': [self.bebop],
+        })
+
+    def testRecordReferences(self):
+        record = self.bebop.to_record()
+        assert record['type'] == u'anime' and record['id'] == 1
+        assert record['attrs']['related'] == ['d', [[u'Side story', ['l', [['r', [u'anime', 5]]]]]]]
+
+    def testRecordSkipsUnloadedAttributes(self):
+        assert 'synopsis' not in self.bebop.to_record()['attrs']
+
+    def testFromRecord(self):
+        bebop = self.session.from_record(self.bebop.to_record())
+        assert bebop == self.bebop
+        assert bebop.title == u'Cowboy Bebop'
+        assert bebop.score == (decimal.Decimal('8.78'), 409420)
+        assert bebop.aired == (datetime.date(1998, 4, 3), datetime.date(1999, 4, 24))
+        assert bebop.duration == datetime.timedelta(minutes=24)
+        assert self.side_story in bebop.related[u'Side story']
+        assert bebop.characters[self.spike][u'role'] == u'Main'
+        assert bebop.staff[self.session.person(1870)] == {u'Director'}
+
+    def testUserFromRecord(self):
+        user = self.session.from_record(self.user.to_record())
+        assert user.username == u'shaldengeki' and user.id == 64611
+        assert user.last_online == datetime.datetime(2014, 6, 1, 12, 30)
+
+    def testSnapshotRoundTrip(self):
+        (bebop, spike, user) = snapshot.loads(self.session, snapshot.dumps([self.bebop, self.spike, self.user]))
+        assert bebop.title == u'Cowboy Bebop' and spike.name == u'Spike Spiegel'
+        # references inside one snapshot resolve to the rebuilt objects.
+        assert user.favorite_anime[0] is bebop
+        assert spike in bebop.characters
+
+    def testSnapshotInternsStrings(self):
+        single = snapshot.dumps([self.bebop])
+        assert len(snapshot.dumps([self.bebop, self.bebop])) < 1.5 * len(single)
+
+    @raises(snapshot.SnapshotError)
+    def testInvalidSnapshot(self):
+        snapshot.loads(self.session, b'not a snapshot')
+
+    def testPickle(self):
+        bebop = pickle.loads(pickle.dumps(self.bebop))
+        assert bebop.title == u'Cowboy Bebop'
+        assert self.side_story in bebop.related[u'Side story']
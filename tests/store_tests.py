@@ -0,0 +1,87 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import decimal
+import os
+import time
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import session
+    from myanimelist import store
+else:
+    try:
+        from ..myanimelist import session
+        from ..myanimelist import store
+    except:
+        from myanimelist import session
+        from myanimelist import store
+
+
+class testStoreClass(object):
+    @classmethod
+    def setUpClass(self):
+        self.store = store.Store()
+        self.session = session.Session()
+        self.spike = self.session.character(1).set({'name': u'Spike Spiegel'})
+        self.spike_va = self.session.person(11).set({'name': u'Koichi Yamadera'})
+        self.director = self.session.person(1870).set({'name': u'Shinichiro Watanabe'})
+        self.side_story = self.session.anime(5).set({'title': u'Cowboy Bebop: Tengoku no Tobira'})
+        self.bebop = self.session.anime(1).set({
+            'title': u'Cowboy Bebop',
+            'score': (decimal.Decimal('8.78'), 409420),
+            'genres': [self.session.genre(1).set({'name': u'Action'})],
+            'related': {u'Side story': [self.side_story]},
+            'characters': {self.spike: {'role': u'Main', 'voice_actors': {self.spike_va: u'Japanese'}}},
+            'voice_actors': {self.spike_va: [{'role': u'Main', 'character': self.spike, 'language': u'Japanese'}]},
+            'staff': {self.director: {u'Director', u'Storyboard'}},
+        })
+        self.spike.set({'animeography': {self.bebop: u'Main'}, 'voice_actors': {self.spike_va: u'Japanese'}})
+        self.store.upsert_many([self.bebop, self.spike])
+
+    def testFetchedAt(self):
+        assert self.store.fetched_at('anime', 1) is not None
+        # referenced resources are recorded, but were never fetched.
+        assert self.store.fetched_at('anime', 5) is None
+        assert not self.store.is_fresh('anime', 5)
+
+    def testHydrate(self):
+        bebop = session.Session().anime(1)
+        assert self.store.hydrate(bebop)
+        assert bebop._title == u'Cowboy Bebop'
+        assert bebop._score == (decimal.Decimal('8.78'), 409420)
+        assert bebop._genres[0].name == u'Action'
+        assert bebop._related[u'Side story'][0].title == u'Cowboy Bebop: Tengoku no Tobira'
+        assert bebop._characters[self.spike] == {'role': u'Main', 'voice_actors': {self.spike_va: u'Japanese'}}
+        assert bebop._voice_actors[self.spike_va][0]['character'] == self.spike
+        assert bebop._staff[self.director] == {u'Director', u'Storyboard'}
+
+    def testHydrateCharacter(self):
+        spike = session.Session().character(1)
+        assert self.store.hydrate(spike)
+        assert spike._animeography == {self.bebop: u'Main'}
+        assert spike._voice_actors == {self.spike_va: u'Japanese'}
+
+    def testHydrateMissing(self):
+        assert not self.store.hydrate(session.Session().anime(5))
+        assert not self.store.hydrate(session.Session().anime(2))
+
+    def testHydrateStale(self):
+        stale_store = store.Store(max_age=60)
+        stale_store.upsert(self.bebop, fetched_at=time.time() - 120)
+        assert not stale_store.hydrate(session.Session().anime(1))
+        assert stale_store.hydrate(session.Session().anime(1), max_age=300)
+
+    def testUpsertMerges(self):
+        merge_store = store.Store()
+        merge_store.upsert(self.session.anime(2).set({'title': u'Title'}))
+        merge_store.upsert(self.session.anime(2).set({'synopsis': u'Synopsis'}))
+        anime = session.Session().anime(2)
+        assert merge_store.hydrate(anime)
+        assert anime._title == u'Title' and anime._synopsis == u'Synopsis'
+
+    def testSessionReadsFromStore(self):
+        stored_session = session.Session(store=self.store)
+        # served from the store; no request is made.
+        assert stored_session.anime(1).title == u'Cowboy Bebop'
+        assert stored_session.anime(1).related[u'Side story'] == [self.side_story]
@@ -0,0 +1,83 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+
+from lxml import etree
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import session
+    from myanimelist import utilities
+else:
+    try:
+        from ..myanimelist import session
+        from ..myanimelist import utilities
+    except:
+        from myanimelist import session
+        from myanimelist import utilities
+
+ROWS = u''.join(u'<tr><td class="borderClass"><a href="/character/{0}/Name">Name {0} ・ ü</a></td></tr>'.format(i)
+                for i in range(400))
+PAGE = u'<html><head><!-- menu --><script>var a = "<div>";</script></head><body><div id="contentWrapper">' \
+       u'<div id="content"><table>' + ROWS + u'</table><small>L</small></sup><small> represents licensing company' \
+       u'</small></div></div></div><div id="footer"><table>' + ROWS + u'</table></div></body></html>'
+
+
+class StreamedResponse(object):
+    def __init__(self, body, chunk_size):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.encoding = 'utf-8'
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class StreamingRequests(object):
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.responses = []
+
+    def get(self, url, stream=False, timeout=None):
+        assert stream
+        self.responses.append(StreamedResponse(PAGE.encode('utf-8'), self.chunk_size))
+        return self.responses[-1]
+
+
+class testStreamClass(object):
+    def testFeedCleanDom(self):
+        expected = etree.tostring(utilities.get_clean_dom(PAGE))
+        data = PAGE.encode('utf-8')
+        # chunks that split multi-byte characters and the markup fix_bad_html fixes.
+        for size in (1, 1000, 7919, len(data)):
+            chunks = [data[start:start + size] for start in range(0, len(data), size)]
+            assert etree.tostring(utilities.feed_clean_dom(chunks)) == expected
+
+    def testFeedCleanDomFailure(self):
+        def chunks():
+            yield b'<html><body><p>partial'
+            raise IOError(u'connection reset')
+        assert_raises(IOError, utilities.feed_clean_dom, chunks())
+        # the cached parser starts the next document afresh.
+        dom = utilities.feed_clean_dom([b'<html><body><p>whole</p></body></html>'])
+        assert [p.text for p in dom.iter('p')] == [u'whole']
+
+    def testFetchDomStreams(self):
+        streaming = session.Session(stream_pages=True)
+        streaming.session = StreamingRequests(4096)
+        dom = streaming.fetch_dom(u'https://myanimelist.net/anime/1', content_only=True)
+        assert etree.tostring(dom) == etree.tostring(utilities.get_clean_dom(PAGE))
+        assert streaming.session.responses[0].closed
+
+    def testFetchDomDefault(self):
+        class PageSession(session.Session):
+            def _fetch(self, url):
+                return PAGE
+        dom = PageSession().fetch_dom(u'https://myanimelist.net/anime/1', content_only=True)
+        assert etree.tostring(dom) == etree.tostring(utilities.get_clean_dom(PAGE, content_only=True))
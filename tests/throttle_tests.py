@@ -0,0 +1,40 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import os
+import pickle
+import time
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import session
+    from myanimelist import throttle
+else:
+    try:
+        from ..myanimelist import session
+        from ..myanimelist import throttle
+    except:
+        from myanimelist import session
+        from myanimelist import throttle
+
+
+class testRateLimiterClass(object):
+    def testBurst(self):
+        limiter = throttle.RateLimiter(1, burst=2)
+        assert limiter.try_acquire() and limiter.try_acquire()
+        assert not limiter.try_acquire()
+
+    def testAcquireWaits(self):
+        limiter = throttle.RateLimiter(50)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.09
+
+    def testPickle(self):
+        # a worker's session always has a rate limiter, and the resources it loads must still cross processes.
+        limited = session.Session(rate_limiter=throttle.RateLimiter(5, burst=2))
+        bebop = pickle.loads(pickle.dumps(limited.anime(1).set({'title': u'Cowboy Bebop'})))
+        assert bebop.title == u'Cowboy Bebop'
+        limiter = bebop.session.rate_limiter
+        assert limiter.rate == 5 and limiter.try_acquire()
@@ -0,0 +1,99 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from nose.tools import *
+import datetime
+import os
+
+if "RUNENV" in os.environ and os.environ["RUNENV"] == "travis":
+    from myanimelist import utilities
+else:
+    try:
+        from ..myanimelist import utilities
+    except:
+        from myanimelist import utilities
+
+
+class testUtilitiesClass(object):
+    def testParseProfileDateAbsolute(self):
+        corpus = {
+            u'04-03-05, 10:30 PM': datetime.datetime(2005, 4, 3, 22, 30),
+            u'04-03-05': datetime.date(2005, 4, 3),
+            u'2005-04-03': datetime.date(2005, 4, 3),
+            u'2005-04-00': datetime.date(2005, 4, 1),
+            u'2005-00-00': datetime.date(2005, 1, 1),
+            u'April 3, 2005': datetime.date(2005, 4, 3),
+            u'Apr 3, 2005': datetime.date(2005, 4, 3),
+            u'2005': datetime.date(2005, 1, 1),
+            u'Sep 12, 2012 4:15 AM': datetime.datetime(2012, 9, 12, 4, 15),
+            u'Sep 12, 4:15 PM': datetime.datetime(1900, 9, 12, 16, 15),
+            u'Sep 2012': datetime.datetime(2012, 9, 1),
+        }
+        for text, expected in corpus.items():
+            parsed = utilities.parse_profile_date(text)
+            assert parsed == expected and type(parsed) is type(expected), text
+
+    def testParseProfileDateMissing(self):
+        for text in (u'Unknown', u'?', u'Not available', u'2005-13-45', u'Jan 1', u''):
+            assert utilities.parse_profile_date(text) is None, text
+
+    def testParseProfileDateRelative(self):
+        now = datetime.datetime.now()
+        assert abs(utilities.parse_profile_date(u'5 minutes ago') - (now - datetime.timedelta(minutes=5))) < \
+            datetime.timedelta(seconds=5)
+        yesterday = utilities.parse_profile_date(u'Yesterday, 1:05 PM')
+        assert yesterday.date() == datetime.date.today() - datetime.timedelta(days=1)
+        assert (yesterday.hour, yesterday.minute) == (13, 5)
+
+    def testParseProfileDateSuppress(self):
+        assert utilities.parse_profile_date(u'Today, 99:99 PM', suppress=True) is None
+
+    @raises(ValueError)
+    def testParseProfileDateInvalidTime(self):
+        utilities.parse_profile_date(u'Today, 99:99 PM')
+
+    def testSliceContent(self):
+        content = u'<div id="contentWrapper"><h1>Title</h1><div id="content"><div>a</div><!-- <div> -->' \
+                  u'<script>document.write("<div>");</script></div></div>'
+        page = u'<html><head><script>var menu = "<div>";</script></head><body><div id="menu"><div>Anime</div></div>' + \
+               content + u'<div id="footer">Footer</div></body></html>'
+        assert utilities.slice_content(page) == u'<html><body>' + content + u'</body></html>'
+        dom = utilities.get_clean_dom(page, content_only=True)
+        assert dom.find(".//div[@id='contentWrapper']//h1").text == u'Title'
+        assert dom.find(".//div[@id='footer']") is None
+        assert utilities.get_clean_dom(page).find(".//div[@id='footer']") is not None
+
+    def testSliceContentFallback(self):
+        # no region, an unclosed region, a region closed early by a stray tag, and an error notice outside the region
+        # all keep the whole page.
+        for page in (u'<html><body><div id="content">x</div></body></html>',
+                     u'<html><body><div id="contentWrapper"><div>x</div></body></html>',
+                     u'<html><body><div id="contentWrapper"><td>x</div></div></td><h2>Synopsis</h2></div></body>'
+                     u'</html>',
+                     u'<html><body><div class="badresult">No such anime</div><div id="contentWrapper">x</div></body>'
+                     u'</html>'):
+            assert utilities.slice_content(page) == page
+
+    def testFixBadHtml(self):
+        html = u'<tr> td class="x">a</td><td class="y">1</span>/2</a></span></td></tr>'
+        assert utilities.fix_bad_html(html) == u'<tr><td class="x">a</td><td class="y">1/2</td></tr>'
+        html = u'<tr><td class="x">a</td></tr>'
+        assert utilities.fix_bad_html(html) == html
+
+    def testParsersArePerThread(self):
+        import threading
+        assert utilities.html_parser() is utilities.html_parser()
+        assert utilities.xml_parser() is utilities.xml_parser()
+        other = []
+        thread = threading.Thread(target=lambda: other.append((utilities.html_parser(), utilities.xml_parser())))
+        thread.start()
+        thread.join()
+        assert other[0][0] is not utilities.html_parser()
+        assert other[0][1] is not utilities.xml_parser()
+
+    def testCleanDomDropsComments(self):
+        dom = utilities.get_clean_dom(u'<html><body><div id="a">x<!-- note -->y<?pi z?></div></body></html>')
+        div = dom.find(".//div[@id='a']")
+        assert len(div) == 0
+        assert div.text == u'xy'
+        assert utilities.css_select_first('#a', dom) is div